@@ -1,9 +1,14 @@
+import copy
 import json
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from core.interfaces import CommandContext
 from core.logger import setup_logger
 from .gemini_client import GeminiClient
+from .intent_cache import IntentCache
+from .resilience import AIUnavailableError, SingleFlight
+from .streaming import JsonFieldStreamer, SentenceSplitter
 
 # TODO: Mover para core/interfaces.py se precisar ser reutilizável por outros resolvers
 class IntentResolver(ABC):
@@ -21,6 +26,14 @@ class AIIntentResolver(IntentResolver):
         self.config = kernel.config
         self.logger = setup_logger("Jarvis.AI.Resolver", self.config)
         self.client = GeminiClient(self.config)
+        self.cache = IntentCache(self.config)
+        # Frases idênticas em andamento compartilham uma única chamada
+        self.inflight = SingleFlight()
+        self.offline_reply = self.config.get("ai", {}).get(
+            "offline_reply", "Estou sem acesso à inteligência remota agora. Tente de novo em instantes.")
+        streaming_config = self.config.get("ai", {}).get("streaming", {})
+        self.streaming = streaming_config.get("enabled", True)
+        self.min_sentence_chars = streaming_config.get("min_sentence_chars", 12)
         
         # Blacklist de palavras perigosas para validação pré-envio/pós-recebimento
         self.blacklist = ["rm ", "del ", "format ", "shutdown", "reg ", "system32"]
@@ -33,40 +46,123 @@ class AIIntentResolver(IntentResolver):
             self.logger.warning(f"Vision module not available: {e}")
             self.screen_capture = None
 
-    def resolve(self, text: str) -> Optional[Dict[str, Any]]:
+    def resolve(self, text: str, on_sentence: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
         """
         Analisa o texto e retorna a intenção estruturada ou None.
+        Com `on_sentence` (e ai.streaming ligado), respostas a perguntas são
+        entregues frase a frase enquanto o modelo gera; o resultado volta com
+        "streamed": True para quem chamou não falar a resposta de novo.
         """
         # 1. Validação de Segurança Básica (Blacklist) no input
         if any(bad in text.lower() for bad in self.blacklist):
             self.logger.warning(f"Texto contém palavras proibidas. Abortando IA: {text}")
             return None
 
-        # 2. Construir System Prompt
-        system_prompt = self._get_system_prompt()
-
-        # 3. Vision Check
+        # 2. Vision Check (pedidos com visão nunca usam o cache: a tela muda)
         image = None
         vision_keywords = ["tela", "screen", "imagem", "veja", "olha", "see", "look"]
-        if any(k in text.lower() for k in vision_keywords) and self.screen_capture:
-            self.logger.info("Vision keyword detected. Capturing screen...")
-            image = self.screen_capture.capture()
+        use_vision = any(k in text.lower() for k in vision_keywords) and self.screen_capture
+        if not use_vision:
+            cached = self.cache.get(text)
+            if cached is not None:
+                self.logger.info(f"Intenção em cache para: '{text}' ({cached.get('intent')})")
+                return cached
+            spoken = []
+            if on_sentence and self.streaming:
+                def emit(sentence: str):
+                    spoken.append(sentence)
+                    on_sentence(sentence)
+                remote = lambda: self._resolve_streaming(text, emit)
+            else:
+                remote = lambda: self._resolve_remote(text)
+            result = self.inflight.do(self.cache.key(text), remote)
+            # Cada chamador coalescido recebe sua própria cópia; só o líder falou as frases
+            result = copy.deepcopy(result)
+            if result is not None and spoken:
+                result["streamed"] = True
+            return result
+
+        self.logger.info("Vision keyword detected. Capturing screen...")
+        image = self.screen_capture.capture()
+        return self._resolve_remote(text, image)
+
+    def _resolve_remote(self, text: str, image: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        # 3. Construir System Prompt
+        system_prompt = self._get_system_prompt()
 
-        # 4. Chamar API
+        # 4. Chamar API (prazo ai.timeout, retentativas e circuit breaker no client)
         self.logger.info(f"Consultando IA para: '{text}' (Image: {image is not None})")
-        raw_response = self.client.generate_response(text, image=image, system_instruction=system_prompt)
+        try:
+            raw_response = self.client.generate_response(text, image=image, system_instruction=system_prompt)
+        except AIUnavailableError as e:
+            # Resposta local imediata em vez de travar o consumidor (não vai para o cache)
+            self.logger.warning(f"IA indisponível: {e}")
+            return {"intent": "question", "response": self.offline_reply}
         
         if not raw_response:
             return None
+        return self._validate(text, raw_response, cacheable=image is None)
+
+    def _resolve_streaming(self, text: str, on_sentence: Callable[[str], None]) -> Optional[Dict[str, Any]]:
+        """
+        Consome a resposta em streaming: assim que "intent" == "question" é
+        conhecido, o campo "response" é quebrado em frases e cada frase completa
+        vai para `on_sentence` (TTS) sem esperar o fim da geração.
+        """
+        parser = JsonFieldStreamer("response")
+        splitter = SentenceSplitter(self.min_sentence_chars)
+        pending = ""  # "response" recebido antes de "intent"
+        spoken = []
+        start_time = time.perf_counter()
+
+        def speak(sentences):
+            for sentence in sentences:
+                if not spoken:
+                    self.logger.info(f"Primeira frase da IA em {(time.perf_counter() - start_time) * 1000:.0f}ms")
+                spoken.append(sentence)
+                on_sentence(sentence)
+
+        self.logger.info(f"Consultando IA (stream) para: '{text}'")
+        try:
+            for chunk in self.client.stream_response(text, system_instruction=self._get_system_prompt()):
+                delta = parser.feed(chunk)
+                intent = parser.fields.get("intent")
+                if intent is None:
+                    pending += delta
+                elif intent == "question":
+                    speak(splitter.feed(pending + delta))
+                    pending = ""
+        except AIUnavailableError as e:
+            self.logger.warning(f"IA indisponível: {e}")
+            if not spoken:
+                return {"intent": "question", "response": self.offline_reply}
+            # Falhou no meio: fala o que já chegou
+            speak([s for s in [splitter.flush()] if s])
+            return {"intent": "question", "response": " ".join(spoken)}
+
+        if parser.fields.get("intent") == "question":
+            speak([s for s in [splitter.flush()] if s])
+
+        try:
+            cleaned_text = parser.text.strip()
+            if cleaned_text.startswith("```json"):
+                cleaned_text = cleaned_text[7:]
+            if cleaned_text.endswith("```"):
+                cleaned_text = cleaned_text[:-3]
+            data = json.loads(cleaned_text)
+        except json.JSONDecodeError:
+            self.logger.error(f"IA retornou JSON inválido no stream: {parser.text}")
+            if spoken:
+                return {"intent": "question", "response": " ".join(spoken)}
+            return None
+        return self._validate(text, data, cacheable=True)
 
+    def _validate(self, text: str, data: Dict[str, Any], cacheable: bool) -> Optional[Dict[str, Any]]:
         # 5. Parse e Validação
         try:
-            # O client já retorna um dicionário (JSON parseado)
-            data = raw_response
-            
             intent = data.get("intent")
             if not intent or intent == "unknown":
-                # Fallback intended to always reply
+                # Fallback intended to always reply (não vai para o cache)
                 return {
                     "intent": "question",
                     "response": data.get("response", "Desculpe, não entendi. Pode repetir?")
@@ -80,7 +176,9 @@ class AIIntentResolver(IntentResolver):
                     if isinstance(value, str) and any(bad in value.lower() for bad in self.blacklist):
                          self.logger.warning(f"Parâmetro da IA inseguro: {value}. Bloqueando.")
                          return None
-                         
+
+            if cacheable:
+                self.cache.put(text, data)
             return data
 
         except json.JSONDecodeError:
@@ -117,6 +215,12 @@ For command intents, return:
 "parameters": { ... }
 }
 
+Parameters for each intent (use exactly these keys):
+open_app: {"app_name": "application to open"}
+create_file: {"path": "file path"}
+write_text: {"path": "file path", "content": "text to write"}
+run_shell: {"command": "shell command"}
+
 For questions:
 {
 "intent": "question",
@@ -0,0 +1,186 @@
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from core.intent_classifier import normalize_text
+from core.logger import setup_logger
+
+
+class IntentCache:
+    """
+    Cache LRU + TTL das resoluções da IA, chaveado pelo texto normalizado
+    (sem acentos, pontuação e wake word). Comandos repetidos não pagam o
+    round trip da API.
+
+    Respostas a perguntas ("question") expiram mais cedo que intenções de
+    comando, já que podem ficar desatualizadas. Pedidos com visão não devem
+    passar pelo cache (a tela muda); quem decide é o AIIntentResolver.
+
+    Com `persist`, o disco é atualizado em segundo plano: as escritas são
+    agrupadas por `save_delay_seconds` (um único arquivo por rajada de `put`)
+    e a última é feita na saída do processo.
+
+    Config (`ai.cache`): enabled, max_entries, ttl_seconds, question_ttl_seconds,
+    persist, path, save_delay_seconds.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.AI.Cache", config)
+        cfg = self.config.get("ai", {}).get("cache", {})
+        self.enabled = cfg.get("enabled", True)
+        self.max_entries = cfg.get("max_entries", 256)
+        self.ttl_seconds = cfg.get("ttl_seconds", 86400)
+        self.question_ttl_seconds = cfg.get("question_ttl_seconds", 300)
+        self.persist = cfg.get("persist", True)
+        self.path = cfg.get("path", "data/ai_cache.json")
+        self.save_delay = cfg.get("save_delay_seconds", 2.0)
+
+        wake_word = self.config.get("app", {}).get("wake_word", "")
+        self._wake_prefix = normalize_text(wake_word)
+
+        # chave -> (expira_em (epoch), resultado)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Escrita em disco: uma por vez, agendada por um timer
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.enabled and self.persist:
+            self._load()
+            atexit.register(self.flush)
+
+    def key(self, text: str) -> str:
+        normalized = normalize_text(text)
+        if self._wake_prefix and normalized.startswith(self._wake_prefix + " "):
+            normalized = normalized[len(self._wake_prefix) + 1:]
+        return normalized
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna uma cópia do resultado em cache, ou None.
+        """
+        if not self.enabled:
+            return None
+        key = self.key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+        # Cópia: o kernel repassa `parameters` para os plugins
+        return copy.deepcopy(result)
+
+    def put(self, text: str, result: Dict[str, Any]):
+        if not self.enabled or not result:
+            return
+        key = self.key(text)
+        if not key:
+            return
+        ttl = self.question_ttl_seconds if result.get("intent") == "question" else self.ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if self.persist:
+            self._schedule_save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.persist:
+            self._schedule_save()
+
+    def flush(self):
+        """
+        Grava imediatamente uma escrita pendente.
+        """
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self._save()
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                return  # Já agendada: a escrita levará o estado mais recente
+            self._save_timer = threading.Timer(self.save_delay, self._timed_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _timed_save(self):
+        with self._lock:
+            if self._save_timer is None:
+                return  # flush() já gravou
+            self._save_timer = None
+        self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            now = time.time()
+            for key, expires_at, result in items:
+                if expires_at > now:
+                    self._entries[key] = (expires_at, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.logger.info(f"Cache de intenções carregado: {len(self._entries)} entradas.")
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Cache de intenções ignorado ({self.path}): {e}")
+            self._entries.clear()
+
+    def _save(self):
+        with self._save_lock:
+            tmp_path = None
+            try:
+                with self._lock:
+                    items = [[key, expires_at, result] for key, (expires_at, result) in self._entries.items()]
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(items, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+            except (OSError, TypeError) as e:
+                self.logger.warning(f"Falha ao salvar cache de intenções: {e}")
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
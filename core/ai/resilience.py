@@ -0,0 +1,182 @@
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+class AIUnavailableError(Exception):
+    """
+    A IA não respondeu a tempo, esgotou as tentativas ou o circuito está aberto.
+    """
+    pass
+
+
+def run_with_deadline(fn: Callable[[], Any], timeout: Optional[float]) -> Any:
+    """
+    Executa `fn` numa thread daemon e espera no máximo `timeout` segundos.
+    Uma chamada travada é abandonada (TimeoutError) em vez de congelar quem chamou,
+    e por ser daemon não impede o processo de encerrar.
+    """
+    if timeout is None:
+        return fn()
+    done = threading.Event()
+    outcome: Dict[str, Any] = {}
+
+    def _run():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=_run, name="ai-call", daemon=True).start()
+    if not done.wait(timeout):
+        raise TimeoutError(f"Chamada excedeu {timeout:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def iterate_with_deadline(make_iter: Callable[[], Iterable[Any]], first_timeout: float,
+                          idle_timeout: Optional[float] = None) -> Iterator[Any]:
+    """
+    Consome um iterador bloqueante (ex.: stream HTTP) numa thread daemon.
+    O primeiro item deve chegar em `first_timeout` e os seguintes em no máximo
+    `idle_timeout` entre si; caso contrário levanta TimeoutError.
+    """
+    items: "queue.Queue[tuple]" = queue.Queue()
+    stop = threading.Event()
+
+    def _run():
+        try:
+            for item in make_iter():
+                if stop.is_set():
+                    return
+                items.put(("item", item))
+            items.put(("end", None))
+        except BaseException as e:
+            items.put(("error", e))
+
+    threading.Thread(target=_run, name="ai-stream", daemon=True).start()
+    timeout = first_timeout
+    try:
+        while True:
+            try:
+                kind, value = items.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"Stream sem dados por {timeout:.1f}s")
+            if kind == "end":
+                return
+            if kind == "error":
+                raise value
+            yield value
+            timeout = idle_timeout if idle_timeout is not None else first_timeout
+    finally:
+        stop.set()
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 4.0) -> float:
+    """
+    Backoff exponencial com jitter completo (0..base*2^attempt, limitado a `cap`).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Após `failure_threshold` falhas consecutivas o circuito abre e as chamadas
+    falham imediatamente por `reset_seconds`. Depois disso uma única chamada de
+    teste é liberada (meio-aberto): sucesso fecha o circuito, falha reabre.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.short_circuits = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class SingleFlight:
+    """
+    Coalesce chamadas concorrentes com a mesma chave: a primeira executa,
+    as demais esperam e recebem o mesmo resultado (ou a mesma exceção).
+    """
+    def __init__(self):
+        self._calls: Dict[str, "_Call"] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
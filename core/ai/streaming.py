@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List, Optional
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStreamer:
+    """
+    Parser incremental de um objeto JSON plano vindo em pedaços do modelo.
+    Guarda os valores string de nível 1 assim que fecham (ex.: "intent") e
+    devolve, a cada `feed`, o trecho novo do campo em streaming (ex.: "response"),
+    já sem escapes. Texto fora do objeto (```json) é ignorado.
+    """
+    def __init__(self, stream_field: str = "response"):
+        self.stream_field = stream_field
+        self.fields: Dict[str, str] = {}
+        self.text = ""  # JSON bruto acumulado
+        self._depth = 0
+        self._expect_key = False
+        self._in_string = False
+        self._is_key = False
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._key = ""
+        self._buf: List[str] = []
+
+    @property
+    def streaming(self) -> bool:
+        """
+        True enquanto o valor do campo em streaming está sendo recebido.
+        """
+        return self._in_string and not self._is_key and self._depth == 1 and self._key == self.stream_field
+
+    def feed(self, chunk: str) -> str:
+        self.text += chunk
+        delta: List[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, delta)
+            elif ch == '"':
+                self._in_string = True
+                self._is_key = self._depth == 1 and self._expect_key
+                self._buf = []
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == ":":
+                self._expect_key = False
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+        return "".join(delta)
+
+    def _append(self, text: str, delta: List[str]):
+        self._buf.append(text)
+        if self.streaming:
+            delta.append(text)
+
+    def _string_char(self, ch: str, delta: List[str]):
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) < 4:
+                return
+            code = int(self._unicode, 16)
+            self._unicode = None
+            if 0xD800 <= code < 0xDC00:
+                self._high_surrogate = code
+                return
+            if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._append(chr(code), delta)
+        elif self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._append(_ESCAPES.get(ch, ch), delta)
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            value = "".join(self._buf)
+            if self._is_key:
+                self._key = value
+            elif self._depth == 1:
+                self.fields[self._key] = value
+        else:
+            self._append(ch, delta)
+
+
+# Fim de frase: pontuação seguida de espaço/fim de linha
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = {"sr", "sra", "dr", "dra", "prof", "etc", "ex", "vs", "mr", "mrs", "ms", "st", "av", "n", "nº"}
+
+
+class SentenceSplitter:
+    """
+    Acumula texto parcial e devolve frases completas assim que terminam,
+    para que a TTS comece a falar antes da resposta inteira chegar.
+    Frases muito curtas são juntadas à seguinte (evita áudio picotado).
+    """
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences = []
+        start = 0
+        for m in _BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:m.end()].strip()
+            words = candidate.rstrip(".!?…\"')]").rsplit(None, 1)
+            last_word = words[-1].casefold() if words else ""
+            if m.group().strip().startswith(".") and last_word in _ABBREVIATIONS:
+                continue
+            if len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = m.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
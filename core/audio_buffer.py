@@ -0,0 +1,222 @@
+import threading
+import numpy as np
+from collections import deque
+from typing import Optional
+
+
+def chunk_rms(samples: np.ndarray, scratch: Optional[np.ndarray] = None) -> float:
+    """
+    Energia RMS de um chunk int16.
+    Usa um buffer float32 de rascunho pré-alocado para não alocar por chunk.
+    """
+    n = len(samples)
+    if n == 0:
+        return 0.0
+    if scratch is None or len(scratch) < n:
+        scratch = np.empty(n, dtype=np.float32)
+    work = scratch[:n]
+    work[:] = samples  # Conversão int16 -> float32 in-place
+    return float(np.sqrt(np.dot(work, work) / n))
+
+
+class UtteranceBuffer:
+    """
+    Buffer PCM int16 de capacidade fixa para uma única frase.
+    O comprimento é rastreado em O(1) e `view()` devolve uma view sem cópia.
+    """
+    def __init__(self, storage: np.ndarray, slot: int = -1):
+        self._storage = storage
+        self.slot = slot
+        self.length = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._storage)
+
+    @property
+    def is_full(self) -> bool:
+        return self.length >= len(self._storage)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def reset(self):
+        self.length = 0
+
+    def append(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Copia o chunk para o buffer (truncando no limite da capacidade).
+        Retorna a view da região gravada.
+        """
+        start = self.length
+        n = min(len(samples), len(self._storage) - start)
+        if n > 0:
+            self._storage[start:start + n] = samples[:n]
+            self.length = start + n
+        return self._storage[start:start + n]
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        View (sem cópia) das amostras gravadas.
+        """
+        if end is None or end > self.length:
+            end = self.length
+        return self._storage[start:end]
+
+
+class UtteranceRing:
+    """
+    Anel de buffers de frase pré-alocados (int16).
+    A captura adquire o próximo slot livre e o consumidor o devolve após o
+    processamento, permitindo entregar views sem cópia para a fila.
+    """
+    def __init__(self, capacity_samples: int, slots: int = 4):
+        self.capacity_samples = capacity_samples
+        self.slots = slots
+        self._storage = np.zeros((slots, capacity_samples), dtype=np.int16)
+        self._free = deque(range(slots))
+        self._lock = threading.Lock()
+        self.overflow_allocations = 0
+
+    def acquire(self) -> UtteranceBuffer:
+        """
+        Retorna um buffer vazio. Se todos os slots estiverem em uso
+        (consumidor atrasado), aloca um buffer avulso em vez de bloquear a captura.
+        """
+        with self._lock:
+            if self._free:
+                slot = self._free.popleft()
+                return UtteranceBuffer(self._storage[slot], slot)
+            self.overflow_allocations += 1
+        return UtteranceBuffer(np.zeros(self.capacity_samples, dtype=np.int16))
+
+    def release(self, buffer: Optional[UtteranceBuffer]):
+        """
+        Devolve o slot ao anel. Buffers avulsos são simplesmente descartados.
+        """
+        if buffer is None or buffer.slot < 0:
+            return
+        buffer.reset()
+        with self._lock:
+            if buffer.slot not in self._free:
+                self._free.append(buffer.slot)
+
+
+class PcmRing:
+    """
+    Anel PCM int16 de produtor único / consumidor único (SPSC) para a captura.
+    O callback de áudio escreve direto no armazenamento pré-alocado e o leitor
+    recebe memoryviews sem cópia. Cada lado só altera o próprio índice
+    (contadores monotônicos), então o caminho de dados não usa locks.
+
+    - Anel cheio: o bloco novo é descartado e contado como overrun.
+    - `max_latency_frames`: se o leitor ficar atrasado além disso, o áudio mais
+      antigo é descartado para que a latência não se acumule.
+    - Leitura sem dados até o timeout conta como underrun.
+    """
+    def __init__(self, capacity_frames: int, max_latency_frames: Optional[int] = None):
+        self.capacity = capacity_frames
+        self.max_latency_frames = min(max_latency_frames or capacity_frames, capacity_frames)
+        self._storage = np.zeros(capacity_frames, dtype=np.int16)
+        self._write = 0  # Só o produtor altera
+        self._read = 0   # Só o consumidor altera
+        self._pending = 0  # Frames entregues na última leitura (liberados na próxima)
+        self._scratch = np.zeros(0, dtype=np.int16)
+        self._data_ready = threading.Event()
+
+        self.overruns = 0
+        self.overrun_frames = 0
+        self.underruns = 0
+        self.latency_drops = 0
+        self.latency_dropped_frames = 0
+        self.peak_fill = 0
+
+    @property
+    def available(self) -> int:
+        return self._write - self._read - self._pending
+
+    def write(self, data) -> bool:
+        """
+        Lado do produtor (callback de áudio). Aceita qualquer objeto com
+        buffer protocol contendo int16. Retorna False se o bloco foi descartado.
+        """
+        samples = np.frombuffer(data, dtype=np.int16)
+        n = len(samples)
+        if n == 0:
+            return True
+        if self._write - self._read + n > self.capacity:
+            self.overruns += 1
+            self.overrun_frames += n
+            return False
+
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        self._storage[start:start + first] = samples[:first]
+        if first < n:
+            self._storage[:n - first] = samples[first:]
+        self._write += n
+        self._data_ready.set()
+        return True
+
+    def read(self, frames: int, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        Lado do consumidor. Bloqueia até haver `frames` disponíveis (ou timeout)
+        e devolve uma memoryview válida até a próxima chamada de `read`.
+        Retorna None em timeout.
+        """
+        # Libera os frames da leitura anterior para o produtor
+        self._read += self._pending
+        self._pending = 0
+
+        if self._write - self._read < frames:
+            self._data_ready.clear()
+            if self._write - self._read < frames:
+                if not self._data_ready.wait(timeout):
+                    self.underruns += 1
+                    return None
+                if self._write - self._read < frames:
+                    # Acordado por wake() ou bloco parcial: o chamador tenta de novo
+                    return None
+
+        fill = self._write - self._read
+        self.peak_fill = max(self.peak_fill, fill)
+        # Política de latência máxima: descarta o áudio mais antigo
+        excess = fill - max(self.max_latency_frames, frames)
+        if excess > 0:
+            self._read += excess
+            self.latency_drops += 1
+            self.latency_dropped_frames += excess
+
+        start = self._read % self.capacity
+        self._pending = frames
+        if start + frames <= self.capacity:
+            return memoryview(self._storage[start:start + frames]).cast("B")
+
+        # Região dá a volta no anel: monta em um rascunho pré-alocado
+        if len(self._scratch) < frames:
+            self._scratch = np.zeros(frames, dtype=np.int16)
+        first = self.capacity - start
+        self._scratch[:first] = self._storage[start:]
+        self._scratch[first:frames] = self._storage[:frames - first]
+        return memoryview(self._scratch[:frames]).cast("B")
+
+    def wake(self):
+        """
+        Acorda um leitor bloqueado (usado ao encerrar o stream).
+        """
+        self._data_ready.set()
+
+    def clear(self):
+        self._read = self._write
+        self._pending = 0
+
+    def stats(self) -> dict:
+        return {
+            "overruns": self.overruns,
+            "overrun_frames": self.overrun_frames,
+            "underruns": self.underruns,
+            "latency_drops": self.latency_drops,
+            "latency_dropped_frames": self.latency_dropped_frames,
+            "peak_fill_frames": self.peak_fill,
+            "capacity_frames": self.capacity,
+        }
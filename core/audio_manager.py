@@ -1,35 +1,47 @@
 import sounddevice as sd
-import queue
 import sys
 from typing import Generator
+from core.audio_buffer import PcmRing
 from core.logger import setup_logger
 
 class AudioInputManager:
     """
     Gerencia a captura de áudio do microfone usando SoundDevice.
     Substitui o PyAudio para melhor compatibilidade com Windows.
+    O callback escreve num anel PCM pré-alocado (memória fixa, sem cópia para o leitor).
     """
     def __init__(self, config=None):
+        self.config = config or {}
         self.logger = setup_logger("Jarvis.Audio", config)
         self.samplerate = 16000 # Vosk requer 16khz
         self.channels = 1
         self.dtype = 'int16'
         self.blocksize = 4096
-        self.q = queue.Queue()
         self.is_listening = False
         self.stream = None
 
+        audio_cfg = self.config.get("audio", {})
+        ring_seconds = audio_cfg.get("ring_seconds", 4.0)
+        max_latency_ms = audio_cfg.get("max_latency_ms", 1000)
+        # Capacidade em blocos inteiros: leituras raramente dão a volta no anel
+        ring_blocks = max(2, int(round(ring_seconds * self.samplerate / self.blocksize)))
+        self.ring = PcmRing(ring_blocks * self.blocksize,
+                            max_latency_frames=int(max_latency_ms * self.samplerate / 1000))
+        self.host_overflows = 0
+
     def _audio_callback(self, indata, frames, time, status):
         """
         Callback chamado pelo sounddevice a cada bloco de áudio.
+        Não aloca nem loga: só copia para o anel (descartes ficam nas estatísticas).
         """
         if status:
-            self.logger.warning(f"Status de áudio: {status}")
-        self.q.put(bytes(indata))
+            self.host_overflows += 1
+        self.ring.write(indata)
 
-    def start_stream(self) -> Generator[bytes, None, None]:
+    def start_stream(self) -> Generator[memoryview, None, None]:
         """
-        Inicia a captura de áudio e gera chunks de bytes.
+        Inicia a captura de áudio e gera chunks (memoryview de bytes int16).
+        Cada chunk é válido até o próximo ser pedido.
         """
         try:
             self.stream = sd.RawInputStream(
@@ -40,28 +52,37 @@ class AudioInputManager:
                 callback=self._audio_callback
             )
             
+            self.ring.clear()
             self.is_listening = True
             self.logger.info(f"Stream de áudio (SoundDevice) iniciado a {self.samplerate}Hz. Escutando...")
             
             with self.stream:
                 while self.is_listening:
-                    try:
-                        data = self.q.get(timeout=1.0) # Timeout para permitir verificar flag is_listening
-                        yield data
-                    except queue.Empty:
+                    data = self.ring.read(self.blocksize, timeout=1.0) # Timeout para permitir verificar flag is_listening
+                    if data is None:
                         if not self.stream.active:
                             break
                         continue
+                    yield data
                 
         except Exception as e:
             self.logger.error(f"Erro no stream de áudio: {e}")
             self.stop_stream()
+        finally:
+            self.logger.info(f"Estatísticas de captura: {self.stats()}")
+
+    def stats(self) -> dict:
+        """
+        Contadores de overrun/underrun e descartes por latência.
+        """
+        return dict(self.ring.stats(), host_overflows=self.host_overflows)
 
     def stop_stream(self):
         """
         Sinaliza para parar o loop de leitura.
         """
         self.is_listening = False
+        self.ring.wake()
         self.logger.info("Parando stream de áudio...")
 
     def terminate(self):
@@ -69,4 +90,3 @@ class AudioInputManager:
         Libera recursos (SoundDevice gerencia isso com contexto, mas mantemos interface).
         """
         self.stop_stream()
-
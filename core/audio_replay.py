@@ -0,0 +1,105 @@
+import os
+import glob
+import time
+import wave
+import numpy as np
+from typing import Generator, List
+from core.logger import setup_logger
+
+
+def load_wav(path: str, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Lê um WAV PCM 16-bit e converte para int16 mono na taxa pedida.
+    """
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: apenas PCM 16-bit é suportado")
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        if wf.getnchannels() > 1:
+            data = data.reshape(-1, wf.getnchannels()).mean(axis=1).astype(np.int16)
+        if wf.getframerate() != sample_rate:
+            n = int(len(data) * sample_rate / wf.getframerate())
+            data = np.interp(np.linspace(0, len(data) - 1, n), np.arange(len(data)), data).astype(np.int16)
+    return data
+
+
+class WavReplayInput:
+    """
+    Fonte de áudio alternativa ao microfone: reproduz um WAV (ou diretório de WAVs)
+    com o mesmo contrato de chunks do AudioInputManager (bytes int16, 16kHz, mono).
+    Em tempo real, respeita o ritmo do áudio; caso contrário, entrega o mais rápido possível.
+    Permite rodar o VoiceLoop de ponta a ponta sem placa de som (benchmarks/CI).
+    Configurado via `audio.replay` (ou --replay/--fast no main.py).
+    """
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.Audio.Replay", config)
+        replay_cfg = self.config.get("audio", {}).get("replay", {})
+        self.path = replay_cfg.get("path", "")
+        self.realtime = replay_cfg.get("realtime", True)
+        self.loop = replay_cfg.get("loop", False)
+        # Silêncio entre arquivos para o VAD encerrar cada frase
+        self.gap_seconds = replay_cfg.get("gap_seconds", 2.0)
+
+        self.samplerate = 16000
+        self.channels = 1
+        self.dtype = 'int16'
+        self.blocksize = 4096
+        self.is_listening = False
+        self.finite = not self.loop
+
+    def files(self) -> List[str]:
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, "*.wav")))
+        return [self.path] if os.path.exists(self.path) else []
+
+    def _samples(self) -> Generator[np.ndarray, None, None]:
+        gap = np.zeros(int(self.gap_seconds * self.samplerate), dtype=np.int16)
+        while True:
+            files = self.files()
+            if not files:
+                self.logger.error(f"Nenhum WAV encontrado em: {self.path}")
+                return
+            for path in files:
+                self.logger.info(f"Reproduzindo: {path}")
+                yield load_wav(path, self.samplerate)
+                yield gap
+            if not self.loop:
+                return
+
+    def start_stream(self) -> Generator[bytes, None, None]:
+        """
+        Gera chunks de `blocksize` frames (o último é completado com silêncio).
+        """
+        self.is_listening = True
+        chunk_seconds = self.blocksize / self.samplerate
+        mode = "tempo real" if self.realtime else "máxima velocidade"
+        self.logger.info(f"Replay de áudio iniciado ({mode}).")
+
+        pending = np.zeros(0, dtype=np.int16)
+        start_time = time.perf_counter()
+        emitted = 0
+
+        for samples in self._samples():
+            pending = np.concatenate([pending, samples])
+            while len(pending) >= self.blocksize and self.is_listening:
+                chunk, pending = pending[:self.blocksize], pending[self.blocksize:]
+                if self.realtime:
+                    # Agenda pelo relógio absoluto para não acumular deriva
+                    delay = start_time + (emitted + 1) * chunk_seconds - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                emitted += 1
+                yield chunk.tobytes()
+            if not self.is_listening:
+                return
+
+        if len(pending) and self.is_listening:
+            yield np.pad(pending, (0, self.blocksize - len(pending))).tobytes()
+        self.logger.info(f"Replay concluído ({emitted * chunk_seconds:.1f}s de áudio).")
+
+    def stop_stream(self):
+        self.is_listening = False
+
+    def terminate(self):
+        self.stop_stream()
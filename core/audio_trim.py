@@ -0,0 +1,79 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+class SilenceTrimmer:
+    """
+    Estágio pré-STT: remove quadros de baixa energia no início/fim da captura
+    e descarta capturas sem nenhuma voz.
+    Configurado via `stt.trim` no config.yaml. Com `energy_threshold: "vad"`,
+    o limiar é o do VAD que aceitou a captura (derivado do piso de ruído), para
+    não recortar fala baixa que o VAD considerou voz.
+    """
+    def __init__(self, config=None, sample_rate: int = 16000):
+        trim_cfg = (config or {}).get("stt", {}).get("trim", {})
+        self.sample_rate = sample_rate
+        self.enabled = trim_cfg.get("enabled", True)
+        self.energy_threshold = trim_cfg.get("energy_threshold", "vad")
+        self.frame_ms = trim_cfg.get("frame_ms", 30)
+        self.padding_ms = trim_cfg.get("padding_ms", 200)
+        self.min_voiced_ms = trim_cfg.get("min_voiced_ms", 90)
+
+        # Estatísticas
+        self.total_saved_seconds = 0.0
+        self.discarded = 0
+
+    def threshold(self, vad_threshold: Optional[float] = None) -> float:
+        if self.energy_threshold == "vad":
+            return float(vad_threshold) if vad_threshold is not None else 300.0
+        return float(self.energy_threshold)
+
+    def bounds(self, samples: np.ndarray, vad_threshold: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """
+        Retorna (inicio, fim) em amostras da região com voz (já com padding),
+        ou None se não houver quadros com voz suficientes.
+        """
+        frame = max(1, int(self.sample_rate * self.frame_ms / 1000))
+        n_frames = len(samples) // frame
+        if n_frames == 0:
+            return None
+
+        # Energia RMS de todos os quadros de uma vez (vetorizado)
+        frames = samples[:n_frames * frame].reshape(n_frames, frame).astype(np.float32)
+        energy = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame)
+        voiced = np.flatnonzero(energy > self.threshold(vad_threshold))
+
+        if len(voiced) * self.frame_ms < self.min_voiced_ms:
+            return None
+
+        pad = int(self.sample_rate * self.padding_ms / 1000)
+        start = max(0, int(voiced[0]) * frame - pad)
+        end = min(len(samples), (int(voiced[-1]) + 1) * frame + pad)
+        return start, end
+
+    def trim_bounds(self, samples: np.ndarray, vad_threshold: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """
+        Como `bounds`, mas contabiliza as estatísticas de áudio economizado.
+        Retorna None se a captura deve ser descartada.
+        """
+        if not self.enabled:
+            return 0, len(samples)
+
+        span = self.bounds(samples, vad_threshold)
+        if span is None:
+            self.discarded += 1
+            self.total_saved_seconds += len(samples) / self.sample_rate
+            return None
+
+        start, end = span
+        self.total_saved_seconds += (len(samples) - (end - start)) / self.sample_rate
+        return span
+
+    def trim(self, samples: np.ndarray, vad_threshold: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Retorna uma view (sem cópia) recortada, ou None se a captura deve ser descartada.
+        """
+        span = self.trim_bounds(samples, vad_threshold)
+        if span is None:
+            return None
+        return samples[span[0]:span[1]]
@@ -0,0 +1,227 @@
+import collections
+import fnmatch
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .logger import setup_logger
+
+
+class Subscription:
+    """
+    A handler registered on the EventBus.
+
+    Sync subscriptions run on the emitting thread. Async subscriptions own a
+    bounded queue drained by a dedicated worker thread: when the queue is full
+    the oldest event is dropped, and with `coalesce` only the latest pending
+    event of each name is kept (e.g. `state_changed`).
+    """
+    def __init__(self, pattern: str, handler: Callable, async_delivery: bool = False,
+                 max_queue: int = 100, coalesce: bool = False, pass_event: bool = False,
+                 name: Optional[str] = None):
+        self.pattern = pattern
+        self.handler = handler
+        self.async_delivery = async_delivery
+        self.max_queue = max(1, max_queue)
+        self.coalesce = coalesce
+        self.pass_event = pass_event
+        self.name = name or getattr(handler, "__qualname__", repr(handler))
+        self.is_wildcard = any(ch in pattern for ch in "*?[")
+        self.active = True
+        self.logger = None
+
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+        self._handler_total = 0.0
+        self._handler_max = 0.0
+
+        self._pending = collections.OrderedDict() if coalesce else collections.deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def matches(self, event_name: str) -> bool:
+        if self.is_wildcard:
+            return fnmatch.fnmatchcase(event_name, self.pattern)
+        return event_name == self.pattern
+
+    def start(self):
+        if self.async_delivery and self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name=f"event-{self.name}", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        with self._cond:
+            self.active = False
+            self._pending.clear()
+            self._cond.notify()
+
+    def offer(self, item: Tuple[str, Any, float]):
+        """
+        Queues an event for async delivery (never blocks the caller).
+        """
+        with self._cond:
+            if not self.active:
+                return
+            if self.coalesce:
+                if item[0] in self._pending:
+                    del self._pending[item[0]]
+                    self.coalesced += 1
+                self._pending[item[0]] = item
+            else:
+                self._pending.append(item)
+            if len(self._pending) > self.max_queue:
+                if self.coalesce:
+                    self._pending.popitem(last=False)
+                else:
+                    self._pending.popleft()
+                self.dropped += 1
+            self._cond.notify()
+
+    def deliver(self, item: Tuple[str, Any, float]):
+        event_name, payload, emitted_at = item
+        start = time.perf_counter()
+        try:
+            if self.pass_event:
+                self.handler(event_name, payload)
+            else:
+                self.handler(payload)
+        except Exception as e:
+            self.errors += 1
+            if self.logger:
+                self.logger.error(f"Error in event handler {self.name} for {event_name}: {e}")
+        end = time.perf_counter()
+        delay = start - emitted_at
+        elapsed = end - start
+        self.delivered += 1
+        self._delay_total += delay
+        self._handler_total += elapsed
+        if delay > self._delay_max:
+            self._delay_max = delay
+        if elapsed > self._handler_max:
+            self._handler_max = elapsed
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self.active and not self._pending:
+                    self._cond.wait()
+                if not self.active:
+                    return
+                if self.coalesce:
+                    item = self._pending.popitem(last=False)[1]
+                else:
+                    item = self._pending.popleft()
+            self.deliver(item)
+
+    def stats(self) -> Dict[str, Any]:
+        delivered = self.delivered or 1
+        return {
+            "pattern": self.pattern,
+            "handler": self.name,
+            "mode": ("async" if self.async_delivery else "sync") + ("+coalesce" if self.coalesce else ""),
+            "delivered": self.delivered,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "avg_delay_ms": self._delay_total / delivered * 1000,
+            "max_delay_ms": self._delay_max * 1000,
+            "avg_handler_ms": self._handler_total / delivered * 1000,
+            "max_handler_ms": self._handler_max * 1000,
+        }
+
+
+class EventBus:
+    """
+    Publish/subscribe hub used by the Kernel.
+
+    `emit` runs sync handlers inline and hands async ones to a single
+    dispatcher thread with one queue put, so its cost does not depend on how
+    many async subscribers exist. Routes (event name -> subscriptions,
+    wildcards included) are cached and rebuilt only on (un)subscribe.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.logger = setup_logger("Jarvis.EventBus", config)
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[str, Tuple[Tuple[Subscription, ...], Tuple[Subscription, ...]]] = {}
+        self._lock = threading.Lock()
+        self._inbox: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self.emitted = 0
+
+    def subscribe(self, pattern: str, handler: Callable, async_delivery: bool = False,
+                  max_queue: int = 100, coalesce: bool = False, pass_event: bool = False,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        Registers `handler` for events matching `pattern` ("state_changed",
+        "service_*", "*"). Handlers receive the payload, or (event_name, payload)
+        with `pass_event`. Returns the Subscription (use it to unsubscribe).
+        """
+        subscription = Subscription(pattern, handler, async_delivery, max_queue, coalesce, pass_event, name)
+        subscription.logger = self.logger
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._routes = {}
+            if async_delivery and self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="event-bus", daemon=True)
+                self._dispatcher.start()
+        subscription.start()
+        self.logger.debug(f"Subscribed to event: {pattern} ({subscription.stats()['mode']})")
+        return subscription
+
+    def unsubscribe(self, subscription: Any, pattern: Optional[str] = None) -> int:
+        """
+        Removes a Subscription, or every subscription of a handler function
+        (optionally only for `pattern`). Returns how many were removed.
+        """
+        with self._lock:
+            removed = [s for s in self._subscriptions
+                       if (s is subscription or s.handler == subscription)
+                       and (pattern is None or s.pattern == pattern)]
+            if removed:
+                self._subscriptions = [s for s in self._subscriptions if s not in removed]
+                self._routes = {}
+        for s in removed:
+            s.close()
+        return len(removed)
+
+    def emit(self, event_name: str, payload: Any = None):
+        route = self._routes.get(event_name)
+        if route is None:
+            route = self._route(event_name)
+        sync_subs, async_subs = route
+        self.emitted += 1
+        if not sync_subs and not async_subs:
+            return
+        item = (event_name, payload, time.perf_counter())
+        if async_subs:
+            self._inbox.put((item, async_subs))
+        for subscription in sync_subs:
+            subscription.deliver(item)
+
+    def _route(self, event_name: str):
+        with self._lock:
+            matched = [s for s in self._subscriptions if s.matches(event_name)]
+            route = (tuple(s for s in matched if not s.async_delivery),
+                     tuple(s for s in matched if s.async_delivery))
+            self._routes[event_name] = route
+        return route
+
+    def _dispatch_loop(self):
+        while True:
+            item, subscriptions = self._inbox.get()
+            for subscription in subscriptions:
+                subscription.offer(item)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-subscription delivery counters, drops and latency (emit -> handler start, handler time).
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return [s.stats() for s in subscriptions]
@@ -0,0 +1,356 @@
+import difflib
+import json
+import os
+import re
+import threading
+import unicodedata
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .intent_matcher import command_starts, tokenize
+from .logger import setup_logger
+from .pattern_grammar import CompiledPattern
+
+_NON_WORD = re.compile(r"[^\w]+")
+# Palavras que nunca são, sozinhas, o valor de um slot ("cria um arquivo chamado x")
+_FILLER = frozenset(
+    "o a os as um uma uns umas de do da dos das no na nos nas em pra pro para por com "
+    "chamado chamada nome mim me eu meu minha the an to of for in on my me called named please".split())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Casefold, remove acentos e pontuação e colapsa espaços.
+    "Sábado Feira, abre o Navegador!" -> "sabado feira abre o navegador"
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+@dataclass
+class ClassifierMatch:
+    """
+    Resultado do classificador local (segunda camada, antes da IA).
+    """
+    plugin_name: str
+    command_name: str
+    score: float
+    params: Dict[str, Any] = field(default_factory=dict)
+    example: str = ""
+    source: str = "pattern"  # pattern | history
+
+
+@dataclass
+class _Example:
+    text: str
+    plugin_name: str
+    command_name: str
+    variant: Optional[CompiledPattern] = None
+    # Histórico: nomes dos parâmetros que o comando precisou (nunca os valores)
+    slots: List[str] = field(default_factory=list)
+
+    @property
+    def span(self) -> int:
+        """
+        Palavras comparadas a partir do início do comando: as do gatilho
+        (padrões) ou o comando inteiro (0, histórico).
+        """
+        return len(self.text.split()) if self.variant is not None else 0
+
+
+class IntentClassifier:
+    """
+    Classificador fuzzy de intenção por n-gramas de caracteres (TF-IDF).
+    Cobre quase-acertos que as regras exatas perdem (erros de transcrição como
+    "abri o navegador") sem ir à IA.
+
+    Exemplos vêm das palavras literais dos padrões dos plugins e de comandos
+    resolvidos com sucesso pela IA (histórico persistido em disco). Um acerto
+    no histórico escolhe só o plugin/comando: parâmetros sempre vêm da frase
+    atual (padrões do plugin) e, se não puderem ser extraídos, a frase vai
+    para a IA. Valores de comandos antigos nunca são reaproveitados.
+
+    Como no IntentMatcher, o comando é ancorado no início da frase (após a
+    wake word e palavras de abertura, `lead_in`): o score é o cosseno TF-IDF
+    entre o exemplo e as primeiras palavras do comando (tantas quanto o
+    gatilho do padrão; o comando inteiro para o histórico). Um verbo no meio
+    de uma pergunta ("como eu abro uma empresa?") não conta, e palavras da
+    frase que o exemplo não tem reduzem o score. Slots extraídos só valem se
+    aparecem na frase e não são palavras de ligação ("chamado", "pra").
+    A busca usa um índice invertido (CSR) e é totalmente vetorizada.
+
+    Config (`intent_classifier`): enabled, threshold, ngram_min, ngram_max,
+    word_start_weight, learn, history_path, max_history.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None, lead_in: Iterable[str] = ()):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.IntentClassifier", config)
+        cfg = self.config.get("intent_classifier", {})
+        self.enabled = cfg.get("enabled", True)
+        self.threshold = cfg.get("threshold", 0.7)
+        self.ngram_range = (cfg.get("ngram_min", 2), cfg.get("ngram_max", 4))
+        # N-gramas do início da palavra pesam mais ("start" não deve cobrir "restart")
+        self.word_start_weight = cfg.get("word_start_weight", 3.0)
+        self.learn_enabled = cfg.get("learn", True)
+        self.history_path = cfg.get("history_path", "data/intent_history.jsonl")
+        self.max_history = cfg.get("max_history", 500)
+        self.lead_in = {word for phrase in lead_in for word in normalize_text(phrase).split()}
+
+        self._patterns: Dict[str, List[_Example]] = {}
+        self._triggers: Dict[str, set] = {}
+        self._history: List[_Example] = []
+        self._lock = threading.Lock()
+        self._index = None
+        self._load_history()
+
+    # --- Exemplos ---
+    def set_plugin_patterns(self, plugin_name: str, variants: List[CompiledPattern]):
+        """
+        Usa as palavras literais de cada variante como exemplo do plugin.
+        """
+        examples = []
+        seen = set()
+        for variant in variants:
+            text = normalize_text(" ".join(variant.keywords))
+            if text and text not in seen:
+                seen.add(text)
+                examples.append(_Example(text, plugin_name, plugin_name, variant))
+        with self._lock:
+            self._patterns[plugin_name] = examples
+            self._triggers[plugin_name] = {word for e in examples for word in e.text.split()}
+            self._index = None
+
+    def learn(self, text: str, plugin_name: str, command_name: str, params: Optional[Dict[str, Any]] = None):
+        """
+        Registra um comando resolvido com sucesso (ex.: pela IA) como exemplo.
+        Só os nomes dos parâmetros são guardados.
+        """
+        if not self.learn_enabled:
+            return
+        normalized = normalize_text(text)
+        if not normalized:
+            return
+        example = _Example(normalized, plugin_name, command_name, slots=sorted(params or {}))
+        with self._lock:
+            self._history = [e for e in self._history if e.text != normalized]
+            self._history.append(example)
+            if len(self._history) > self.max_history:
+                self._history = self._history[-self.max_history:]
+            self._index = None
+        self._save_history()
+
+    def _load_history(self):
+        if not self.learn_enabled or not os.path.exists(self.history_path):
+            return
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    item = json.loads(line)
+                    # "params" (formato antigo): só os nomes são aproveitados
+                    slots = item.get("slots", sorted(item.get("params", {})))
+                    self._history.append(_Example(item["text"], item["plugin"], item["command"], slots=slots))
+            self._history = self._history[-self.max_history:]
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Histórico de intenções ignorado ({self.history_path}): {e}")
+            self._history = []
+
+    def _save_history(self):
+        try:
+            os.makedirs(os.path.dirname(self.history_path) or ".", exist_ok=True)
+            with self._lock:
+                lines = [json.dumps({"text": e.text, "plugin": e.plugin_name, "command": e.command_name,
+                                     "slots": e.slots}, ensure_ascii=False) for e in self._history]
+            with open(self.history_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"Falha ao salvar histórico de intenções: {e}")
+
+    # --- Vetorização ---
+    def _ngrams(self, text: str) -> List[str]:
+        grams = []
+        lo, hi = self.ngram_range
+        for word in text.split():
+            padded = f" {word} "
+            for n in range(lo, hi + 1):
+                grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return grams
+
+    def _head(self, words: List[str]) -> List[str]:
+        """
+        O comando sem a wake word/palavras de abertura do início.
+        """
+        starts = command_starts(words, self.lead_in)
+        return words[starts[-1]:] if starts else words
+
+    def _weights(self, text: str) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        for gram in self._ngrams(text):
+            weight = self.word_start_weight if gram[0] == " " else 1.0
+            counts[gram] = counts.get(gram, 0.0) + weight
+        return counts
+
+    def _build(self):
+        examples = [e for group in self._patterns.values() for e in group] + list(self._history)
+        vocab: Dict[str, int] = {}
+        rows = []
+        for example in examples:
+            words = example.text.split() if example.variant is not None else self._head(example.text.split())
+            counts = self._weights(" ".join(words))
+            rows.append({vocab.setdefault(gram, len(vocab)): w for gram, w in counts.items()})
+
+        n_docs = max(len(examples), 1)
+        df = np.zeros(len(vocab), dtype=np.float32)
+        for counts in rows:
+            df[list(counts)] += 1
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        # N-gramas fora do vocabulário: idf máximo (raros em todos os exemplos)
+        oov_idf = float(np.log(1 + n_docs) + 1.0)
+
+        # Matriz exemplo x n-grama em CSR transposto (n-grama -> exemplos), linhas normalizadas
+        postings: List[List[Tuple[int, float]]] = [[] for _ in range(len(vocab))]
+        for row, counts in enumerate(rows):
+            ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * idf[ids]
+            norm = np.sqrt(np.dot(weights, weights)) or 1.0
+            for idx, w in zip(ids.tolist(), (weights / norm).tolist()):
+                postings[idx].append((row, w))
+
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(p) for p in postings])
+        indices = np.fromiter((r for p in postings for r, _ in p), dtype=np.int64, count=int(indptr[-1]))
+        data = np.fromiter((w for p in postings for _, w in p), dtype=np.float32, count=int(indptr[-1]))
+        spans = np.array([e.span for e in examples], dtype=np.int64)
+        return examples, vocab, idf, oov_idf, spans, indptr, indices, data
+
+    def _compiled(self):
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build()
+                index = self._index
+        return index
+
+    def scores(self, text: str) -> Tuple[List[_Example], np.ndarray]:
+        """
+        Cosseno [0, 1] de cada exemplo com o início do comando na frase
+        (melhor entre as posições de início possíveis).
+        """
+        examples, vocab, idf, oov_idf, spans, indptr, indices, data = self._compiled()
+        scores = np.zeros(len(examples), dtype=np.float32)
+        words = normalize_text(text).split()
+        if not words or not examples:
+            return examples, scores
+        for start in command_starts(words, self.lead_in):
+            for span in np.unique(spans).tolist():
+                window = words[start:start + span] if span else words[start:]
+                known: Dict[int, float] = {}
+                norm = 0.0
+                for gram, count in self._weights(" ".join(window)).items():
+                    idx = vocab.get(gram)
+                    weight = count * (oov_idf if idx is None else float(idf[idx]))
+                    norm += weight * weight
+                    if idx is not None:
+                        known[idx] = weight
+                if not known:
+                    continue
+                norm = np.sqrt(norm)
+                ids = np.fromiter(known.keys(), dtype=np.int64, count=len(known))
+                query = np.fromiter(known.values(), dtype=np.float32, count=len(known)) / norm
+                starts, ends = indptr[ids], indptr[ids + 1]
+                lengths = ends - starts
+                # Gather vetorizado das postings de todos os n-gramas da consulta
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+                dots = np.bincount(indices[offsets], weights=data[offsets] * np.repeat(query, lengths),
+                                   minlength=len(examples))
+                np.maximum(scores, np.where(spans == span, dots, 0.0), out=scores)
+        return examples, scores
+
+    # --- Classificação ---
+    def classify(self, text: str) -> Optional[ClassifierMatch]:
+        """
+        Retorna o melhor exemplo acima do limiar (com slots preenchidos),
+        ou None para escalar para a IA.
+        """
+        if not self.enabled:
+            return None
+        examples, scores = self.scores(text)
+        if not len(examples):
+            return None
+
+        # Candidatos em ordem de score; o primeiro que produzir parâmetros válidos vence
+        for row in np.argsort(-scores, kind="stable")[:5]:
+            score = float(scores[row])
+            if score < self.threshold:
+                break
+            example = examples[row]
+            if example.variant is None:
+                match = self._from_history(text, example, score)
+                if match is not None:
+                    return match
+                continue
+            params = self._extract(text, example.variant)
+            if params is not None and self._plausible(text, example.plugin_name, params):
+                return ClassifierMatch(example.plugin_name, example.command_name, score,
+                                       params, example.text, "pattern")
+        return None
+
+    def _from_history(self, text: str, example: _Example, score: float) -> Optional[ClassifierMatch]:
+        """
+        Acerto no histórico: comandos sem parâmetros são resolvidos direto; os
+        demais só se algum padrão do plugin extrair da frase atual valores
+        plausíveis para todos os parâmetros que o comando precisou.
+        """
+        if not example.slots:
+            return ClassifierMatch(example.plugin_name, example.command_name, score, {}, example.text, "history")
+        for pattern_example in self._patterns.get(example.plugin_name, []):
+            params = self._extract(text, pattern_example.variant)
+            if (params and set(example.slots) <= set(params)
+                    and self._plausible(text, example.plugin_name, params)):
+                return ClassifierMatch(example.plugin_name, example.command_name, score, params,
+                                       example.text, "history")
+        return None
+
+    def _plausible(self, text: str, plugin_name: str, params: Dict[str, Any]) -> bool:
+        """
+        Slots de texto devem aparecer literalmente na frase e não começar por
+        palavras do gatilho ou de ligação ("faz um arquivo chamado x" -> "chamado").
+        """
+        ignored = _FILLER | self._triggers.get(plugin_name, set())
+        folded = text.casefold()
+        for value in params.values():
+            if not isinstance(value, str):
+                continue
+            words = normalize_text(value).split()
+            if not words or words[0] in ignored or value.casefold() not in folded:
+                return False
+        return True
+
+    def _extract(self, text: str, variant: CompiledPattern) -> Optional[Dict[str, Any]]:
+        """
+        Corrige as palavras do gatilho que o STT errou ("abri o" -> "abre o")
+        e aplica a regex da variante para preencher os slots.
+        """
+        if variant.regex is None:
+            return {}
+        tokens = tokenize(text)
+        words = [normalize_text(t[0]) for t in tokens]
+        k = len(variant.keywords)
+        target = " ".join(variant.keywords)
+        matcher = difflib.SequenceMatcher(None, "", normalize_text(target))
+        best, best_ratio = None, 0.0
+        # Gatilho só no início do comando, como no IntentMatcher
+        for i in command_starts(words, self.lead_in):
+            if i + k > len(tokens):
+                break
+            matcher.set_seq1(" ".join(words[i:i + k]))
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best, best_ratio = i, ratio
+        if best is None:
+            return None
+        start, end = tokens[best][1], tokens[best + k - 1][2]
+        corrected = text[:start] + target + text[end:]
+        extracted = variant.extract(corrected, start)
+        return extracted[1] if extracted else None
@@ -0,0 +1,146 @@
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from .pattern_grammar import CompiledPattern, compile_pattern
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_END = ""  # Chave terminal no trie (tokens nunca são vazios)
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Quebra o texto em palavras normalizadas (casefold) com suas posições.
+    """
+    return [(m.group().casefold(), m.start(), m.end()) for m in _WORD.finditer(text)]
+
+
+def _fold(word: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", word.casefold()) if unicodedata.category(c) != "Mn")
+
+
+def command_starts(words: List[str], lead_in: Set[str]) -> List[int]:
+    """
+    Posições onde um comando pode começar: a primeira palavra e as que
+    seguem apenas palavras de abertura (`lead_in`, já normalizadas).
+    """
+    starts = []
+    i = 0
+    while i < len(words):
+        starts.append(i)
+        if _fold(words[i]) not in lead_in:
+            break
+        i += 1
+    return starts
+
+
+@dataclass
+class IntentMatch:
+    """
+    Resultado do matcher: plugin vencedor, o trecho do texto que casou
+    e os slots preenchidos pelo padrão.
+    """
+    plugin_name: str
+    pattern: str
+    start: int
+    end: int
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+class IntentMatcher:
+    """
+    Compila os padrões de todos os plugins em um único trie de palavras.
+    Os padrões são ancorados no início do comando: o match começa na primeira
+    palavra ou logo após palavras de abertura (`lead_in`: wake word, "ok",
+    "por favor"...), nunca no meio da frase ("como eu abro uma empresa?" não
+    é OpenApp e segue para a IA). Respeita limites de palavra ("start" não
+    casa dentro de "restart") e escolhe o match mais específico: mais palavras
+    literais, depois mais caracteres, depois o mais à esquerda, e por fim a
+    ordem de registro. O custo não depende do número de plugins/padrões.
+
+    Padrões com slots ("open {app}", ver core/pattern_grammar.py) usam as
+    palavras literais iniciais como gatilho no trie; só então a regex da
+    variante é aplicada para preencher os parâmetros.
+    """
+    def __init__(self, lead_in: Iterable[str] = ()):
+        self.lead_in = {_fold(word) for phrase in lead_in for word, _, _ in tokenize(phrase)}
+        self._plugins: Dict[str, List[CompiledPattern]] = {}
+        self._trie: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._plugins.values())
+
+    def add(self, plugin_name: str, patterns: List[str]):
+        """
+        Registra (ou substitui) os padrões de um plugin. Padrões inválidos
+        levantam PatternError. O trie é montado no próximo `match`, então
+        registrar muitos plugins custa O(total).
+        """
+        compiled = [variant for pattern in patterns for variant in compile_pattern(pattern)]
+        with self._lock:
+            self._plugins[plugin_name] = compiled
+            self._trie = None
+
+    def variants(self, plugin_name: str) -> List[CompiledPattern]:
+        return list(self._plugins.get(plugin_name, []))
+
+    def remove(self, plugin_name: str):
+        with self._lock:
+            if self._plugins.pop(plugin_name, None) is not None:
+                self._trie = None
+
+    def _compile(self) -> dict:
+        trie: dict = {}
+        order = 0
+        for plugin_name, variants in self._plugins.items():
+            for variant in variants:
+                node = trie
+                for word in variant.keywords:
+                    node = node.setdefault(word, {})
+                node.setdefault(_END, []).append((order, plugin_name, variant))
+                order += 1
+        return trie
+
+    def _compiled(self) -> dict:
+        trie = self._trie
+        if trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self._trie = self._compile()
+                trie = self._trie
+        return trie
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """
+        Retorna o melhor match no texto, ou None.
+        """
+        trie = self._compiled()
+        tokens = tokenize(text)
+        best = None
+        best_key = None
+
+        for i in self._starts(tokens):
+            node = trie
+            start = tokens[i][1]
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                for order, plugin_name, variant in node.get(_END, ()):
+                    if variant.regex is None:
+                        end, params = tokens[j][2], {}
+                    else:
+                        extracted = variant.extract(text, start)
+                        if extracted is None:
+                            continue
+                        end, params = extracted
+                    key = (variant.literal_words, end - start, -start, -order)
+                    if best_key is None or key > best_key:
+                        best_key = key
+                        best = IntentMatch(plugin_name, variant.source, start, end, params)
+        return best
+
+    def _starts(self, tokens: List[Tuple[str, int, int]]) -> List[int]:
+        return command_starts([t[0] for t in tokens], self.lead_in)
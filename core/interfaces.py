@@ -40,8 +40,9 @@ class PluginBase(ABC):
     @abstractmethod
     def patterns(self) -> List[str]:
         """
-        List of regex patterns or keywords this plugin handles.
-        Example: ["open {app}", "launch {app}"]
+        List of keywords or grammar patterns this plugin handles
+        (see core/pattern_grammar.py). Slots fill `ctx.params`.
+        Example: ["(open|launch) {app}", "(abre|abrir) [o|a] {app}", "set volume {level:int}"]
         """
         pass
 
@@ -72,6 +73,30 @@ class SpeechToText(ABC):
         """
         pass
 
+    def is_ready(self) -> bool:
+        """
+        Returns True once the underlying model is loaded.
+        """
+        return True
+
+class VoiceActivityDetector(ABC):
+    """
+    Protocol for Voice Activity Detection engines.
+    Decisions are made per audio chunk (int16 numpy array).
+    """
+    @abstractmethod
+    def is_speech(self, chunk: Any) -> bool:
+        """
+        Returns True if the chunk contains speech.
+        """
+        pass
+
+    def reset(self) -> None:
+        """
+        Clears any adaptive state (e.g. noise floor).
+        """
+        pass
+
 class TextToSpeech(ABC):
     """
     Protocol for Text-to-Speech engines.
@@ -1,7 +1,16 @@
+import asyncio
+import concurrent.futures
+import functools
 import logging
+import threading
+import time
 from enum import Enum
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
 from .interfaces import PluginBase, CommandResult, CommandContext
+from .intent_matcher import IntentMatcher
+from .intent_classifier import IntentClassifier
+from .pattern_grammar import PatternError
+from .event_bus import EventBus, Subscription
 from .logger import setup_logger
 
 class SystemState(Enum):
@@ -18,35 +27,54 @@ class Kernel:
     1. Service Container
     2. Event Dispatcher
     3. State Manager
+
+    Slow services (plugins, TTS, AI resolver, STT) load concurrently in the
+    background; callers gate on readiness with `wait_for_service`.
     """
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = setup_logger("Jarvis.Kernel", config)
         self.services: Dict[str, Any] = {}
-        self.events: Dict[str, List[Callable]] = {}
+        self.service_ready: Dict[str, threading.Event] = {}
+        self.load_timings: Dict[str, float] = {}
+        self.event_bus = EventBus(config)
         self.state = SystemState.IDLE
         self.plugins: Dict[str, PluginBase] = {}
+        # Comandos ancorados no início (após a wake word e palavras de abertura)
+        wake_word = config.get("app", {}).get("wake_word", "jarvis")
+        lead_in = config.get("intent_matcher", {}).get("lead_in", ["ok", "ei", "hey", "oi", "por favor", "please"])
+        self.intent_matcher = IntentMatcher(lead_in=[wake_word] + lead_in)
+        self.intent_classifier = IntentClassifier(config, lead_in=[wake_word] + lead_in)
+
+        # Dispatch: asyncio loop owned by the kernel + pool for blocking calls
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.get("dispatch", {}).get("workers", 8), thread_name_prefix="dispatch")
+        # In-flight dispatch task -> its "cancelled" flag (silences its speech)
+        self._dispatch_tasks: Dict[asyncio.Task, threading.Event] = {}
+        self._dispatch_lock = threading.Lock()
+        # Work that keeps the assistant busy (submitted commands, voice captures being processed)
+        self._activities = 0
         
         # Initialize Security Manager
         from .security import SecurityManager
         self.security_manager = SecurityManager(config)
         self.register_service("security", self.security_manager)
         
-        # Initialize Plugin Loader
+        # Initialize Plugin Loader (background)
         from .plugin_loader import PluginLoader
         self.plugin_loader = PluginLoader(config=config)
-        self.load_plugins()
+        self.load_service_async("plugins", self.load_plugins)
 
-        # Initialize TTS
-        try:
-            from .tts import EdgeTTSService
-            self.tts = EdgeTTSService(config)
-            self.register_service("tts", self.tts)
-        except Exception as e:
-            self.logger.error(f"Failed to load TTS: {e}")
-            self.tts = None
+        # Initialize TTS (background)
+        self.load_service_async("tts", self._create_tts)
 
-        self.logger.info("Kernel initialized.")
+        # Initialize AI Resolver (background; imports the Gemini SDK)
+        if config.get("ai", {}).get("enabled", True):
+            self.load_service_async("ai", self._create_ai_resolver)
+
+        self.logger.info("Kernel initialized (services loading in background).")
 
     def load_plugins(self):
         """
@@ -55,6 +83,19 @@ class Kernel:
         loaded = self.plugin_loader.discover_and_load()
         for plugin in loaded:
             self.register_plugin(plugin)
+        return self.plugin_loader
+
+    def _create_tts(self):
+        from .tts import create_tts
+        return create_tts(self.config)
+
+    def _create_ai_resolver(self):
+        from .ai.ai_intent_resolver import AIIntentResolver
+        return AIIntentResolver(self)
+
+    @property
+    def tts(self):
+        return self.services.get("tts")
 
     # --- State Management ---
     def set_state(self, new_state: SystemState):
@@ -64,86 +105,296 @@ class Kernel:
             self.logger.info(f"State transition: {old_state.value} -> {new_state.value}")
             self.emit("state_changed", {"old": old_state.value, "new": new_state.value})
 
+    def begin_activity(self, state: Optional[SystemState] = None):
+        """
+        Marks work in progress (optionally entering `state`). The kernel is the
+        only place that returns to IDLE: it does so when the last activity ends.
+        Every call must be paired with `end_activity`.
+        """
+        with self._dispatch_lock:
+            self._activities += 1
+        if state is not None:
+            self.set_state(state)
+
+    def end_activity(self):
+        """
+        Ends one activity; with none left, PROCESSING/EXECUTING/ERROR go back to
+        IDLE (LISTENING is kept: a new capture is already under way).
+        """
+        with self._dispatch_lock:
+            self._activities -= 1
+            idle = self._activities == 0
+        if idle and self.state in (SystemState.PROCESSING, SystemState.EXECUTING, SystemState.ERROR):
+            self.set_state(SystemState.IDLE)
+
     # --- Service Container ---
     def register_service(self, name: str, service: Any):
         self.services[name] = service
+        self.service_ready.setdefault(name, threading.Event()).set()
         self.logger.debug(f"Service registered: {name}")
 
     def get_service(self, name: str) -> Any:
         return self.services.get(name)
 
+    def load_service_async(self, name: str, factory: Callable[[], Any]) -> threading.Event:
+        """
+        Builds a service on a background thread and registers it when done.
+        Returns the readiness event (set even if loading fails).
+        """
+        ready = self.service_ready.setdefault(name, threading.Event())
+
+        def _load():
+            start_time = time.perf_counter()
+            try:
+                service = factory()
+                if service is not None:
+                    self.services[name] = service
+            except Exception as e:
+                self.logger.error(f"Failed to load service {name}: {e}")
+            finally:
+                elapsed = time.perf_counter() - start_time
+                self.load_timings[name] = elapsed
+                ready.set()
+                self.logger.info(f"Service {name} ready in {elapsed:.2f}s.")
+                self.emit("service_ready", {"name": name, "seconds": elapsed, "ok": name in self.services})
+
+        threading.Thread(target=_load, name=f"load-{name}", daemon=True).start()
+        return ready
+
+    def is_service_ready(self, name: str) -> bool:
+        ready = self.service_ready.get(name)
+        return ready is not None and ready.is_set()
+
+    def wait_for_service(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        Blocks until the named service finished loading (or timeout).
+        Returns the service, or None if it failed, timed out or was never requested.
+        """
+        ready = self.service_ready.get(name)
+        if ready is not None and not ready.is_set():
+            self.logger.info(f"Waiting for service: {name}...")
+            if not ready.wait(timeout):
+                return None
+        return self.services.get(name)
+
+    def get_load_timings(self) -> Dict[str, float]:
+        """
+        Per-service load durations in seconds (for tracking startup regressions).
+        """
+        return dict(self.load_timings)
+
+    def get_ai_cache_stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters of the AI intent cache (empty if the resolver is not loaded).
+        """
+        ai_resolver = self.services.get("ai")
+        cache = getattr(ai_resolver, "cache", None)
+        return cache.stats() if cache else {}
+
     # --- Event Bus ---
-    def subscribe(self, event_name: str, handler: Callable):
-        if event_name not in self.events:
-            self.events[event_name] = []
-        self.events[event_name].append(handler)
-        self.logger.debug(f"Subscribed to event: {event_name}")
+    def subscribe(self, event_name: str, handler: Callable, **options) -> Subscription:
+        """
+        Subscribes to an event (wildcards allowed, e.g. "service_*").
+        Options (see EventBus.subscribe): async_delivery, max_queue, coalesce, pass_event.
+        Slow handlers should use async_delivery so they never stall the emitter.
+        """
+        return self.event_bus.subscribe(event_name, handler, **options)
+
+    def unsubscribe(self, subscription: Any, event_name: Optional[str] = None) -> int:
+        return self.event_bus.unsubscribe(subscription, event_name)
 
     def emit(self, event_name: str, payload: Any = None):
-        if event_name in self.events:
-            for handler in self.events[event_name]:
-                try:
-                    handler(payload)
-                except Exception as e:
-                    self.logger.error(f"Error in event handler for {event_name}: {e}")
+        self.event_bus.emit(event_name, payload)
+
+    def get_event_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-subscriber delivery latency, drops and errors.
+        """
+        return self.event_bus.stats()
 
     # --- Plugin Management ---
     def register_plugin(self, plugin: PluginBase):
         if plugin.name() in self.plugins:
             self.logger.warning(f"Plugin {plugin.name()} already registered. Overwriting.")
         
+        patterns = plugin.patterns()
         self.plugins[plugin.name()] = plugin
-        self.logger.info(f"Plugin registered: {plugin.name()} with patterns: {plugin.patterns()}")
+        # Padrões compilados uma única vez (não a cada comando)
+        try:
+            self.intent_matcher.add(plugin.name(), patterns)
+        except PatternError as e:
+            self.logger.error(f"Invalid pattern in plugin {plugin.name()}: {e}")
+        self.intent_classifier.set_plugin_patterns(plugin.name(), self.intent_matcher.variants(plugin.name()))
+        self.logger.info(f"Plugin registered: {plugin.name()} with patterns: {patterns}")
 
     def speak(self, text: str):
         """
         Speak the given text using the registered TTS service.
         """
-        if self.tts:
-            self.tts.speak(text)
+        tts = self.wait_for_service("tts")
+        if tts:
+            tts.speak(text)
         else:
             self.logger.warning("TTS not available.")
 
+    # --- Dispatch ---
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Starts (once) the kernel-owned event loop thread that runs dispatches.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                threading.Thread(target=_run, name="kernel-loop", daemon=True).start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    async def _run_blocking(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking call (AI request, plugin, service wait) on the dispatch pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    @property
+    def active_dispatches(self) -> int:
+        with self._dispatch_lock:
+            return len(self._dispatch_tasks)
+
+    def submit(self, text: str) -> concurrent.futures.Future:
+        """
+        Schedules a dispatch on the kernel loop from any thread and returns
+        immediately. The future resolves to the CommandResult, or is cancelled
+        by `cancel_dispatches`.
+        The command counts as an activity from this call on, so the state cannot
+        fall back to IDLE before the loop picks it up.
+        """
+        self.begin_activity()
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.dispatch_async(text), self._ensure_loop())
+        except BaseException:
+            self.end_activity()
+            raise
+        future.add_done_callback(lambda _: self.end_activity())
+        return future
+
+    def cancel_dispatches(self) -> int:
+        """
+        Cancels every in-flight dispatch (e.g. the user re-triggered the hotkey).
+        A plugin already running finishes in its worker thread, but its result is
+        discarded and no further speech is produced. Returns how many were cancelled.
+        Speech is silenced before returning, so a TTS stop issued right after
+        cannot be followed by a sentence the command was still streaming.
+        """
+        with self._dispatch_lock:
+            tasks = list(self._dispatch_tasks.items())
+        for task, cancelled in tasks:
+            cancelled.set()
+            self._loop.call_soon_threadsafe(task.cancel)
+        if tasks:
+            self.logger.info(f"Cancelling {len(tasks)} in-flight dispatch(es).")
+        return len(tasks)
+
     def dispatch(self, text: str) -> CommandResult:
+        """
+        Synchronous wrapper around `dispatch_async` (used by `main.py --text`).
+        Blocks the calling thread until the command finishes.
+        """
+        if threading.current_thread().name == "kernel-loop":
+            raise RuntimeError("dispatch() called from the kernel loop; await dispatch_async() instead.")
+        try:
+            return self.submit(text).result()
+        except concurrent.futures.CancelledError:
+            return CommandResult(success=False, message="Command cancelled.")
+
+    async def dispatch_async(self, text: str) -> CommandResult:
         """
         Main entry point for text commands.
-        Finds the matching plugin and executes it.
+        Finds the matching plugin and executes it. AI calls and plugin execution
+        run on the dispatch pool, so concurrent commands do not wait for each
+        other; cancelling the task abandons the command at the next await.
         """
+        task = asyncio.current_task()
+        cancelled = threading.Event()
+        with self._dispatch_lock:
+            self._dispatch_tasks[task] = cancelled
+        self.begin_activity()
+        try:
+            return await self._dispatch_steps(text, cancelled)
+        except asyncio.CancelledError:
+            cancelled.set()
+            self.logger.info(f"Dispatch cancelled: {text}")
+            self.emit("dispatch_cancelled", {"text": text})
+            raise
+        finally:
+            with self._dispatch_lock:
+                self._dispatch_tasks.pop(task, None)
+            self.end_activity()
+
+    async def _dispatch_steps(self, text: str, cancelled: threading.Event) -> CommandResult:
         self.set_state(SystemState.PROCESSING)
         self.logger.info(f"Dispatching command: {text}")
 
+        # Plugins load in background; the first command waits for them
+        if not self.is_service_ready("plugins"):
+            await self._run_blocking(self.wait_for_service, "plugins")
+
+        def speak(sentence: str):
+            # Cancelled commands stop talking (streamed sentences included)
+            if not cancelled.is_set():
+                self.speak(sentence)
+
         # 1. Intent Parsing (Rule-Based First)
         matched_plugin = None
         command_name = ""
         params = {}
+        resolved_by = "rules"
         
-        # Tenta encontrar plugin por padrão (Regra/Keyword/Regex)
-        for name, plugin in self.plugins.items():
-            for pattern in plugin.patterns():
-                if pattern in text: 
-                    matched_plugin = plugin
-                    command_name = plugin.name()
-                    break
-            if matched_plugin:
-                break
+        # Tenta encontrar plugin por padrão (trie compilado, limites de palavra, match mais específico)
+        match = self.intent_matcher.match(text)
+        if match and match.plugin_name in self.plugins:
+            matched_plugin = self.plugins[match.plugin_name]
+            command_name = matched_plugin.name()
+            params = match.params # Slots preenchidos pelo padrão (sem round trip de IA)
+            self.logger.debug(f"Regra casou: '{match.pattern}' -> {command_name} {params}")
+
+        # 2. Classificador local fuzzy (quase-acertos, sem round trip de rede)
+        if not matched_plugin:
+            local = self.intent_classifier.classify(text)
+            if local and local.plugin_name in self.plugins:
+                matched_plugin = self.plugins[local.plugin_name]
+                command_name = local.command_name
+                params = local.params
+                resolved_by = "classifier"
+                self.logger.info(f"Classificador local: {local.plugin_name} (score {local.score:.2f}, "
+                                 f"exemplo '{local.example}', {local.source})")
         
-        # 2. AI Fallback (Se nenhum plugin casou via regra)
+        # 3. AI Fallback (Se nenhum plugin casou via regra/classificador)
         if not matched_plugin:
             self.logger.info("Nenhuma regra casou. Tentando AI Fallback...")
             try:
-                # Lazy load do resolver se precisar (ou init no constructor)
-                if not hasattr(self, 'ai_resolver'):
-                   from .ai.ai_intent_resolver import AIIntentResolver
-                   self.ai_resolver = AIIntentResolver(self)
-                
-                ai_result = self.ai_resolver.resolve(text)
+                # Resolver carregado em background no __init__ (aguarda se ainda carregando)
+                ai_resolver = self.services.get("ai")
+                if not self.is_service_ready("ai"):
+                    ai_resolver = await self._run_blocking(self.wait_for_service, "ai")
+                # Perguntas chegam frase a frase e já vão para a TTS enquanto o modelo gera
+                ai_result = await self._run_blocking(ai_resolver.resolve, text, on_sentence=speak) if ai_resolver else None
                 
                 if ai_result:
                     intent = ai_result.get("intent")
                     if intent == "question":
                          response_text = ai_result.get('response')
                          self.logger.info(f"AI Response: {response_text}")
-                         self.speak(response_text) # SPEAK THE RESPONSE
+                         if not ai_result.get("streamed"):
+                             await self._run_blocking(speak, response_text) # SPEAK THE RESPONSE
                          return CommandResult(True, f"AI: {response_text}")
                     
                     # Mapear Intenção da IA -> Plugin
@@ -166,6 +417,7 @@ class Kernel:
                         matched_plugin = self.plugins[target_plugin_name]
                         command_name = intent
                         params = ai_result.get("parameters", {})
+                        resolved_by = "ai"
                         self.logger.info(f"AI roteou para plugin: {target_plugin_name}")
 
             except Exception as e:
@@ -185,7 +437,7 @@ class Kernel:
                     kernel=self
                 )
                 
-                result = matched_plugin.execute(ctx)
+                result = await self._run_blocking(matched_plugin.execute, ctx)
                 
                 self.logger.info(f"Command executed: {result.message}", extra={
                     "event": "COMMAND_EXECUTED",
@@ -195,16 +447,18 @@ class Kernel:
                 
                 # Feedback de voz opcional para sucesso
                 # self.speak(f"Comando {matched_plugin.name()} executado.") 
+
+                # Comandos que precisaram da IA viram exemplos do classificador local
+                if result.success and resolved_by == "ai":
+                    self.intent_classifier.learn(text, matched_plugin.name(), command_name, params)
                 
-                self.set_state(SystemState.IDLE)
                 return result
                 
             except Exception as e:
                 self.logger.error(f"Plugin execution failed: {e}")
                 self.set_state(SystemState.ERROR)
-                self.speak("Ocorreu um erro ao executar o comando.")
+                await self._run_blocking(speak, "Ocorreu um erro ao executar o comando.")
                 return CommandResult(success=False, message=str(e))
         else:
             self.logger.warning(f"No intent found for: {text}")
-            self.set_state(SystemState.IDLE)
             return CommandResult(success=False, message="I didn't understand that command.")
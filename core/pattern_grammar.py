@@ -0,0 +1,215 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Gramática dos padrões de plugin:
+#   palavra          literal (sem diferenciar maiúsculas; limite de palavra)
+#   (a|b c)          alternativas
+#   [o|a]            opcional (com alternativas)
+#   {nome}           slot de texto livre
+#   {nome:tipo}      slot tipado (ver SLOT_TYPES)
+#   : , .            pontuação literal (espaços ao redor são opcionais)
+# Ex.: "(abre|abra|abrir) [o|a] {app}", "escrever em {path:path}: {content}"
+
+_NUMBER_WORDS = {
+    "zero": 0, "um": 1, "uma": 1, "one": 1, "dois": 2, "duas": 2, "two": 2,
+    "três": 3, "tres": 3, "three": 3, "quatro": 4, "four": 4, "cinco": 5, "five": 5,
+    "seis": 6, "six": 6, "sete": 7, "seven": 7, "oito": 8, "eight": 8,
+    "nove": 9, "nine": 9, "dez": 10, "ten": 10,
+}
+_TRAILING_PUNCT = ".,;:!?\"' "
+
+
+def _to_int(value: str) -> int:
+    value = value.casefold()
+    return _NUMBER_WORDS[value] if value in _NUMBER_WORDS else int(value)
+
+
+def _to_number(value: str) -> float:
+    return float(value.replace(",", "."))
+
+
+def _clean(value: str) -> str:
+    # STT costuma terminar frases com pontuação ("abre o bloco de notas.")
+    return value.strip().rstrip(_TRAILING_PUNCT)
+
+
+# tipo -> (regex, conversor). Slots "text"/"raw" no fim do padrão consomem o resto da frase.
+SLOT_TYPES: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "text": (r".+?", _clean),
+    "raw": (r".+?", str.strip),  # Como text, mas preserva a pontuação (ex.: comandos de shell)
+    "word": (r"\w+", str),
+    "int": (r"\d+|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)), _to_int),
+    "number": (r"\d+(?:[.,]\d+)?", _to_number),
+    "path": (r"(?:[A-Za-z]:[\\/])?[^\s:;,\"']+", _clean),
+}
+
+
+def register_slot_type(name: str, regex: str, converter: Callable[[str], Any] = str):
+    """
+    Permite que plugins adicionem tipos de slot próprios.
+    Padrões já compilados não são afetados.
+    """
+    SLOT_TYPES[name] = (regex, converter)
+
+
+class PatternError(ValueError):
+    pass
+
+
+@dataclass
+class CompiledPattern:
+    """
+    Uma variante concreta de um padrão (alternativas/opcionais já expandidos).
+    `keywords` são as palavras literais iniciais, usadas como gatilho no trie.
+    """
+    source: str
+    keywords: List[str]
+    literal_words: int
+    regex: Optional[re.Pattern] = None
+    converters: Dict[str, Callable[[str], Any]] = field(default_factory=dict)
+
+    def extract(self, text: str, pos: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Tenta casar a variante em `text` a partir de `pos`.
+        Retorna (fim, params) ou None. Variantes sem slots não usam regex.
+        """
+        if self.regex is None:
+            return None
+        m = self.regex.match(text, pos)
+        if not m:
+            return None
+        params = {}
+        for name, converter in self.converters.items():
+            raw = m.group(name)
+            try:
+                value = converter(raw)
+            except (ValueError, KeyError):
+                return None
+            if value == "":
+                return None
+            params[name] = value
+        return m.end(), params
+
+
+# --- Parser ---
+# Itens: ("word", w) | ("punct", p) | ("slot", nome, tipo) | ("alt", [seq, ...], opcional)
+
+_TOKEN = re.compile(r"\s+|\{[^}]*\}|[()\[\]|]|\w+|[^\w\s()\[\]|{}]")
+
+
+def _parse(pattern: str) -> List[tuple]:
+    tokens = _TOKEN.findall(pattern)
+    pos = 0
+
+    def parse_seq(closing: Optional[str]) -> Tuple[List[List[tuple]], int]:
+        nonlocal pos
+        options = [[]]
+        while pos < len(tokens):
+            tok = tokens[pos]
+            pos += 1
+            if tok.isspace():
+                continue
+            if tok in ")]":
+                if tok != closing:
+                    raise PatternError(f"'{tok}' inesperado em: {pattern}")
+                return options, pos
+            if tok == "|":
+                if closing is None:
+                    raise PatternError(f"'|' fora de grupo em: {pattern}")
+                options.append([])
+            elif tok in "([":
+                inner, _ = parse_seq(")" if tok == "(" else "]")
+                options[-1].append(("alt", inner, tok == "["))
+            elif tok.startswith("{"):
+                name, _, slot_type = tok[1:-1].partition(":")
+                name, slot_type = name.strip(), (slot_type.strip() or "text")
+                if not name.isidentifier():
+                    raise PatternError(f"Nome de slot inválido '{name}' em: {pattern}")
+                if slot_type not in SLOT_TYPES:
+                    raise PatternError(f"Tipo de slot desconhecido '{slot_type}' em: {pattern}")
+                options[-1].append(("slot", name, slot_type))
+            elif re.fullmatch(r"\w+", tok):
+                options[-1].append(("word", tok.casefold()))
+            else:
+                options[-1].append(("punct", tok))
+        if closing is not None:
+            raise PatternError(f"Grupo não fechado em: {pattern}")
+        return options, pos
+
+    options, _ = parse_seq(None)
+    return options[0]
+
+
+def _expand(items: List[tuple], limit: int = 256) -> List[List[tuple]]:
+    variants = [[]]
+    for item in items:
+        if item[0] != "alt":
+            variants = [v + [item] for v in variants]
+            continue
+        choices = []
+        for option in item[1]:
+            choices.extend(_expand(option, limit))
+        if item[2]:
+            choices.append([])
+        variants = [v + c for v in variants for c in choices]
+        if len(variants) > limit:
+            raise PatternError(f"Padrão gera variantes demais (> {limit})")
+    return variants
+
+
+def _build(source: str, items: List[tuple]) -> Optional[CompiledPattern]:
+    keywords = []
+    for item in items:
+        if item[0] == "word":
+            keywords.append(item[1])
+        elif item[0] == "slot":
+            break
+    if not keywords:
+        return None  # Sem palavra literal inicial não há gatilho
+
+    literal_words = sum(1 for i in items if i[0] == "word")
+    slots = [i for i in items if i[0] == "slot"]
+    if not slots:
+        return CompiledPattern(source, keywords, literal_words)
+
+    parts = []
+    converters = {}
+    previous = None
+    for index, item in enumerate(items):
+        if previous is not None:
+            # Pontuação aceita espaços opcionais; entre palavras/slots exige espaço
+            parts.append(r"\s*" if "punct" in (previous[0], item[0]) else r"\s+")
+        kind = item[0]
+        if kind == "word":
+            parts.append(re.escape(item[1]) + r"(?!\w)")
+        elif kind == "punct":
+            parts.append(re.escape(item[1]))
+        else:
+            name, slot_type = item[1], item[2]
+            if name in converters:
+                raise PatternError(f"Slot '{name}' repetido em: {source}")
+            regex, converter = SLOT_TYPES[slot_type]
+            if slot_type in ("text", "raw") and index == len(items) - 1:
+                regex = r".+"  # Último slot de texto consome o resto
+            elif slot_type not in ("text", "raw"):
+                regex = f"(?:{regex})(?!\\w)"
+            parts.append(f"(?P<{name}>{regex})")
+            converters[name] = converter
+        previous = item
+
+    regex = re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+    return CompiledPattern(source, keywords, literal_words, regex, converters)
+
+
+def compile_pattern(pattern: str) -> List[CompiledPattern]:
+    """
+    Compila um padrão em suas variantes concretas. Padrões só com palavras
+    continuam funcionando como palavras-chave (compatível com o formato antigo).
+    """
+    variants = []
+    for items in _expand(_parse(pattern)):
+        compiled = _build(pattern, items)
+        if compiled is not None:
+            variants.append(compiled)
+    return variants
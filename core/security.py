@@ -1,8 +1,13 @@
 import yaml
 import os
+import re
 from typing import List, Dict, Any
 from .logger import setup_logger
 
+# Executável aberto pelo OpenApp: um único nome, sem argumentos nem caracteres de shell
+_APP_EXECUTABLE = re.compile(r"[\w.\-]+")
+
+
 class SecurityManager:
     """
     Gerencia políticas de segurança, listas de permissão (whitelists) e confirmações do usuário.
@@ -11,6 +16,9 @@ class SecurityManager:
         self.config = config
         self.logger = setup_logger("Jarvis.Security", config)
         self.whitelist: List[str] = []
+        self.allowed_apps: List[str] = []
+        # Com restrict_apps, o OpenApp só abre o que estiver em allowed_apps
+        self.restrict_apps = config.get("security", {}).get("restrict_apps", False)
         self._load_whitelist()
 
     def _load_whitelist(self):
@@ -19,6 +27,7 @@ class SecurityManager:
             with open(path, 'r') as f:
                 data = yaml.safe_load(f)
                 self.whitelist = data.get("allowed_commands", [])
+                self.allowed_apps = [app.lower() for app in data.get("allowed_apps", [])]
                 self.logger.info(f"Carregados {len(self.whitelist)} comandos permitidos.")
         else:
             self.logger.warning("whitelist.yaml não encontrado. Comandos de shell serão bloqueados.")
@@ -37,6 +46,27 @@ class SecurityManager:
         
         return is_allowed
 
+    def can_launch_app(self, app: str, executable: str) -> bool:
+        """
+        Verifica se um aplicativo pode ser aberto. O executável precisa ser um
+        único nome, sem argumentos nem caracteres de shell ("format c:",
+        "notepad & del ..." são sempre bloqueados). Com `security.restrict_apps`,
+        o nome falado ou o executável também precisa estar em `allowed_apps`
+        (ou em `allowed_commands`), por correspondência exata.
+        """
+        if not _APP_EXECUTABLE.fullmatch(executable.strip()):
+            is_allowed = False
+        elif self.restrict_apps:
+            allowed = set(self.allowed_apps) | {cmd.lower() for cmd in self.whitelist}
+            is_allowed = app.strip().lower() in allowed or executable.strip().lower() in allowed
+        else:
+            is_allowed = True
+
+        if not is_allowed:
+            self.logger.warning(f"BLOCKED aplicativo: {app} ({executable})")
+
+        return is_allowed
+
     def require_confirmation(self, action_description: str) -> bool:
         """
         Solicita confirmação do usuário (CLI ou Voz).
@@ -1 +1,33 @@
-from .whisper_stt import WhisperSTT
+from typing import Any, Dict, Optional
+from core.interfaces import SpeechToText
+
+
+def create_stt(config: Optional[Dict[str, Any]] = None) -> SpeechToText:
+    """
+    Builds the STT engine selected by `stt.provider` ("whisper" or "vosk").
+    Engines are imported lazily so that Vosk-only setups never load torch.
+    With `stt.process_pool.enabled`, Whisper runs in separate worker processes.
+    """
+    stt_config = (config or {}).get("stt", {})
+    provider = stt_config.get("provider", "whisper")
+    if provider == "vosk":
+        from .vosk_stt import VoskSTT
+        return VoskSTT(config=config)
+    if stt_config.get("process_pool", {}).get("enabled", False):
+        from .process_pool import WhisperProcessPool
+        return WhisperProcessPool(config=config)
+    from .whisper_stt import WhisperSTT
+    return WhisperSTT(config=config)
+
+
+def __getattr__(name):
+    if name == "WhisperSTT":
+        from .whisper_stt import WhisperSTT
+        return WhisperSTT
+    if name == "WhisperProcessPool":
+        from .process_pool import WhisperProcessPool
+        return WhisperProcessPool
+    if name == "VoskSTT":
+        from .vosk_stt import VoskSTT
+        return VoskSTT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,140 @@
+import os
+import queue
+import sys
+import time
+import multiprocessing as mp
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import List, Tuple
+from core.interfaces import SpeechToText
+from core.logger import setup_logger
+
+# Instância do Whisper carregada uma vez por processo worker (ver _init_worker)
+_worker_stt = None
+
+
+def _init_worker(config):
+    global _worker_stt
+    from .whisper_stt import WhisperSTT
+    _worker_stt = WhisperSTT(config=config)
+
+
+def _worker_ready() -> bool:
+    return _worker_stt is not None and _worker_stt.is_ready()
+
+
+def _worker_run(method: str, shm_name: str, n_samples: int):
+    """
+    Executa `method` do WhisperSTT sobre o áudio publicado em memória compartilhada.
+    """
+    # O pai é o dono do segmento (e o único que o remove). Workers "spawn" usam o
+    # resource_tracker do pai: não registrar de novo (3.13+) nem desregistrar aqui.
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.ndarray((n_samples,), dtype=np.int16, buffer=shm.buf)
+        try:
+            return getattr(_worker_stt, method)(audio)
+        finally:
+            del audio
+    finally:
+        shm.close()
+
+
+class WhisperProcessPool(SpeechToText):
+    """
+    Servidor de STT fora do processo principal.
+    Cada worker carrega o Whisper uma única vez; o áudio é publicado em slots de
+    memória compartilhada pré-alocados (sem pickle dos bytes), e apenas o nome do
+    slot e o número de amostras trafegam pelo pipe. Mantém a captura e a UI livres
+    do GIL durante a inferência e permite decodificar frases seguidas em paralelo.
+    Configurado via `stt.process_pool`.
+    """
+    def __init__(self, config=None):
+        self.logger = setup_logger("Jarvis.STT.Pool", config)
+        self.config = config or {}
+        pool_cfg = self.config.get("stt", {}).get("process_pool", {})
+        self.workers = max(1, int(pool_cfg.get("workers", 2)))
+        self.max_seconds = pool_cfg.get("max_seconds", 15)
+        self.slot_bytes = int(16000 * self.max_seconds) * 2
+
+        # Sem configuração explícita, divide os núcleos entre os workers (evita oversubscription)
+        worker_config = dict(self.config)
+        stt_config = dict(worker_config.get("stt", {}))
+        perf = dict(stt_config.get("performance", {}))
+        if not perf.get("num_threads"):
+            perf["num_threads"] = max(1, (os.cpu_count() or 1) // self.workers)
+        stt_config["performance"] = perf
+        worker_config["stt"] = stt_config
+
+        # Slots de memória compartilhada (2 por worker: um em uso, um sendo preenchido)
+        self._slots = []
+        self._free_slots = queue.Queue()
+        for _ in range(self.workers * 2):
+            shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes)
+            self._slots.append(shm)
+            self._free_slots.put(shm)
+
+        self.logger.info(f"Iniciando {self.workers} worker(s) de STT...")
+        start_time = time.time()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(worker_config,)
+        )
+        # Força o spawn (e o carregamento do modelo) de todos os workers já na inicialização
+        self._warmup = [self.executor.submit(_worker_ready) for _ in range(self.workers)]
+        wait(self._warmup)
+        self.logger.info(f"Workers de STT prontos em {time.time() - start_time:.2f}s.")
+
+    def is_ready(self) -> bool:
+        return all(f.done() and not f.exception() and f.result() for f in self._warmup)
+
+    def transcribe(self, audio: bytes) -> str:
+        try:
+            return self.transcribe_async(audio).result()
+        except Exception as e:
+            self.logger.error(f"Erro na transcrição (worker): {e}")
+            return ""
+
+    def transcribe_segments(self, audio: bytes) -> List[Tuple[float, float, str]]:
+        try:
+            return self._submit("transcribe_segments", audio).result()
+        except Exception as e:
+            self.logger.error(f"Erro na transcrição parcial (worker): {e}")
+            return []
+
+    def transcribe_async(self, audio: bytes) -> Future:
+        """
+        Submete a transcrição e retorna um Future (permite decodificar frases em paralelo).
+        """
+        return self._submit("transcribe", audio)
+
+    def _submit(self, method: str, audio) -> Future:
+        samples = np.frombuffer(audio, dtype=np.int16)
+        if samples.nbytes > self.slot_bytes:
+            self.logger.warning(f"Áudio maior que o slot ({self.max_seconds}s). Truncando.")
+            samples = samples[:self.slot_bytes // 2]
+
+        shm = self._free_slots.get()
+        try:
+            np.ndarray((len(samples),), dtype=np.int16, buffer=shm.buf)[:] = samples
+            future = self.executor.submit(_worker_run, method, shm.name, len(samples))
+        except Exception:
+            self._free_slots.put(shm)
+            raise
+        future.add_done_callback(lambda _: self._free_slots.put(shm))
+        return future
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for shm in self._slots:
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
@@ -0,0 +1,190 @@
+import threading
+import time
+from typing import Callable, List, Optional, Any
+from core.logger import setup_logger
+
+
+class StreamingTranscriber:
+    """
+    Transcrição incremental durante a captura.
+    Para STTs em lote (Whisper), decodifica janelas crescentes em background,
+    emite hipóteses parciais e confirma prefixos estáveis (local agreement),
+    de modo que ao fim da fala resta apenas o último trecho a decodificar.
+    STTs com reconhecimento contínuo nativo (`begin_stream`, ex: Vosk) são usados diretamente.
+    Configurado via `stt.streaming`.
+    """
+    def __init__(self, stt_service, config=None, emit: Optional[Callable[[str, Any], None]] = None,
+                 sample_rate: int = 16000):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.STT.Streaming", config)
+        stream_cfg = self.config.get("stt", {}).get("streaming", {})
+        self.native = hasattr(stt_service, "begin_stream")
+        self.enabled = stream_cfg.get("enabled", True) and (
+            self.native or hasattr(stt_service, "transcribe_segments"))
+        self.interval = stream_cfg.get("interval", 0.5)
+        self.min_window = stream_cfg.get("min_window", 0.8)
+        self.holdback = stream_cfg.get("holdback", 1.0)
+        self.stt_service = stt_service
+        self.emit = emit
+        self.sample_rate = sample_rate
+
+    def begin(self, buffer):
+        """
+        Inicia uma sessão sobre o buffer de captura (UtteranceBuffer) em andamento.
+        """
+        if self.native:
+            return self.stt_service.begin_stream(self.emit)
+        return WhisperStreamSession(self, buffer)
+
+
+class WhisperStreamSession:
+    """
+    Sessão de streaming de uma única frase.
+    A thread de captura chama `feed` a cada chunk; o consumidor chama `finalize`.
+    """
+    def __init__(self, transcriber: StreamingTranscriber, buffer):
+        self.transcriber = transcriber
+        self.logger = transcriber.logger
+        self.buffer = buffer
+        self.sample_rate = transcriber.sample_rate
+
+        self._available = 0
+        self._committed_sample = 0
+        self._committed_text: List[str] = []
+        self._previous_segments = None
+        # Última hipótese: (inicio_amostra, fim_amostra, texto não confirmado)
+        self._last_hypothesis = None
+
+        self._decode_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Callbacks de `cancel` que rodam quando a thread da sessão termina
+        self._exit_lock = threading.Lock()
+        self._exited = False
+        self._on_exit: List[Callable[[], None]] = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk):
+        """
+        Informa que mais amostras foram gravadas no buffer (O(1), sem decodificar).
+        """
+        self._available += len(chunk)
+
+    def cancel(self, on_done: Optional[Callable[[], None]] = None):
+        """
+        Encerra a sessão sem bloquear (pode ser chamado da thread de captura).
+        `on_done` roda quando nenhuma decodificação parcial usa mais o buffer
+        (ex.: devolvê-lo ao anel): na thread da sessão ao terminar, ou aqui
+        mesmo se ela já terminou.
+        """
+        self._stop.set()
+        if on_done is None:
+            return
+        with self._exit_lock:
+            if not self._exited:
+                self._on_exit.append(on_done)
+                return
+        on_done()
+
+    def _run(self):
+        try:
+            self._decode_loop()
+        finally:
+            with self._exit_lock:
+                self._exited = True
+                callbacks, self._on_exit = self._on_exit, []
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"Erro ao encerrar sessão de streaming: {e}")
+
+    def _decode_loop(self):
+        min_window = int(self.transcriber.min_window * self.sample_rate)
+        decoded_until = 0
+        while not self._stop.wait(self.transcriber.interval):
+            available = self._available
+            if available == decoded_until or available - self._committed_sample < min_window:
+                continue
+            with self._decode_lock:
+                if self._stop.is_set():
+                    break
+                self._decode_partial(available)
+            decoded_until = available
+
+    def _decode_partial(self, end: int):
+        start = self._committed_sample
+        segments = self.transcriber.stt_service.transcribe_segments(self.buffer.view(start, end))
+        if not segments:
+            return
+
+        window_seconds = (end - start) / self.sample_rate
+        stable_limit = window_seconds - self.transcriber.holdback
+
+        # Local agreement: confirma segmentos iguais em duas hipóteses seguidas
+        # e que terminam antes da margem final (ainda sujeita a mudanças).
+        committed = 0
+        if self._previous_segments:
+            for current, previous in zip(segments, self._previous_segments):
+                seg_end = current[1]
+                if seg_end is None or seg_end > stable_limit:
+                    break
+                if self._normalize(current[2]) != self._normalize(previous[2]):
+                    break
+                committed += 1
+
+        if committed:
+            commit_end = segments[committed - 1][1]
+            self._committed_text.extend(seg[2] for seg in segments[:committed] if seg[2])
+            self._committed_sample = start + int(commit_end * self.sample_rate)
+            self._previous_segments = None
+            pending = segments[committed:]
+        else:
+            self._previous_segments = segments
+            pending = segments
+
+        pending_text = " ".join(seg[2] for seg in pending if seg[2])
+        self._last_hypothesis = (self._committed_sample, end, pending_text)
+        self._publish(pending_text, final=False)
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Encerra a sessão e retorna o texto final.
+        Decodifica apenas o trecho ainda não confirmado; se a última hipótese
+        parcial já cobre a região de fala, ela é reaproveitada sem nova decodificação.
+        """
+        self._stop.set()
+        if end is None:
+            end = self._available
+
+        t0 = time.time()
+        with self._decode_lock:
+            hypothesis = self._last_hypothesis
+            if hypothesis and hypothesis[0] == self._committed_sample and hypothesis[1] >= end:
+                tail_text = hypothesis[2]
+                source = "parcial"
+            else:
+                tail_start = max(start, self._committed_sample)
+                tail_text = ""
+                if end > tail_start:
+                    tail_text = self.transcriber.stt_service.transcribe(self.buffer.view(tail_start, end))
+                source = f"delta {(end - tail_start) / self.sample_rate:.1f}s"
+
+        text = " ".join(t for t in self._committed_text + [tail_text] if t).strip()
+        self.logger.info(f"Transcrição final ({source}, {(time.time() - t0) * 1000:.0f}ms): '{text}'")
+        self._publish(text, final=True)
+        return text
+
+    def _publish(self, text: str, final: bool):
+        if not self.transcriber.emit:
+            return
+        if not final:
+            text = " ".join(t for t in self._committed_text + [text] if t)
+        try:
+            self.transcriber.emit("partial_transcript", {"text": text, "final": final})
+        except Exception as e:
+            self.logger.error(f"Erro ao emitir transcrição parcial: {e}")
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
@@ -0,0 +1,151 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Optional, Any
+from vosk import Model, KaldiRecognizer, SetLogLevel
+from core.interfaces import SpeechToText
+from core.logger import setup_logger
+
+
+class VoskSTT(SpeechToText):
+    """
+    Speech-to-Text using Vosk (Kaldi) with the model bundled under `model/`.
+    Supports native streaming: chunks are decoded as they arrive, so the
+    transcript is ready as soon as the user stops talking.
+    """
+    def __init__(self, config=None):
+        self.logger = setup_logger("Jarvis.STT.Vosk", config)
+        self.config = config or {}
+        self.model_path = self.config.get("stt", {}).get("model_path", "model")
+        self.sample_rate = 16000
+        self.model = None
+
+        self._load_model()
+
+    def _load_model(self):
+        try:
+            if not os.path.exists(self.model_path):
+                raise FileNotFoundError(f"Diretório do modelo não encontrado: {self.model_path}")
+
+            self.logger.info(f"Carregando modelo Vosk ({self.model_path})...")
+            start_time = time.time()
+            SetLogLevel(-1)
+            self.model = Model(self.model_path)
+            self.logger.info(f"Modelo Vosk carregado em {time.time() - start_time:.2f}s.")
+        except Exception as e:
+            self.logger.error(f"Falha ao carregar Vosk: {e}")
+            self.model = None
+
+    def is_ready(self) -> bool:
+        return self.model is not None
+
+    def transcribe(self, audio: bytes) -> str:
+        """
+        Transcribes a complete int16 16kHz mono capture (bytes or numpy view).
+        """
+        if not self.model:
+            self.logger.error("Vosk model not initialized.")
+            return ""
+
+        try:
+            start_time = time.time()
+            recognizer = KaldiRecognizer(self.model, self.sample_rate)
+            recognizer.AcceptWaveform(bytes(audio))
+            text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+            if text:
+                self.logger.info(f"Transcrição ({(time.time() - start_time) * 1000:.0f}ms): '{text}'")
+            return text
+        except Exception as e:
+            self.logger.error(f"Erro na transcrição: {e}")
+            return ""
+
+    def begin_stream(self, emit: Optional[Callable[[str, Any], None]] = None) -> "VoskStreamSession":
+        """
+        Starts a streaming recognition session fed chunk by chunk.
+        """
+        return VoskStreamSession(self, emit)
+
+
+class VoskStreamSession:
+    """
+    Sessão de reconhecimento contínuo.
+    `feed` apenas enfileira o chunk (não bloqueia a captura); uma thread dedicada
+    alimenta o KaldiRecognizer e emite hipóteses parciais.
+    """
+    _END = object()
+
+    def __init__(self, stt: VoskSTT, emit=None):
+        self.stt = stt
+        self.logger = stt.logger
+        self.emit = emit
+        self._queue = queue.Queue()
+        self._parts = []
+        self._last_partial = ""
+        self._cancelled = False
+        self._recognizer = KaldiRecognizer(stt.model, stt.sample_rate) if stt.model else None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk):
+        self._queue.put(chunk)
+
+    def cancel(self, on_done: Optional[Callable[[], None]] = None):
+        self._cancelled = True
+        self._queue.put(self._END)
+        # Os chunks são cópias enfileiradas: o buffer de captura já está livre
+        if on_done is not None:
+            on_done()
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is self._END or self._cancelled:
+                break
+            if not self._recognizer:
+                continue
+            try:
+                if self._recognizer.AcceptWaveform(bytes(chunk)):
+                    # Kaldi detectou fim de segmento: confirma o texto
+                    text = json.loads(self._recognizer.Result()).get("text", "")
+                    if text:
+                        self._parts.append(text)
+                        self._publish(" ".join(self._parts), final=False)
+                else:
+                    partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+                    if partial and partial != self._last_partial:
+                        self._last_partial = partial
+                        self._publish(" ".join(self._parts + [partial]), final=False)
+            except Exception as e:
+                self.logger.error(f"Erro no reconhecimento contínuo: {e}")
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Encerra a sessão. Os chunks já foram decodificados durante a captura,
+        então resta apenas o FinalResult do recognizer.
+        """
+        t0 = time.time()
+        self._queue.put(self._END)
+        self._thread.join()
+        if not self._recognizer:
+            return ""
+
+        try:
+            tail = json.loads(self._recognizer.FinalResult()).get("text", "")
+        except Exception as e:
+            self.logger.error(f"Erro ao finalizar reconhecimento: {e}")
+            tail = ""
+
+        text = " ".join(p for p in self._parts + [tail] if p).strip()
+        self.logger.info(f"Transcrição final (Vosk, {(time.time() - t0) * 1000:.0f}ms): '{text}'")
+        self._publish(text, final=True)
+        return text
+
+    def _publish(self, text: str, final: bool):
+        if not self.emit:
+            return
+        try:
+            self.emit("partial_transcript", {"text": text, "final": final})
+        except Exception as e:
+            self.logger.error(f"Erro ao emitir transcrição parcial: {e}")
@@ -3,7 +3,10 @@ from transformers import pipeline
 from core.interfaces import SpeechToText
 from core.logger import setup_logger
 import numpy as np
+import threading
 import time
+from contextlib import nullcontext
+from typing import List, Tuple
 
 class WhisperSTT(SpeechToText):
     """
@@ -16,13 +19,40 @@ class WhisperSTT(SpeechToText):
         self.language = self.config.get("stt", {}).get("language", "pt")
         self.device = "cpu" # Force CPU as requested
         self.pipe = None
+
+        # Modo de performance (stt.performance)
+        perf = self.config.get("stt", {}).get("performance", {})
+        self.quantize = perf.get("quantize", "none")
+        self.num_threads = perf.get("num_threads", 0)
+        self.interop_threads = perf.get("interop_threads", 0)
+        self.inference_mode = perf.get("inference_mode", True)
+        self.warmup = perf.get("warmup", True)
+        self.load_seconds = None
+        self.warmup_seconds = None
+        # Serializa chamadas ao pipeline (parciais de streaming + decodificação final)
+        self._lock = threading.Lock()
         
         self._load_model()
 
+    def _configure_threads(self):
+        if self.num_threads:
+            torch.set_num_threads(int(self.num_threads))
+        if self.interop_threads:
+            try:
+                torch.set_num_interop_threads(int(self.interop_threads))
+            except RuntimeError as e:
+                # Só pode ser definido uma vez por processo, antes de qualquer trabalho paralelo
+                self.logger.warning(f"Não foi possível definir interop threads: {e}")
+        self.logger.debug(f"Torch threads: intra={torch.get_num_threads()} interop={torch.get_num_interop_threads()}")
+
+    def _inference_context(self):
+        return torch.inference_mode() if self.inference_mode else nullcontext()
+
     def _load_model(self):
         try:
-            self.logger.info(f"Carregando modelo Whisper ({self.model_id}) no {self.device}...")
+            self.logger.info(f"Carregando modelo Whisper ({self.model_id}) no {self.device} (quantize={self.quantize})...")
             start_time = time.time()
+            self._configure_threads()
             
             # Initialize pipeline
             # generate_kwargs={"language": "portuguese"} forces language
@@ -32,16 +62,45 @@ class WhisperSTT(SpeechToText):
                 device=self.device,
                 generate_kwargs={"language": self.language}
             )
+
+            if self.quantize == "int8":
+                # Quantização dinâmica int8 das camadas lineares (pesos int8, ativações float)
+                self.pipe.model = torch.quantization.quantize_dynamic(
+                    self.pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
             
             end_time = time.time()
-            self.logger.info(f"Modelo Whisper carregado em {end_time - start_time:.2f}s.")
+            self.load_seconds = end_time - start_time
+            self.logger.info(f"Modelo Whisper carregado em {self.load_seconds:.2f}s.")
         except Exception as e:
             self.logger.error(f"Falha ao carregar Whisper: {e}")
             self.pipe = None
+            return
+
+        if self.warmup:
+            self._warm_up()
+
+    def _warm_up(self):
+        """
+        Decodifica 1s de silêncio para que o primeiro comando real não pague
+        a inicialização preguiçosa do torch/kernels.
+        """
+        try:
+            start_time = time.time()
+            with self._lock, self._inference_context():
+                self.pipe(np.zeros(16000, dtype=np.float32))
+            self.warmup_seconds = time.time() - start_time
+            self.logger.info(f"Warm-up do Whisper em {self.warmup_seconds:.2f}s.")
+        except Exception as e:
+            self.logger.warning(f"Falha no warm-up do Whisper: {e}")
+
+    def is_ready(self) -> bool:
+        return self.pipe is not None
 
     def transcribe(self, audio: bytes) -> str:
         """
-        Transcribes raw PCM audio bytes to text.
+        Transcribes raw PCM audio to text.
+        Accepts bytes or an int16 numpy view (zero-copy from the capture buffer).
         Assumes 16kHz, mono, int16 (standard from AudioInputManager).
         """
         if not self.pipe:
@@ -53,11 +112,12 @@ class WhisperSTT(SpeechToText):
             
             # Convert bytes (int16) to float32 numpy array normalized to [-1, 1]
             # SoundDevice captures int16 usually.
-            audio_np = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+            audio_np = self._to_float(audio)
             
             # Transcribe
             # pipeline expects numpy array or path
-            result = self.pipe(audio_np)
+            with self._lock, self._inference_context():
+                result = self.pipe(audio_np)
             text = result.get("text", "").strip()
             
             end_time = time.time()
@@ -71,3 +131,34 @@ class WhisperSTT(SpeechToText):
         except Exception as e:
             self.logger.error(f"Erro na transcrição: {e}")
             return ""
+
+    def transcribe_segments(self, audio: bytes) -> List[Tuple[float, float, str]]:
+        """
+        Transcribes audio returning timestamped segments: [(start_s, end_s, text), ...].
+        Used by the streaming transcriber to commit stable prefixes.
+        End timestamps may be None for an unfinished trailing segment.
+        """
+        if not self.pipe:
+            return []
+
+        try:
+            audio_np = self._to_float(audio)
+            with self._lock, self._inference_context():
+                result = self.pipe(audio_np, return_timestamps=True)
+
+            segments = []
+            for chunk in result.get("chunks", []):
+                start, end = chunk.get("timestamp", (None, None))
+                segments.append((start, end, chunk.get("text", "").strip()))
+            if not segments and result.get("text", "").strip():
+                segments.append((0.0, None, result["text"].strip()))
+            return segments
+
+        except Exception as e:
+            self.logger.error(f"Erro na transcrição parcial: {e}")
+            return []
+
+    @staticmethod
+    def _to_float(audio) -> np.ndarray:
+        # Convert int16 PCM (bytes or numpy view) to float32 normalized to [-1, 1]
+        return np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
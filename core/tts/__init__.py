@@ -1 +1,21 @@
-from .edge_tts_service import EdgeTTSService
\ No newline at end of file
+from typing import Any, Dict, Optional
+from core.interfaces import TextToSpeech
+from .queued_tts import QueuedTTSService, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+from .edge_tts_service import EdgeTTSService
+from .local_tts_service import LocalTTSService
+from .fallback_tts import FallbackTTSService
+
+
+def create_tts(config: Optional[Dict[str, Any]] = None) -> TextToSpeech:
+    """
+    Builds the TTS selected by `tts.provider`: "edge" (cloud voice), "local"
+    (offline pyttsx3) or "auto" (Edge within `tts.fallback.deadline_ms`,
+    local voice otherwise). Engine packages are imported lazily.
+    """
+    config = config or {}
+    provider = config.get("tts", {}).get("provider", "edge")
+    if provider == "local":
+        return LocalTTSService(config)
+    if provider == "auto":
+        return FallbackTTSService(config)
+    return EdgeTTSService(config)
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional
+from .queued_tts import QueuedTTSService, AudioStream
+
+
+class FallbackTTSService(QueuedTTSService):
+    """
+    Cloud voice with an offline safety net. Each sentence is first asked to
+    the primary engine (Edge); if its first audio chunk does not arrive
+    within `tts.fallback.deadline_ms` of playback waiting for the sentence
+    (prefetched sentences get the previous one's playback time on top), or
+    it fails, the request is abandoned and the sentence is synthesized by the
+    local engine (pyttsx3).
+
+    Only primary audio goes into the synthesis cache, so a late or offline
+    moment never pins the robotic voice to a phrase. Every utterance is
+    recorded with the engine that served it, how long playback waited for its
+    audio to become audible and why the fallback was used (see
+    `stats()["engines"]` and `served`).
+    """
+    def __init__(self, config, primary: Optional[QueuedTTSService] = None,
+                 fallback: Optional[QueuedTTSService] = None):
+        fallback_config = config.get("tts", {}).get("fallback", {})
+        self.deadline = fallback_config.get("deadline_ms", 800) / 1000
+        load_errors: Dict[str, str] = {}
+        self.primary = primary or self._load_engine(config, "edge", load_errors)
+        self.fallback = fallback or self._load_engine(config, "local", load_errors)
+        if self.primary is None and self.fallback is None:
+            raise RuntimeError(f"Nenhum motor de TTS disponível: {load_errors}")
+        # {texto, motor, ms de espera até o 1º áudio audível, motivo do fallback} por frase
+        self.served: deque = deque(maxlen=200)
+        self.fallback_reasons: Dict[str, int] = {}
+        super().__init__(config, logger_name="Jarvis.TTS.Fallback")
+        for name, error in load_errors.items():
+            self.logger.warning(f"Motor de TTS '{name}' indisponível: {error}")
+
+    @staticmethod
+    def _load_engine(config, name: str, errors: Dict[str, str]) -> Optional[QueuedTTSService]:
+        try:
+            if name == "edge":
+                from .edge_tts_service import EdgeTTSService
+                return EdgeTTSService(config, engine_only=True)
+            from .local_tts_service import LocalTTSService
+            return LocalTTSService(config, engine_only=True)
+        except Exception as e:
+            errors[name] = str(e) or type(e).__name__
+            return None
+
+    def _voice_id(self) -> tuple:
+        return (self.primary or self.fallback)._voice_id()
+
+    def _synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        # Pré-aquecimento do cache: só a voz principal
+        return (self.primary or self.fallback)._synthesize_stream(text)
+
+    async def _fill(self, stream: AudioStream, text: str, start: float) -> bool:
+        if self.primary is not None:
+            chunks = self.primary._synthesize_stream(text)
+            first_chunk = asyncio.ensure_future(chunks.__anext__())
+            try:
+                await self._wait_first_chunk(stream, first_chunk)
+            except asyncio.CancelledError:
+                first_chunk.cancel()
+                raise
+            reason = self._missed(first_chunk)
+            if reason is None:
+                self._record(stream, "edge", start, None)
+                stream.push(first_chunk.result())
+                async for chunk in chunks:
+                    stream.push(chunk)
+                return True
+            first_chunk.cancel()
+            if self.fallback is None:
+                raise RuntimeError(f"Voz principal falhou ({reason}).")
+            self.fallback_reasons[reason] = self.fallback_reasons.get(reason, 0) + 1
+            self.logger.warning(f"Voz principal: {reason}; usando a voz local.")
+        else:
+            reason = "indisponível"
+
+        first = True
+        async for chunk in self.fallback._synthesize_stream(text):
+            if first:
+                self._record(stream, "local", start, reason)
+                first = False
+            stream.push(chunk)
+        return False
+
+    async def _wait_first_chunk(self, stream: AudioStream, first_chunk: asyncio.Future):
+        """
+        Waits for the primary's first chunk. The deadline only runs once
+        playback is waiting for this sentence: a prefetched sentence may take
+        as long as the one before it keeps playing.
+        """
+        if self.fallback is None:
+            await asyncio.wait({first_chunk})
+            return
+        wanted = asyncio.ensure_future(stream.wanted.wait())
+        try:
+            await asyncio.wait({first_chunk, wanted}, return_when=asyncio.FIRST_COMPLETED)
+            if not first_chunk.done():
+                remaining = self.deadline - (time.perf_counter() - stream.wanted_at)
+                await asyncio.wait({first_chunk}, timeout=max(0.0, remaining))
+        finally:
+            wanted.cancel()
+
+    def _missed(self, first_chunk: asyncio.Future) -> Optional[str]:
+        """
+        Why the primary's first chunk is unusable (None = arrived in time).
+        """
+        if not first_chunk.done():
+            return "prazo"
+        if first_chunk.cancelled():
+            return "cancelada"
+        error = first_chunk.exception()
+        if error is None:
+            return None
+        if isinstance(error, StopAsyncIteration):
+            return "sem áudio"
+        return f"erro ({type(error).__name__})"
+
+    def _record(self, stream: AudioStream, engine: str, start: float, reason: Optional[str]):
+        self.metrics["first_chunk_ms"].append((time.perf_counter() - start) * 1000)
+        stream.source = {"engine": engine, "reason": reason}
+
+    def _on_audible(self, utterance, now: float):
+        # Tempo real de espera: de quando a reprodução pediu a frase até o áudio tocar
+        source = utterance.stream.source
+        if not source:
+            return  # Áudio do cache
+        waited = (now - (utterance.stream.wanted_at or utterance.queued_at)) * 1000
+        self.served.append({"text": utterance.text, "engine": source["engine"],
+                            "first_audio_ms": round(waited, 1), "reason": source["reason"]})
+        self.logger.debug(f"TTS {source['engine']} audível após {waited:.0f}ms: {utterance.text}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        engines: Dict[str, Dict[str, Any]] = {}
+        for entry in self.served:
+            engine = engines.setdefault(entry["engine"], {"utterances": 0, "total_ms": 0.0, "max_ms": 0.0})
+            engine["utterances"] += 1
+            engine["total_ms"] += entry["first_audio_ms"]
+            engine["max_ms"] = max(engine["max_ms"], entry["first_audio_ms"])
+        for engine in engines.values():
+            engine["avg_first_audio_ms"] = round(engine.pop("total_ms") / engine["utterances"], 1)
+        stats["deadline_ms"] = self.deadline * 1000
+        stats["engines"] = engines
+        stats["fallback_reasons"] = dict(self.fallback_reasons)
+        return stats
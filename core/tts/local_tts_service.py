@@ -0,0 +1,73 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+from .queued_tts import QueuedTTSService
+
+
+class LocalTTSService(QueuedTTSService):
+    """
+    Offline voice through pyttsx3 (SAPI5 on Windows, espeak on Linux,
+    NSSpeechSynthesizer on macOS): no network, robotic but immediate.
+
+    pyttsx3 can only render to a file, so each sentence goes through one
+    temporary WAV that is read back and removed. The engine is not thread
+    safe and lives on a single dedicated thread.
+
+    Config (`tts.local`): voice (id or part of the name; empty = system
+    default), rate (words per minute).
+    """
+    audio_format = "wav"
+
+    def __init__(self, config, engine_only: bool = False):
+        import pyttsx3  # Importado aqui: o pacote core.tts não exige pyttsx3
+        self._pyttsx3 = pyttsx3
+        local_config = config.get("tts", {}).get("local", {})
+        self.voice = local_config.get("voice") or ""
+        self.rate = local_config.get("rate", 180)
+        self._engine = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-local")
+        super().__init__(config, logger_name="Jarvis.TTS.Local", engine_only=engine_only)
+        # Inicializa o driver do sistema já, fora do caminho da primeira frase
+        self._executor.submit(self._get_engine)
+
+    def _voice_id(self) -> tuple:
+        return (f"pyttsx3:{self.voice}", str(self.rate))
+
+    async def _synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        yield await loop.run_in_executor(self._executor, self._render, text)
+
+    def _get_engine(self):
+        if self._engine is None:
+            engine = self._pyttsx3.init()
+            engine.setProperty("rate", self.rate)
+            if self.voice:
+                wanted = self.voice.lower()
+                for voice in engine.getProperty("voices"):
+                    if wanted == voice.id.lower() or wanted in (voice.name or "").lower():
+                        engine.setProperty("voice", voice.id)
+                        break
+                else:
+                    self.logger.warning(f"Voz local '{self.voice}' não encontrada; usando a padrão.")
+            self._engine = engine
+        return self._engine
+
+    def _render(self, text: str) -> bytes:
+        engine = self._get_engine()
+        fd, path = tempfile.mkstemp(prefix="jarvis_tts_", suffix=".wav")
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with open(path, "rb") as f:
+                audio = f.read()
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if not audio:
+            raise RuntimeError("pyttsx3 não gerou áudio.")
+        return audio
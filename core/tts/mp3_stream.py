@@ -0,0 +1,212 @@
+import asyncio
+import io
+import time
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+# MPEG áudio layer III: kbps por índice (MPEG-1 / MPEG-2 e 2.5) e taxas por versão
+_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def parse_frame_header(header: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns (frame_bytes, samples, sample_rate) for a layer III frame header,
+    or None if the 4 bytes are not a valid header.
+    """
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    samples = 1152 if mpeg1 else 576
+    padding = (header[2] >> 1) & 1
+    return (samples // 8) * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def is_mp3(data: bytes) -> bool:
+    """
+    True if the data starts like an MP3 stream (ID3v2 tag or a frame header).
+    """
+    return data[:3] == b"ID3" or parse_frame_header(data[:4]) is not None
+
+
+class Mp3FrameSplitter:
+    """
+    Cuts an MP3 byte stream, arriving in arbitrary chunks, into whole frames
+    (skipping an ID3v2 tag and resyncing on garbage), so each group of frames
+    can be decoded on its own.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+        self._skip = 0
+        self._started = False
+
+    def feed(self, data: bytes) -> List[Tuple[bytes, float]]:
+        """
+        Returns the complete frames found so far as (frame_bytes, seconds).
+        """
+        self._buffer += data
+        frames = []
+        pos = 0
+        buffer = self._buffer
+        if not self._started and len(buffer) >= 10:
+            self._started = True
+            if buffer[:3] == b"ID3":
+                size = (buffer[6] << 21) | (buffer[7] << 14) | (buffer[8] << 7) | buffer[9]
+                self._skip = 10 + size
+        if self._skip:
+            drop = min(self._skip, len(buffer))
+            self._skip -= drop
+            pos = drop
+        while len(buffer) - pos >= 4:
+            info = parse_frame_header(buffer[pos:pos + 4])
+            if info is None:
+                # Ressincroniza no próximo 0xFF
+                next_sync = buffer.find(b"\xff", pos + 1)
+                pos = next_sync if next_sync != -1 else len(buffer)
+                continue
+            size, samples, sample_rate = info
+            if len(buffer) - pos < size:
+                break
+            frames.append((bytes(buffer[pos:pos + size]), samples / sample_rate))
+            pos += size
+        del buffer[:pos]
+        return frames
+
+
+class PygameStreamPlayer:
+    """
+    Plays an MP3 stream while it is still arriving: frames are grouped into
+    segments (a short first one for low latency, longer ones after, sent
+    early when the scheduled audio is about to run out), each
+    decoded from memory into a pygame Sound and queued gaplessly on a reserved
+    mixer Channel. Segment start/end times are known from the decoded length,
+    so the end of playback is a timer, not a get_busy() polling loop.
+
+    MP3 frames may borrow bits from previous frames (bit reservoir), so each
+    segment is decoded together with the last `reservoir_frames` frames of the
+    previous one and the decoded PCM is trimmed back to the new frames' length.
+
+    Streams that do not start as MP3 (e.g. WAV from the local engine) are
+    received whole and decoded in one go.
+    """
+    def __init__(self, first_segment_ms: float = 150, segment_ms: float = 800, reservoir_frames: int = 2):
+        import pygame
+        self._pygame = pygame
+        self.first_segment = first_segment_ms / 1000
+        self.segment = segment_ms / 1000
+        self.reservoir_frames = reservoir_frames
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+        self.underruns = 0
+
+    def stop(self):
+        self.channel.stop()
+
+    async def play(self, chunks: AsyncIterator[bytes], on_start: Callable[[], None], streaming: bool = True):
+        """
+        Plays the chunks as they arrive and returns when the audio has ended.
+        With `streaming` False the whole stream is received before playing.
+        """
+        splitter = Mp3FrameSplitter()
+        received: List[bytes] = []
+        frames: List[bytes] = []
+        prefix: List[bytes] = []
+        seconds = 0.0
+        target = self.first_segment
+        first = True
+        schedule = _Schedule(self.channel, on_start, self)
+        try:
+            async for chunk in chunks:
+                if first:
+                    streaming = streaming and is_mp3(chunk)
+                    first = False
+                if not streaming:
+                    received.append(chunk)
+                    continue
+                for frame, duration in splitter.feed(chunk):
+                    frames.append(frame)
+                    seconds += duration
+                # Trecho completo, ou o que já está agendado acaba logo
+                if frames and (seconds >= target or (schedule.started and schedule.remaining() < self.segment / 2)):
+                    await schedule.add(self._decode(prefix, frames, seconds))
+                    prefix = frames[-self.reservoir_frames:] if self.reservoir_frames else []
+                    frames, seconds, target = [], 0.0, self.segment
+            if received:
+                await schedule.add(self._pygame.mixer.Sound(file=io.BytesIO(b"".join(received))))
+            elif frames:
+                await schedule.add(self._decode(prefix, frames, seconds))
+            await schedule.finished()
+        except asyncio.CancelledError:
+            self.channel.stop()
+            raise
+
+    def _decode(self, prefix: List[bytes], frames: List[bytes], seconds: float):
+        pygame = self._pygame
+        sound = pygame.mixer.Sound(file=io.BytesIO(b"".join(prefix + frames)))
+        if not prefix:
+            return sound
+        # Mantém só o fim correspondente aos frames novos (o atraso do decodificador
+        # já come parte do prefixo, então o corte é pelo tamanho e não pelo prefixo)
+        trim_seconds = sound.get_length() - seconds
+        if trim_seconds <= 0:
+            return sound
+        frequency, size, channels = pygame.mixer.get_init()
+        frame_bytes = abs(size) // 8 * channels
+        raw = sound.get_raw()
+        return pygame.mixer.Sound(buffer=raw[int(round(trim_seconds * frequency)) * frame_bytes:])
+
+
+class _Schedule:
+    """
+    Keeps the channel fed: pygame holds one playing and one queued Sound, so a
+    new segment is queued only once the previous queued one has started.
+    """
+    def __init__(self, channel, on_start: Callable[[], None], player: PygameStreamPlayer):
+        self.channel = channel
+        self.on_start = on_start
+        self.player = player
+        self.started = False
+        self.last_start: Optional[float] = None
+        self.end: Optional[float] = None
+
+    async def add(self, sound):
+        length = sound.get_length()
+        now = time.perf_counter()
+        if self.end is not None and now < self.last_start:
+            # O slot de fila do canal está ocupado até o segmento anterior começar
+            await asyncio.sleep(self.last_start - now + 0.005)
+            now = time.perf_counter()
+        if self.end is None or now >= self.end:
+            if self.started:
+                self.player.underruns += 1
+            self.channel.play(sound)
+            self.last_start, self.end = now, now + length
+            if not self.started:
+                self.started = True
+                self.on_start()
+        else:
+            self.channel.queue(sound)
+            self.last_start, self.end = self.end, self.end + length
+
+    def remaining(self) -> float:
+        return max(0.0, self.end - time.perf_counter()) if self.end is not None else 0.0
+
+    async def finished(self):
+        if self.end is None:
+            return
+        await asyncio.sleep(max(0.0, self.end - time.perf_counter()))
+        # Relógio da placa x relógio do sistema: só o resíduo final
+        for _ in range(10):
+            if not self.channel.get_busy():
+                break
+            await asyncio.sleep(0.01)
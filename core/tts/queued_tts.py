@@ -0,0 +1,427 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from abc import abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from core.interfaces import TextToSpeech
+from core.logger import setup_logger
+from .synthesis_cache import SynthesisCache
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+class Utterance:
+    """
+    One queued sentence. Ordered by (priority, arrival), lower priority first.
+    """
+    _counter = itertools.count()
+
+    def __init__(self, text: str, priority: int = PRIORITY_NORMAL):
+        self.text = text
+        self.priority = priority
+        self.seq = next(self._counter)
+        self.queued_at = time.perf_counter()
+        self.synthesis: Optional[asyncio.Task] = None
+        self.stream: Optional["AudioStream"] = None
+
+    def __lt__(self, other: "Utterance") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SynthesisCancelled(Exception):
+    pass
+
+
+class AudioStream:
+    """
+    Encoded audio chunks of one utterance: written by the synthesis task,
+    read by playback while synthesis is still running (same loop).
+    `wanted` is set when playback starts waiting for this utterance (it may
+    have been prefetched long before); `source` is what the engine reports
+    about the audio (e.g. which voice served it).
+    """
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._changed = asyncio.Event()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.wanted = asyncio.Event()
+        self.wanted_at: Optional[float] = None
+        self.source: Dict[str, Any] = {}
+
+    def want(self):
+        if not self.wanted.is_set():
+            self.wanted_at = time.perf_counter()
+            self.wanted.set()
+
+    def push(self, chunk: bytes):
+        if chunk:
+            self._chunks.append(chunk)
+            self._changed.set()
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.done = True
+        self.error = error
+        self._changed.set()
+
+    def data(self) -> bytes:
+        return b"".join(self._chunks)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        index = 0
+        while True:
+            while index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+
+class QueuedTTSService(TextToSpeech):
+    """
+    Base for TTS engines driven by one long-lived worker thread running a
+    single asyncio loop.
+
+    `speak` only enqueues (thread-safe, never blocks). The worker plays
+    utterances in priority order and synthesizes the next `tts.lookahead`
+    ones while the current one plays, so back-to-back sentences come out
+    without a synthesis gap. Playback starts from the first synthesized
+    chunks (`tts.streaming`), decoded in memory, with no temp files.
+    `speak(..., preempt=True)` interrupts a less urgent utterance; `stop` (hotkey barge-in) cancels playback, pending
+    synthesis and the queue.
+
+    Synthesized audio goes through a SynthesisCache (memory + disk), so
+    repeated phrases skip synthesis; `tts.cache.prewarm` phrases are
+    synthesized in the background at startup.
+
+    Subclasses implement `_synthesize_stream(text)` (async iterator of
+    encoded audio chunks) and `_voice_id()` (part of the cache key).
+    With `engine_only` no playback or cache is set up: the instance only
+    synthesizes for another service (see FallbackTTSService).
+    """
+    audio_format = "mp3"
+
+    def __init__(self, config, logger_name: str = "Jarvis.TTS", engine_only: bool = False):
+        self.config = config
+        self.logger = setup_logger(logger_name, config)
+        tts_config = config.get("tts", {})
+        self.lookahead = max(0, tts_config.get("lookahead", 1))
+        self.streaming_config = tts_config.get("streaming", {})
+        self.streaming = self.streaming_config.get("enabled", True)
+        self._stream_player = None
+        cache_config = tts_config.get("cache", {})
+        use_cache = cache_config.get("enabled", True) and not engine_only
+        self.cache = SynthesisCache(config, extension=self.audio_format) if use_cache else None
+
+        self._pending: List[Utterance] = []
+        self._current: Optional[Utterance] = None
+        self._play_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        # speak() já chamado mas ainda não enfileirado no loop (evita "ocioso" falso)
+        self._submitted = 0
+        self._idle_lock = threading.Lock()
+        self._last_end: Optional[float] = None
+        self.metrics: Dict[str, Any] = {"utterances": 0, "preempted": 0, "cancelled": 0, "errors": 0,
+                                        "synth_ms": deque(maxlen=200), "first_chunk_ms": deque(maxlen=200),
+                                        "queue_to_audio_ms": deque(maxlen=200), "gap_ms": deque(maxlen=200)}
+
+        if not engine_only:
+            self._init_playback()
+        if self.cache and cache_config.get("prewarm"):
+            self.prewarm(cache_config["prewarm"])
+
+    # --- API (any thread) ---
+
+    def speak(self, text: str, priority: int = PRIORITY_NORMAL, preempt: bool = False) -> None:
+        """
+        Queues text to be spoken. Lower `priority` plays first; with `preempt`
+        the current utterance is cut if it is less urgent.
+        """
+        if not text:
+            return
+        try:
+            utterance = Utterance(text, priority)
+            loop = self._ensure_loop()
+            with self._idle_lock:
+                self._submitted += 1
+                self._idle.clear()
+            loop.call_soon_threadsafe(self._enqueue, utterance, preempt)
+        except Exception as e:
+            self.logger.error(f"TTS Error: {e}")
+
+    def is_busy(self) -> bool:
+        """
+        Returns True if audio is playing or queued.
+        """
+        return not self._idle.is_set()
+
+    def stop(self) -> None:
+        """
+        Barge-in: stops current playback and drops queued/in-synthesis sentences.
+        """
+        try:
+            self._stop_playback()  # Corta o áudio já, sem esperar o loop
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._cancel_all)
+        except Exception as e:
+            self.logger.error(f"Error stopping TTS: {e}")
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def prewarm(self, phrases: List[str]):
+        """
+        Synthesizes missing phrases into the cache in the background (no playback).
+        """
+        if self.cache:
+            asyncio.run_coroutine_threadsafe(self._prewarm(list(phrases)), self._ensure_loop())
+
+    def stats(self) -> Dict[str, Any]:
+        def avg(values):
+            return round(sum(values) / len(values), 1) if values else None
+        m = self.metrics
+        stats = {"utterances": m["utterances"], "preempted": m["preempted"], "cancelled": m["cancelled"],
+                 "errors": m["errors"], "avg_synth_ms": avg(m["synth_ms"]),
+                 "avg_first_chunk_ms": avg(m["first_chunk_ms"]),
+                 "avg_queue_to_audio_ms": avg(m["queue_to_audio_ms"]), "avg_gap_ms": avg(m["gap_ms"])}
+        if self.cache:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    # --- Worker loop ---
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    self._wakeup = asyncio.Event()
+                    loop.create_task(self._player())
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                threading.Thread(target=_run, name="tts", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _enqueue(self, utterance: Utterance, preempt: bool):
+        with self._idle_lock:
+            self._submitted -= 1
+        heapq.heappush(self._pending, utterance)
+        current = self._current
+        if preempt and current is not None and utterance.priority < current.priority:
+            # A frase menos urgente é cortada (tocando ou ainda sintetizando)
+            self.logger.info(f"Preempting: {current.text}")
+            self.metrics["preempted"] += 1
+            if self._play_task:
+                self._play_task.cancel()
+            if current.synthesis:
+                current.synthesis.cancel()
+        self._prefetch()
+        self._wakeup.set()
+
+    def _cancel_all(self):
+        for utterance in self._pending:
+            if utterance.synthesis:
+                utterance.synthesis.cancel()
+        self.metrics["cancelled"] += len(self._pending) + (self._current is not None)
+        self._pending.clear()
+        if self._current is not None and self._current.synthesis:
+            self._current.synthesis.cancel()
+        if self._play_task:
+            self._play_task.cancel()
+        self._last_end = None
+
+    def _prefetch(self):
+        """
+        Starts synthesis of the next `lookahead` utterances (overlaps playback).
+        """
+        for utterance in heapq.nsmallest(self.lookahead, self._pending):
+            self._start_synthesis(utterance)
+
+    def _start_synthesis(self, utterance: Utterance):
+        if utterance.synthesis is None:
+            stream = utterance.stream = AudioStream()
+            utterance.synthesis = asyncio.ensure_future(self._produce(utterance))
+            # Cancelada (mesmo antes de começar): libera quem está lendo o stream
+            utterance.synthesis.add_done_callback(lambda _: stream.done or stream.finish(SynthesisCancelled()))
+
+    def _cache_key(self, text: str) -> str:
+        voice, rate = self._voice_id()
+        return SynthesisCache.key(voice, rate, text)
+
+    async def _produce(self, utterance: Utterance):
+        """
+        Fills the utterance's AudioStream from the cache or from the engine.
+        """
+        stream = utterance.stream
+        start = time.perf_counter()
+        key = self._cache_key(utterance.text) if self.cache else None
+        # Leitura do disco (acerto fora da memória) fora do loop de reprodução
+        audio = await asyncio.to_thread(self.cache.get, key) if key else None
+        if audio is not None:
+            self.logger.debug(f"Áudio em cache ({(time.perf_counter() - start) * 1000:.1f}ms): {utterance.text}")
+            stream.push(audio)
+            stream.finish()
+            return
+        try:
+            cacheable = await self._fill(stream, utterance.text, start)
+        except Exception as e:
+            stream.finish(e)
+            return
+        stream.finish()
+        self.metrics["synth_ms"].append((time.perf_counter() - start) * 1000)
+        if key and cacheable:
+            await asyncio.to_thread(self.cache.put, key, stream.data())
+
+    async def _fill(self, stream: AudioStream, text: str, start: float) -> bool:
+        """
+        Pushes the engine's audio chunks into the stream. Returns whether the
+        audio may be cached under `_cache_key(text)`.
+        """
+        first = True
+        async for chunk in self._synthesize_stream(text):
+            if first:
+                self.metrics["first_chunk_ms"].append((time.perf_counter() - start) * 1000)
+                first = False
+            stream.push(chunk)
+        return True
+
+    async def _prewarm(self, phrases: List[str]):
+        warmed = 0
+        for phrase in phrases:
+            key = self._cache_key(phrase)
+            if self.cache.contains(key):
+                continue
+            try:
+                audio = await self._synthesize(phrase)
+                await asyncio.to_thread(self.cache.put, key, audio)
+                warmed += 1
+            except Exception as e:
+                self.logger.warning(f"Pré-aquecimento falhou para '{phrase}': {e}")
+        if warmed:
+            self.logger.info(f"Cache de síntese pré-aquecido: {warmed} frase(s).")
+
+    async def _player(self):
+        while True:
+            if not self._pending:
+                self._last_end = None
+                with self._idle_lock:
+                    if not self._submitted:
+                        self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            utterance = heapq.heappop(self._pending)
+            self._current = utterance
+            self._start_synthesis(utterance)
+            self._prefetch()
+            self._play_task = asyncio.ensure_future(self._play(utterance))
+            await asyncio.wait({self._play_task})
+            self._play_task = None
+            self._current = None
+
+    async def _play(self, utterance: Utterance):
+        started = []
+
+        def on_start():
+            # Primeiro áudio audível da frase
+            now = time.perf_counter()
+            started.append(now)
+            if self._last_end is not None:
+                self.metrics["gap_ms"].append((now - self._last_end) * 1000)
+            self.metrics["queue_to_audio_ms"].append((now - utterance.queued_at) * 1000)
+            self.metrics["utterances"] += 1
+            self.logger.info(f"Speaking: {utterance.text}")
+            self._on_audible(utterance, now)
+
+        utterance.stream.want()
+        try:
+            await self._play_stream(utterance.stream.chunks(), on_start)
+            self._last_end = time.perf_counter() if started else None
+        except asyncio.CancelledError:
+            self._stop_playback()
+            self._last_end = None
+            raise
+        except SynthesisCancelled:
+            self._last_end = None
+        except Exception as e:
+            self.metrics["errors"] += 1
+            self.logger.error(f"TTS Error ({'playback' if started else 'synthesis'}): {e}")
+            self._stop_playback()
+            self._last_end = None
+
+    # --- Engine hooks ---
+
+    @abstractmethod
+    def _synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Async iterator of encoded audio chunks (`self.audio_format`) for the text.
+        """
+        pass
+
+    async def _synthesize(self, text: str) -> bytes:
+        """
+        Whole encoded audio for the text (used by pre-warming).
+        """
+        return b"".join([chunk async for chunk in self._synthesize_stream(text)])
+
+    def _on_audible(self, utterance: Utterance, now: float):
+        """
+        Called when the utterance's first audio becomes audible.
+        """
+        pass
+
+    def _voice_id(self) -> tuple:
+        """
+        (voice, rate) identifying the audio this engine produces (cache key).
+        """
+        return (type(self).__name__, "")
+
+    def _init_playback(self):
+        try:
+            import pygame
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            from .mp3_stream import PygameStreamPlayer
+            self._stream_player = PygameStreamPlayer(
+                first_segment_ms=self.streaming_config.get("first_segment_ms", 150),
+                segment_ms=self.streaming_config.get("segment_ms", 800),
+                reservoir_frames=self.streaming_config.get("reservoir_frames", 2),
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to init pygame mixer: {e}")
+
+    async def _play_stream(self, chunks: AsyncIterator[bytes], on_start: Callable[[], None]):
+        """
+        Plays the chunks (from the first ones, if streaming) and returns when
+        playback has ended.
+        """
+        if self._stream_player is None:
+            raise RuntimeError("Saída de áudio indisponível.")
+        await self._stream_player.play(chunks, on_start, streaming=self.streaming)
+
+    def _stop_playback(self):
+        try:
+            if self._stream_player is not None:
+                self._stream_player.stop()
+        except Exception:
+            pass
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from core.logger import setup_logger
+
+
+class SynthesisCache:
+    """
+    Cache de áudio sintetizado, endereçado por conteúdo: chave = sha256 de
+    (voz, velocidade, texto). Duas camadas:
+      - memória: LRU limitada por bytes (frases curtas e frequentes);
+      - disco: um arquivo por chave em `path`, limitado por tamanho total e
+        despejado por último acesso (mtime).
+
+    Config (`tts.cache`): enabled, memory_mb, disk_mb, path.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None, extension: str = "mp3"):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.TTS.Cache", config)
+        cfg = self.config.get("tts", {}).get("cache", {})
+        self.enabled = cfg.get("enabled", True)
+        self.memory_limit = int(cfg.get("memory_mb", 8) * 1024 * 1024)
+        self.disk_limit = int(cfg.get("disk_mb", 100) * 1024 * 1024)
+        self.path = cfg.get("path", "data/tts_cache")
+        self.extension = extension
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # chave -> (tamanho, último acesso); ordem = LRU do disco
+        self._disk: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        if self.enabled and self.disk_limit > 0:
+            self._scan_disk()
+
+    @staticmethod
+    def key(voice: str, rate: str, text: str) -> str:
+        return hashlib.sha256(f"{voice}\x00{rate}\x00{text.strip()}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+            on_disk = key in self._disk
+        if on_disk:
+            audio = self._read(key)
+            if audio is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._touch_disk(key, len(audio))
+                    self._remember(key, audio)
+                return audio
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def put(self, key: str, audio: bytes):
+        if not self.enabled or not audio:
+            return
+        with self._lock:
+            self._remember(key, audio)
+            stored = key in self._disk
+        if not stored and self.disk_limit > 0 and len(audio) <= self.disk_limit:
+            self._write(key, audio)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_kb": round(self._memory_bytes / 1024, 1),
+            "disk_entries": len(self._disk),
+            "disk_kb": round(self._disk_bytes / 1024, 1),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+        }
+
+    # --- Camada de memória (chamar com _lock) ---
+
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) > self.memory_limit:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.memory_evictions += 1
+
+    # --- Camada de disco ---
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.{self.extension}")
+
+    def _scan_disk(self):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.path):
+                name, ext = os.path.splitext(entry.name)
+                if entry.is_file() and ext == f".{self.extension}":
+                    st = entry.stat()
+                    entries.append((st.st_mtime, name, st.st_size))
+            for mtime, name, size in sorted(entries):
+                self._disk[name] = (size, mtime)
+                self._disk_bytes += size
+            self._evict_disk()
+            if self._disk:
+                self.logger.info(f"Cache de síntese: {len(self._disk)} frases em disco "
+                                 f"({self._disk_bytes / 1024 / 1024:.1f} MB).")
+        except OSError as e:
+            self.logger.warning(f"Cache de síntese em disco indisponível ({self.path}): {e}")
+            self.disk_limit = 0
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._file(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._file(key))
+            return audio
+        except OSError:
+            with self._lock:
+                entry = self._disk.pop(key, None)
+                if entry:
+                    self._disk_bytes -= entry[0]
+            return None
+
+    def _write(self, key: str, audio: bytes):
+        try:
+            tmp_path = self._file(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._file(key))
+        except OSError as e:
+            self.logger.warning(f"Falha ao salvar áudio no cache: {e}")
+            return
+        with self._lock:
+            self._touch_disk(key, len(audio))
+            self._evict_disk()
+
+    def _touch_disk(self, key: str, size: int):
+        previous = self._disk.pop(key, None)
+        if previous:
+            self._disk_bytes -= previous[0]
+        self._disk[key] = (size, time.time())
+        self._disk_bytes += size
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.disk_limit and self._disk:
+            key, (size, _) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._file(key))
+            except OSError:
+                pass
@@ -0,0 +1,21 @@
+from typing import Any, Dict, Optional
+from core.interfaces import VoiceActivityDetector
+from .energy_vad import EnergyVAD, AdaptiveEnergyVAD
+from .spectral_vad import SpectralVAD
+from .endpointer import Endpointer
+
+VAD_ENGINES = {
+    "energy": EnergyVAD,
+    "adaptive": AdaptiveEnergyVAD,
+    "spectral": SpectralVAD,
+}
+
+
+def create_vad(config: Optional[Dict[str, Any]] = None, blocksize: int = 4096) -> VoiceActivityDetector:
+    """
+    Builds the VAD engine selected by `vad.engine` (energy, adaptive or spectral).
+    """
+    engine = (config or {}).get("vad", {}).get("engine", "adaptive")
+    if engine not in VAD_ENGINES:
+        raise ValueError(f"Unknown VAD engine: {engine}")
+    return VAD_ENGINES[engine](config, blocksize=blocksize)
@@ -0,0 +1,43 @@
+from typing import Optional
+
+
+class Endpointer:
+    """
+    Decide o fim de uma captura a partir das decisões do VAD por chunk.
+    Usa o relógio das amostras (duração dos chunks) em vez do relógio de parede,
+    o que torna o comportamento idêntico ao vivo, em replay e no harness offline.
+    """
+    SPEECH_END = "speech_end"
+    NO_SPEECH = "no_speech"
+
+    def __init__(self, config=None):
+        vad_cfg = (config or {}).get("vad", {})
+        self.silence_timeout_speech = vad_cfg.get("silence_timeout_speech", 1.0)
+        self.silence_timeout_no_speech = vad_cfg.get("silence_timeout_no_speech", 5.0)
+        self.has_speech_started = False
+        self.silence_duration = 0.0
+
+    def reset(self, speech_started: bool):
+        """
+        Início de captura: passiva (já com voz) ou via hotkey (aguardando voz).
+        """
+        self.has_speech_started = speech_started
+        self.silence_duration = 0.0
+
+    def update(self, is_speech: bool, seconds: float) -> Optional[str]:
+        """
+        Processa um chunk de `seconds` de duração.
+        Retorna o motivo do fim da captura, ou None para continuar.
+        """
+        if is_speech:
+            self.has_speech_started = True
+            self.silence_duration = 0.0
+            return None
+
+        self.silence_duration += seconds
+        if self.has_speech_started:
+            if self.silence_duration > self.silence_timeout_speech:
+                return self.SPEECH_END
+        elif self.silence_duration > self.silence_timeout_no_speech:
+            return self.NO_SPEECH
+        return None
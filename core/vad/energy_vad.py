@@ -0,0 +1,84 @@
+import numpy as np
+from collections import deque
+from core.interfaces import VoiceActivityDetector
+from core.audio_buffer import chunk_rms
+
+
+class EnergyVAD(VoiceActivityDetector):
+    """
+    Limiar fixo de energia RMS (comportamento original do VoiceLoop).
+    """
+    def __init__(self, config=None, blocksize: int = 4096):
+        vad_cfg = (config or {}).get("vad", {})
+        self.threshold = vad_cfg.get("energy_threshold", 300)
+        self._scratch = np.empty(blocksize, dtype=np.float32)
+        self.last_energy = 0.0
+
+    def is_speech(self, chunk: np.ndarray) -> bool:
+        self.last_energy = chunk_rms(chunk, self._scratch)
+        return self.last_energy > self.threshold
+
+
+class NoiseFloorTracker:
+    """
+    Estimativa do piso de ruído por chunk.
+    - Chunks sem voz: média móvel exponencial (desce rápido, sobe devagar).
+    - Estatística de mínimos: se o ruído sobe de patamar acima do limiar, tudo
+      passa a parecer fala e a média nunca seria atualizada. Por isso, quando o
+      menor nível da janela recente (`vad.noise_window_seconds`) está acima do
+      piso, o piso sobe devagar em direção a ele. Fala real tem pausas, então o
+      mínimo da janela não "aprende" a própria fala.
+    """
+    def __init__(self, vad_cfg, blocksize: int, sample_rate: int = 16000):
+        self.adapt_rate = vad_cfg.get("adapt_rate", 0.05)
+        self.initial_floor = vad_cfg.get("initial_noise_floor", 100.0)
+        window_seconds = vad_cfg.get("noise_window_seconds", 5.0)
+        self._recent = deque(maxlen=max(2, int(window_seconds * sample_rate / blocksize)))
+        self.floor = self.initial_floor
+
+    def update(self, energy: float, speech: bool):
+        self._recent.append(energy)
+        if not speech:
+            rate = self.adapt_rate if energy > self.floor else self.adapt_rate * 4
+            self.floor += (energy - self.floor) * min(rate, 1.0)
+        elif len(self._recent) == self._recent.maxlen:
+            minimum = min(self._recent)
+            if minimum > self.floor:
+                self.floor += (minimum - self.floor) * min(self.adapt_rate, 1.0)
+
+    def reset(self):
+        self.floor = self.initial_floor
+        self._recent.clear()
+
+
+class AdaptiveEnergyVAD(VoiceActivityDetector):
+    """
+    Limiar de energia relativo a um piso de ruído estimado continuamente
+    (NoiseFloorTracker). Fala = energia > piso * razão.
+    """
+    def __init__(self, config=None, blocksize: int = 4096):
+        vad_cfg = (config or {}).get("vad", {})
+        self.ratio = vad_cfg.get("noise_ratio", 3.0)
+        self.min_threshold = vad_cfg.get("min_threshold", 150)
+        self.max_threshold = vad_cfg.get("max_threshold", 3000)
+        self._scratch = np.empty(blocksize, dtype=np.float32)
+        self.floor_tracker = NoiseFloorTracker(vad_cfg, blocksize)
+        self.last_energy = 0.0
+
+    @property
+    def noise_floor(self) -> float:
+        return self.floor_tracker.floor
+
+    @property
+    def threshold(self) -> float:
+        return min(max(self.noise_floor * self.ratio, self.min_threshold), self.max_threshold)
+
+    def is_speech(self, chunk: np.ndarray) -> bool:
+        energy = chunk_rms(chunk, self._scratch)
+        self.last_energy = energy
+        speech = energy > self.threshold
+        self.floor_tracker.update(energy, speech)
+        return speech
+
+    def reset(self) -> None:
+        self.floor_tracker.reset()
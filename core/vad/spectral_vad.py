@@ -0,0 +1,60 @@
+import numpy as np
+from core.interfaces import VoiceActivityDetector
+from .energy_vad import NoiseFloorTracker
+
+
+class SpectralVAD(VoiceActivityDetector):
+    """
+    VAD por sub-quadros: energia relativa ao piso de ruído, taxa de cruzamentos
+    por zero e planicidade espectral, calculadas de forma vetorizada sobre o chunk.
+    Ruído de fundo (ventilador, teclado) tende a ter espectro plano ou ZCR alto;
+    fala vozeada tem energia concentrada em harmônicos e ZCR moderado.
+    """
+    def __init__(self, config=None, blocksize: int = 4096, sample_rate: int = 16000):
+        vad_cfg = (config or {}).get("vad", {})
+        self.frame = vad_cfg.get("spectral_frame", 256)
+        self.ratio = vad_cfg.get("noise_ratio", 3.0)
+        self.min_threshold = vad_cfg.get("min_threshold", 150)
+        self.max_zcr = vad_cfg.get("max_zcr", 0.35)
+        self.max_flatness = vad_cfg.get("max_flatness", 0.5)
+        self.min_voiced_fraction = vad_cfg.get("min_voiced_fraction", 0.25)
+
+        # Faixa de fala (100 Hz - 4 kHz) para a planicidade espectral
+        freqs = np.fft.rfftfreq(self.frame, 1.0 / sample_rate)
+        self._band = (freqs >= 100) & (freqs <= 4000)
+        self._window = np.hanning(self.frame).astype(np.float32)
+        self.floor_tracker = NoiseFloorTracker(vad_cfg, blocksize, sample_rate)
+        self.last_energy = 0.0
+
+    @property
+    def noise_floor(self) -> float:
+        return self.floor_tracker.floor
+
+    @property
+    def threshold(self) -> float:
+        return max(self.noise_floor * self.ratio, self.min_threshold)
+
+    def is_speech(self, chunk: np.ndarray) -> bool:
+        n_frames = len(chunk) // self.frame
+        if n_frames == 0:
+            return False
+
+        frames = chunk[:n_frames * self.frame].reshape(n_frames, self.frame).astype(np.float32)
+
+        energy = np.sqrt(np.einsum('ij,ij->i', frames, frames) / self.frame)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1))[:, self._band] ** 2 + 1e-10
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        voiced = (energy > self.threshold) & (zcr < self.max_zcr) & (flatness < self.max_flatness)
+        speech = np.count_nonzero(voiced) >= self.min_voiced_fraction * n_frames
+
+        chunk_energy = float(np.sqrt(np.mean(energy ** 2)))
+        self.last_energy = chunk_energy
+        self.floor_tracker.update(chunk_energy, bool(speech))
+        return bool(speech)
+
+    def reset(self) -> None:
+        self.floor_tracker.reset()
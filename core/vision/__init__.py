@@ -1 +1 @@
-from .screen_capture import ScreenCapture
+from .screen_capture import ScreenCapture, CapturedFrame
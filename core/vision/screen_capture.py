@@ -1,25 +1,171 @@
-import pyautogui
-from PIL import Image
+import hashlib
 import io
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image
 from core.logger import setup_logger
 
+_FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "jpg": ("JPEG", "image/jpeg"),
+            "webp": ("WEBP", "image/webp"), "png": ("PNG", "image/png")}
+
+
+@dataclass
+class CapturedFrame:
+    """
+    An encoded screenshot ready to be sent to the model, plus per-request metrics.
+    """
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    quality: Optional[int]
+    capture_ms: float
+    encode_ms: float
+    cached: bool = False
+    region: Optional[Tuple[int, int, int, int]] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+
 class ScreenCapture:
     """
     Utility for capturing screen content.
+
+    Frames are downscaled to `vision.max_dimension`, encoded as JPEG/WebP/PNG
+    (lowering the quality until `vision.max_kb` is met) and cached by an exact
+    digest of the downscaled pixels: only a pixel-identical screen, captured
+    within `vision.cache.max_age_seconds`, reuses the previous encoded frame.
+    Any change (a blinking cursor, a new line of text) triggers a fresh encode.
+    `vision.region` selects "full", "active_window" or a fixed [x, y, w, h].
     """
     def __init__(self, config):
         self.config = config
         self.logger = setup_logger("Jarvis.Vision", config)
-        
-    def capture(self) -> Image.Image:
+        cfg = (config or {}).get("vision", {})
+        self.region = cfg.get("region", "full")
+        self.max_dimension = cfg.get("max_dimension", 1280)
+        self.format = str(cfg.get("format", "jpeg")).lower()
+        if self.format not in _FORMATS:
+            self.logger.warning(f"Unknown vision.format '{self.format}', using jpeg.")
+            self.format = "jpeg"
+        self.quality = cfg.get("quality", 70)
+        self.min_quality = cfg.get("min_quality", 35)
+        self.max_kb = cfg.get("max_kb", 0)
+        cache_cfg = cfg.get("cache", {})
+        self.cache_enabled = cache_cfg.get("enabled", True)
+        self.cache_max_age = cache_cfg.get("max_age_seconds", 5)
+
+        self._last_digest: Optional[bytes] = None
+        self._last_frame: Optional[CapturedFrame] = None
+        self._last_time = 0.0
+        self.last_metrics: Dict[str, Any] = {}
+        self.totals = {"captures": 0, "cache_hits": 0, "bytes_sent": 0}
+
+    def capture(self) -> Optional[CapturedFrame]:
         """
-        Captures the entire primary screen.
-        Returns: PIL.Image
+        Captures the configured region and returns an encoded frame, or None on failure.
         """
         try:
-            screenshot = pyautogui.screenshot()
-            self.logger.info("Screenshot taken.")
-            return screenshot
+            start = time.perf_counter()
+            region = self._resolve_region()
+            image = self._grab(region)
+            image = self._downscale(image)
+            capture_ms = (time.perf_counter() - start) * 1000
         except Exception as e:
             self.logger.error(f"Failed to capture screen: {e}")
             return None
+
+        self.totals["captures"] += 1
+        digest = pixel_digest(image) if self.cache_enabled else None
+        previous = self._last_frame
+        if (previous is not None and digest is not None and digest == self._last_digest
+                and previous.region == region and (previous.width, previous.height) == image.size
+                and time.monotonic() - self._last_time <= self.cache_max_age):
+            frame = CapturedFrame(previous.data, previous.mime_type, previous.width, previous.height,
+                                  previous.quality, capture_ms, 0.0, cached=True, region=region)
+            self.totals["cache_hits"] += 1
+        else:
+            start = time.perf_counter()
+            data, mime_type, quality = self._encode(image)
+            frame = CapturedFrame(data, mime_type, image.width, image.height, quality,
+                                  capture_ms, (time.perf_counter() - start) * 1000, region=region)
+            self._last_frame = frame
+            self._last_digest = digest
+            self._last_time = time.monotonic()
+
+        self.totals["bytes_sent"] += frame.size_bytes
+        frame.metrics = self.last_metrics = {
+            "capture_ms": round(frame.capture_ms, 1),
+            "encode_ms": round(frame.encode_ms, 1),
+            "payload_kb": round(frame.size_bytes / 1024, 1),
+            "size": f"{frame.width}x{frame.height}",
+            "format": frame.mime_type,
+            "quality": frame.quality,
+            "cached": frame.cached,
+        }
+        self.logger.info(
+            f"Screenshot: capture {frame.capture_ms:.0f}ms, encode {frame.encode_ms:.0f}ms"
+            f"{' (cached)' if frame.cached else ''}, {frame.size_bytes / 1024:.0f} KB "
+            f"({frame.width}x{frame.height} {frame.mime_type}"
+            f"{f' q{frame.quality}' if frame.quality else ''})")
+        return frame
+
+    def _resolve_region(self) -> Optional[Tuple[int, int, int, int]]:
+        if isinstance(self.region, (list, tuple)) and len(self.region) == 4:
+            return tuple(int(v) for v in self.region)
+        if self.region == "active_window":
+            try:
+                import pyautogui
+                window = pyautogui.getActiveWindow()
+                if window is not None and window.width > 0 and window.height > 0:
+                    return (max(window.left, 0), max(window.top, 0), window.width, window.height)
+            except Exception as e:
+                self.logger.debug(f"Active window unavailable ({e}), capturing full screen.")
+        return None
+
+    def _grab(self, region: Optional[Tuple[int, int, int, int]]) -> Image.Image:
+        import pyautogui
+        return pyautogui.screenshot(region=region)
+
+    def _downscale(self, image: Image.Image) -> Image.Image:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if not self.max_dimension or max(image.size) <= self.max_dimension:
+            return image
+        scale = self.max_dimension / max(image.size)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        # reducing_gap: cheap integer-factor reduction before the final filter
+        return image.resize(size, Image.BILINEAR, reducing_gap=1.0)
+
+    def _encode(self, image: Image.Image) -> Tuple[bytes, str, Optional[int]]:
+        pil_format, mime_type = _FORMATS[self.format]
+        if pil_format == "PNG":
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG", optimize=False, compress_level=3)
+            return buffer.getvalue(), mime_type, None
+
+        quality = self.quality
+        while True:
+            buffer = io.BytesIO()
+            image.save(buffer, pil_format, quality=quality)
+            data = buffer.getvalue()
+            if not self.max_kb or len(data) <= self.max_kb * 1024 or quality <= self.min_quality:
+                return data, mime_type, quality
+            quality = max(self.min_quality, quality - 15)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.totals, last=self.last_metrics)
+
+
+def pixel_digest(image: Image.Image) -> bytes:
+    """
+    Exact digest of the image's mode, size and raw pixels.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.width}x{image.height}".encode())
+    digest.update(image.tobytes())
+    return digest.digest()
@@ -3,13 +3,46 @@ import time
 import json
 import numpy as np
 import threading
+import concurrent.futures
 import queue
 from core.logger import setup_logger
 from threading import Event
 from core.kernel import Kernel, SystemState
-from core.audio_manager import AudioInputManager
-from core.stt import WhisperSTT
+from core.audio_buffer import UtteranceRing
+from core.audio_trim import SilenceTrimmer
+from core.stt import create_stt
+from core.stt.streaming import StreamingTranscriber
 from core.input_listener import InputListener
+from core.wake_word import WakeWordGate
+from core.vad import create_vad, Endpointer
+import unicodedata
+import string
+
+
+def create_audio_input(config):
+    """
+    Fonte de áudio selecionada por `audio.source`: "mic" (SoundDevice) ou "wav" (replay).
+    Import tardio: o replay não exige PortAudio instalado.
+    """
+    source = (config or {}).get("audio", {}).get("source", "mic")
+    if source == "wav":
+        from core.audio_replay import WavReplayInput
+        return WavReplayInput(config)
+    from core.audio_manager import AudioInputManager
+    return AudioInputManager(config)
+
+
+def _to_id(s):
+    """
+    Normalização agressiva para comparação da wake word (sem acentos, pontuação e espaços).
+    """
+    if not s: return ""
+    if isinstance(s, bytes): s = s.decode('utf-8', errors='ignore')
+    s = unicodedata.normalize('NFD', s).encode('ascii', 'ignore').decode('utf-8')
+    s = s.lower()
+    s = s.translate(str.maketrans('', '', string.punctuation + " \t\n\r"))
+    return s
+
 
 class VoiceLoop:
     """
@@ -23,8 +56,14 @@ class VoiceLoop:
         self.config = kernel.config
         
         # Componentes
-        self.audio_manager = AudioInputManager(self.config)
-        self.stt_service = WhisperSTT(config=self.config) # Whisper
+        self.audio_manager = create_audio_input(self.config)
+        self.trimmer = SilenceTrimmer(self.config, sample_rate=self.audio_manager.samplerate)
+        self.wake_gate = WakeWordGate(self.config, sample_rate=self.audio_manager.samplerate)
+        self.vad = create_vad(self.config, blocksize=self.audio_manager.blocksize)
+        # STT carregado em background: a captura começa a bufferizar imediatamente
+        self.stt_service = None
+        self.streamer = None
+        self.kernel.load_service_async("stt", self._load_stt)
         self.input_listener = InputListener(config=self.config, on_activate=self.on_hotkey_activate)
         
         self.is_running = False
@@ -33,11 +72,26 @@ class VoiceLoop:
         
         # Queue for decoupling capture from processing
         self.processing_queue = queue.Queue()
+        self.buffer_ring = None
+
+        # Latências por comando (fim da captura -> dispatch), para benchmarks
+        self.latencies = []
+        # Comandos despachados ainda em execução no Kernel
+        self._pending = set()
+
+    def _load_stt(self):
+        stt_service = create_stt(self.config) # Whisper ou Vosk (stt.provider)
+        self.streamer = StreamingTranscriber(stt_service, self.config, emit=self.kernel.emit,
+                                             sample_rate=self.audio_manager.samplerate)
+        self.stt_service = stt_service
+        return stt_service
 
     def on_hotkey_activate(self):
         self.logger.info(">>> ATIVADO via Hotkey <<<")
         
-        # Stop TTS if speaking
+        # Novo comando substitui o anterior ainda em andamento; cancelar antes de
+        # parar a TTS silencia frases que o comando ainda esteja enviando
+        self.kernel.cancel_dispatches()
         if self.kernel.tts:
              self.kernel.tts.stop()
              
@@ -47,11 +101,14 @@ class VoiceLoop:
     def start(self):
         self.input_listener.start()
         
-        # Model loading happens in STT init
-        if not self.stt_service.pipe:
-            self.logger.error("Serviço Whisper STT não está pronto (pipe=None).")
+        # Model loading happens in background (Kernel.load_service_async)
+        provider = self.config.get("stt", {}).get("provider", "whisper")
+        if not self.kernel.is_service_ready("stt"):
+            self.logger.info(f"Serviço STT ({provider}) ainda carregando. O áudio já está sendo capturado.")
+        elif not self.stt_service or not self.stt_service.is_ready():
+            self.logger.error(f"Serviço STT ({provider}) não está pronto.")
 
-        self.logger.info("Sistema pronto (Whisper). Pressione Ctrl+Alt+J.")
+        self.logger.info(f"Sistema pronto ({provider}). Pressione Ctrl+Alt+J.")
         self.is_running = True
         
         # Start Consumer Thread
@@ -62,21 +119,22 @@ class VoiceLoop:
             stream = self.audio_manager.start_stream()
             
             # Buffer Configuration
-            BUFFER_DURATION = 5.0 # Max seconds per phrase
-            SAMPLE_RATE = 16000
-            ENERGY_THRESHOLD = 300
+            SAMPLE_RATE = self.audio_manager.samplerate
+            MAX_BUFFER_SECONDS = 15.0
             
-            audio_buffer = []
+            # Buffers pré-alocados (int16) reciclados entre captura e consumidor
+            self.buffer_ring = UtteranceRing(int(SAMPLE_RATE * MAX_BUFFER_SECONDS))
+            
+            capture = None
+            session = None
             is_capturing = False
-            silence_start = 0
-            has_speech_started = False
             
             # Track trigger type
             self.is_manual_trigger = False
 
-            # VAD Parameters
-            SILENCE_TIMEOUT_SPEECH = 1.0    # Stop after 1.0s silence if speech was detected
-            SILENCE_TIMEOUT_NO_SPEECH = 5.0 # Stop after 5.0s if no speech detected
+            # VAD (engine plugável) + endpointing por relógio de amostras (vad.* no config)
+            self.vad.reset()
+            endpointer = Endpointer(self.config)
             
             self.logger.info("Aguardando comando...")
             
@@ -84,72 +142,72 @@ class VoiceLoop:
                 if not self.is_running:
                     break
                 
+                chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
+                if len(chunk_np) == 0:
+                    continue
+                
+                # Decisão do VAD calculada uma única vez por chunk
+                is_speech = self.vad.is_speech(chunk_np)
+                chunk_seconds = len(chunk_np) / SAMPLE_RATE
+                
                 # Check Hotkey
                 if self.listening_event.is_set():
                     self.listening_event.clear()
                     is_capturing = True
                     self.is_manual_trigger = True # MARK AS MANUAL
-                    audio_buffer = []
-                    silence_start = time.time() 
-                    has_speech_started = False
+                    capture, session = self._new_capture(capture, session, manual=True)
+                    endpointer.reset(speech_started=False)
                     self.kernel.set_state(SystemState.LISTENING)
                     self.logger.info("Capturando áudio (Hotkey)...")
 
-                # Check Energy (VAD -> Passive Listening)
-                if not is_capturing:
-                     chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
-                     if len(chunk_np) > 0:
-                        energy = np.sqrt(np.mean(chunk_np.astype(float)**2))
-                        if energy > ENERGY_THRESHOLD:
-                            is_capturing = True
-                            self.is_manual_trigger = False # MARK AS PASSIVE
-                            audio_buffer = []
-                            silence_start = time.time()
-                            has_speech_started = True 
-                            self.logger.debug("Voz detectada (Passive VAD).")
+                # Check VAD (Passive Listening)
+                if not is_capturing and is_speech:
+                    is_capturing = True
+                    self.is_manual_trigger = False # MARK AS PASSIVE
+                    capture, session = self._new_capture(capture, session, manual=False)
+                    endpointer.reset(speech_started=True)
+                    self.logger.debug("Voz detectada (Passive VAD).")
 
                 if is_capturing:
-                    audio_buffer.append(audio_chunk)
-                    
-                    chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
-                    if len(chunk_np) == 0: continue
-                        
-                    energy = np.sqrt(np.mean(chunk_np.astype(float)**2))
-                    
-                    if energy > ENERGY_THRESHOLD:
-                        silence_start = time.time()
-                        if not has_speech_started:
-                            has_speech_started = True
-                            self.logger.debug("Voz detectada via energia.")
+                    stored = capture.append(chunk_np)
+                    if session:
+                        session.feed(stored)
                     
-                    current_time = time.time()
-                    silence_duration = current_time - silence_start
+                    if is_speech and not endpointer.has_speech_started:
+                        self.logger.debug("Voz detectada via VAD.")
                     
                     # Check End Conditions
                     should_process = False
-                    if has_speech_started:
-                        if silence_duration > SILENCE_TIMEOUT_SPEECH:
-                            self.logger.info(f"Fim de fala detectado ({silence_duration:.1f}s silêncio).")
-                            should_process = True
-                    else:
-                        if silence_duration > SILENCE_TIMEOUT_NO_SPEECH:
-                            self.logger.info("Timeout: Nenhuma fala detectada.")
-                            should_process = True
+                    reason = endpointer.update(is_speech, chunk_seconds)
+                    if reason == Endpointer.SPEECH_END:
+                        self.logger.info(f"Fim de fala detectado ({endpointer.silence_duration:.1f}s silêncio).")
+                        should_process = True
+                    elif reason == Endpointer.NO_SPEECH:
+                        self.logger.info("Timeout: Nenhuma fala detectada.")
+                        should_process = True
                             
-                    # Max Buffer Check
-                    total_bytes = sum(len(c) for c in audio_buffer)
-                    if total_bytes > (16000 * 2 * 15): 
-                         self.logger.info("Buffer cheio (15s). processando...")
+                    # Max Buffer Check (O(1))
+                    if capture.is_full: 
+                         self.logger.info(f"Buffer cheio ({MAX_BUFFER_SECONDS:.0f}s). processando...")
                          should_process = True
 
                     if should_process:
                         is_capturing = False
-                        # Enqueue for processing
+                        # Enqueue for processing (view sem cópia; o consumidor devolve o buffer)
                         self.processing_queue.put({
-                            "audio": b''.join(audio_buffer),
-                            "manual": self.is_manual_trigger
+                            "audio": capture.view(),
+                            "manual": self.is_manual_trigger,
+                            "buffer": capture,
+                            "session": session,
+                            "captured_at": time.perf_counter()
                         })
-                        audio_buffer = []
+                        capture = None
+                        session = None
+
+            # Fonte finita (replay): processa o que ainda está na fila antes de encerrar
+            if getattr(self.audio_manager, "finite", False) and self.is_running:
+                self.processing_queue.join()
+                concurrent.futures.wait(list(self._pending))
 
         except KeyboardInterrupt:
              pass
@@ -158,6 +216,27 @@ class VoiceLoop:
              self.input_listener.stop()
              self.audio_manager.stop_stream()
              self.audio_manager.terminate()
+             if self.stt_service and hasattr(self.stt_service, "shutdown"):
+                 self.stt_service.shutdown()
+
+    def _new_capture(self, previous=None, previous_session=None, manual=False):
+        """
+        Descarta a captura em andamento (se houver) e adquire um buffer limpo do anel.
+        Com streaming habilitado, inicia também uma sessão de transcrição incremental
+        (no modo passivo com o wake gate ativo, só após o gate aprovar a captura).
+        """
+        # Sem bloquear a captura: o buffer volta ao anel quando a sessão não o usa mais
+        if previous_session is not None:
+            previous_session.cancel(on_done=lambda: self.buffer_ring.release(previous))
+        elif previous is not None:
+            self.buffer_ring.release(previous)
+        capture = self.buffer_ring.acquire()
+        if capture.slot < 0:
+            self.logger.warning("Todos os buffers de captura em uso. Alocando buffer extra.")
+        streamer = self.streamer
+        use_stream = streamer and streamer.enabled and (manual or not self.wake_gate.is_active)
+        session = streamer.begin(capture) if use_stream else None
+        return capture, session
 
     def _consumer_worker(self):
         """
@@ -173,48 +252,86 @@ class VoiceLoop:
                 
             audio_data = item["audio"]
             manual_trigger = item["manual"]
-            
-            if not audio_data:
-                continue
+            session = item.get("session")
+            self._current_captured_at = item.get("captured_at")
+            # O Kernel controla o estado: PROCESSING agora e IDLE quando esta captura
+            # e os comandos que ela disparar terminarem (inclusive se for descartada)
+            self.kernel.begin_activity(SystemState.PROCESSING)
 
-            self.kernel.set_state(SystemState.PROCESSING)
-            self.logger.info(f"Processando {len(audio_data)} bytes...")
-            
             try:
-                # Transcribe
-                text = self.stt_service.transcribe(audio_data)
+                if audio_data is None or len(audio_data) == 0:
+                    continue
+
+                # Pré-STT: recorta silêncio e descarta capturas sem voz
+                captured_seconds = len(audio_data) / self.trimmer.sample_rate
+                span = self.trimmer.trim_bounds(audio_data, getattr(self.vad, "threshold", None))
+                if span is None:
+                    if session:
+                        session.cancel()
+                    self.logger.info(f"Captura sem voz descartada ({captured_seconds:.1f}s). "
+                                     f"Total economizado: {self.trimmer.total_saved_seconds:.1f}s.")
+                    continue
+                audio_data = audio_data[span[0]:span[1]]
+                saved_seconds = captured_seconds - len(audio_data) / self.trimmer.sample_rate
+                if saved_seconds > 0:
+                    self.logger.debug(f"Silêncio recortado: {saved_seconds:.2f}s. "
+                                      f"Total economizado: {self.trimmer.total_saved_seconds:.1f}s.")
+
+                # Modo passivo: keyword spotting barato antes do Whisper
+                if not manual_trigger:
+                    passed, score = self.wake_gate.check(audio_data)
+                    if not passed:
+                        self.logger.info(f"Ignorado sem STT (wake word ausente, score={score:.2f}). "
+                                         f"Rejeitados: {self.wake_gate.rejected}/{self.wake_gate.checked}.")
+                        continue
+
+                self.logger.info(f"Processando {audio_data.nbytes} bytes...")
                 
-                if text:
-                    self.process_text_command(text, manual_trigger)
+                try:
+                    # Primeira frase aguarda apenas o que ainda estiver carregando
+                    stt_service = self.kernel.wait_for_service("stt")
+                    if not stt_service:
+                        raise RuntimeError("Serviço STT indisponível.")
+
+                    # Transcribe (streaming: só resta o último trecho não confirmado)
+                    if session:
+                        text = session.finalize(span[0], span[1])
+                    else:
+                        text = stt_service.transcribe(audio_data)
+                    
+                    if text:
+                        is_wake = self.process_text_command(text, manual_trigger)
+                        # Só capturas da hotkey viram template (aceites do gate podem ser falsos)
+                        if (manual_trigger and is_wake and self.wake_gate.auto_enroll
+                                and self._starts_with_wake_word(text)):
+                            self.wake_gate.enroll(audio_data)
+                    else:
+                        self.logger.warning("Transcrição vazia.")
+                except Exception as e:
+                    self.logger.error(f"Erro no processamento de áudio: {e}")
+            finally:
+                buffer = item.get("buffer")
+                if session:
+                    session.cancel(on_done=lambda: self.buffer_ring.release(buffer))
                 else:
-                    self.logger.warning("Transcrição vazia.")
-            except Exception as e:
-                self.logger.error(f"Erro no processamento de áudio: {e}")
-            
-            self.kernel.set_state(SystemState.IDLE)
-            self.processing_queue.task_done()
+                    self.buffer_ring.release(buffer)
+                self.kernel.end_activity()
+                self.processing_queue.task_done()
 
-    def process_text_command(self, text: str, manual_trigger: bool):
+    def _starts_with_wake_word(self, text: str) -> bool:
+        raw_wake_word = self.config.get("app", {}).get("wake_word", "jarvis")
+        return _to_id(text).startswith(_to_id(raw_wake_word))
+
+    def process_text_command(self, text: str, manual_trigger: bool) -> bool:
         """
         Logic to handle transcribed text: Wake Word Check -> Dispatch.
+        Returns True if the wake word was detected.
         """
         # Wake Word Logic
         raw_wake_word = self.config.get("app", {}).get("wake_word", "jarvis")
-        
-        # Helper to aggressive normalize
-        import unicodedata
-        import string
 
-        def to_id(s):
-            if not s: return ""
-            if isinstance(s, bytes): s = s.decode('utf-8', errors='ignore')
-            s = unicodedata.normalize('NFD', s).encode('ascii', 'ignore').decode('utf-8')
-            s = s.lower()
-            s = s.translate(str.maketrans('', '', string.punctuation + " \t\n\r"))
-            return s
-
-        wake_id = to_id(raw_wake_word)
-        text_id = to_id(text)
+        wake_id = _to_id(raw_wake_word)
+        text_id = _to_id(text)
 
         self.logger.debug(f"Wake check: '{wake_id}' inside '{text_id}'? (Raw: {text})")
 
@@ -236,10 +353,39 @@ class VoiceLoop:
             # Let's keep passing full text for now as it works well with AI
             
             self.logger.info(f"Comando Processado: {command_text}")
-            self.kernel.dispatch(command_text)
+            self._dispatch(command_text)
         else:
                 if manual_trigger:
                     self.logger.info(f"Comando Manual: {text}")
-                    self.kernel.dispatch(text)
+                    self._dispatch(text)
                 else:
                     self.logger.info(f"Ignorado (sem wake word): {text}")
+
+        return is_wake
+
+    def _dispatch(self, text: str):
+        """
+        Despacha o comando para o Kernel sem bloquear o consumidor (a próxima
+        frase não espera um comando lento) e registra a latência captura -> dispatch.
+        """
+        captured_at = getattr(self, "_current_captured_at", None)
+        dispatch_at = time.perf_counter()
+        future = self.kernel.submit(text)
+        self._pending.add(future)
+
+        def _done(f):
+            self._pending.discard(f)
+            if captured_at is None:
+                return
+            latency = {
+                "text": text,
+                "capture_to_dispatch": dispatch_at - captured_at,
+                "capture_to_done": time.perf_counter() - captured_at,
+                "cancelled": f.cancelled(),
+            }
+            self.latencies.append(latency)
+            self.logger.info(f"Latência captura->dispatch: {latency['capture_to_dispatch'] * 1000:.0f}ms "
+                             f"(até concluir: {latency['capture_to_done'] * 1000:.0f}ms)")
+
+        future.add_done_callback(_done)
+        return future
@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import glob
+import numpy as np
+from typing import List, Optional, Tuple
+from core.logger import setup_logger
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+
+class MfccExtractor:
+    """
+    MFCC vetorizado em NumPy (sem dependências extras).
+    Matrizes de banco de filtros mel e DCT são pré-calculadas uma vez.
+    """
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 25, hop_ms: int = 10,
+                 n_fft: int = 512, n_mels: int = 26, n_mfcc: int = 13):
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.n_fft = n_fft
+        self.window = np.hamming(self.frame).astype(np.float32)
+
+        # Banco de filtros triangulares mel
+        mel_points = np.linspace(_hz_to_mel(0), _hz_to_mel(sample_rate / 2), n_mels + 2)
+        bins = np.floor((n_fft + 1) * _mel_to_hz(mel_points) / sample_rate).astype(int)
+        fb = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                fb[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                fb[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        self.filterbank = fb
+
+        # DCT-II ortonormal
+        k = np.arange(n_mfcc)[:, None]
+        n = np.arange(n_mels)[None, :]
+        dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+        dct[0] /= np.sqrt(2.0)
+        self.dct = dct.astype(np.float32)
+
+    def __call__(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Retorna matriz (quadros, n_mfcc) para áudio int16.
+        """
+        x = samples.astype(np.float32) / 32768.0
+        if len(x) < self.frame:
+            x = np.pad(x, (0, self.frame - len(x)))
+        x = np.append(x[0], x[1:] - 0.97 * x[:-1])  # Pré-ênfase
+
+        frames = np.lib.stride_tricks.sliding_window_view(x, self.frame)[::self.hop]
+        power = np.abs(np.fft.rfft(frames * self.window, self.n_fft)) ** 2
+        mel = np.log(power @ self.filterbank.T + 1e-10)
+        return mel @ self.dct.T
+
+
+def normalize_features(features: np.ndarray) -> np.ndarray:
+    """
+    Descarta c0 (volume) e aplica normalização de média/variância por frase.
+    """
+    f = features[:, 1:]
+    return (f - f.mean(axis=0)) / (f.std(axis=0) + 1e-8)
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> float:
+    """
+    Custo médio por quadro do melhor alinhamento do template em qualquer
+    trecho da consulta (DTW de subsequência, início e fim livres na consulta).
+    Os passos dependem apenas da linha anterior, então cada linha é vetorizada.
+    """
+    # Distância euclidiana quadro a quadro (m, n) via produto escalar
+    t2 = (template ** 2).sum(axis=1)[:, None]
+    q2 = (query ** 2).sum(axis=1)[None, :]
+    cost = np.sqrt(np.maximum(t2 + q2 - 2.0 * template @ query.T, 0.0))
+
+    inf = np.float32(np.inf)
+    acc = cost[0].copy()
+    diag = np.empty_like(acc)
+    skip = np.empty_like(acc)
+    for i in range(1, len(template)):
+        diag[0] = inf
+        diag[1:] = acc[:-1]
+        skip[:2] = inf
+        skip[2:] = acc[:-2]
+        acc = cost[i] + np.minimum(np.minimum(acc, diag), skip)
+    return float(acc.min()) / len(template)
+
+
+class WakeWordGate:
+    """
+    Detector leve da wake word (template matching sobre MFCC com DTW).
+    No modo passivo, roda antes do STT e só encaminha ao Whisper capturas em que
+    a wake word provavelmente está presente.
+
+    Os templates são aprendidos automaticamente, só de frases ativadas pela
+    hotkey cuja transcrição começa com a wake word (capturas que apenas passaram
+    pelo gate não viram template). Enquanto não houver `min_templates`, o gate
+    deixa tudo passar. O limiar "auto" é calibrado uma vez, ao atingir
+    `min_templates`, e depois fica fixo (não deriva com novos templates):
+    é salvo em `threshold.json` junto dos templates e recarregado ao iniciar.
+    Configurado via `wake_word_gate`.
+    """
+    def __init__(self, config=None, sample_rate: int = 16000):
+        self.config = config or {}
+        self.logger = setup_logger("Jarvis.WakeWord", config)
+        gate_cfg = self.config.get("wake_word_gate", {})
+        self.enabled = gate_cfg.get("enabled", True)
+        self.threshold = gate_cfg.get("threshold", "auto")
+        self.auto_margin = gate_cfg.get("auto_margin", 1.5)
+        self.search_seconds = gate_cfg.get("search_seconds", 3.0)
+        self.template_seconds = gate_cfg.get("template_seconds", 1.2)
+        self.min_templates = gate_cfg.get("min_templates", 3)
+        self.max_templates = gate_cfg.get("max_templates", 8)
+        self.auto_enroll = gate_cfg.get("auto_enroll", True)
+        self.templates_dir = gate_cfg.get("templates_dir", "data/wake_templates")
+        self.sample_rate = sample_rate
+
+        self.extractor = MfccExtractor(sample_rate)
+        self.templates: List[np.ndarray] = []
+        self._threshold_value: Optional[float] = None
+        self._calibrated = False
+
+        # Estatísticas
+        self.checked = 0
+        self.rejected = 0
+
+        if self.enabled:
+            self._load_templates()
+
+    @property
+    def is_active(self) -> bool:
+        return self.enabled and len(self.templates) >= self.min_templates and self._threshold_value is not None
+
+    @property
+    def _threshold_path(self) -> str:
+        return os.path.join(self.templates_dir, "threshold.json")
+
+    def _load_templates(self):
+        for path in sorted(glob.glob(os.path.join(self.templates_dir, "*.npy")))[-self.max_templates:]:
+            try:
+                self.templates.append(np.load(path))
+            except Exception as e:
+                self.logger.warning(f"Template inválido {path}: {e}")
+        if self.templates:
+            self._load_threshold()
+        self._update_threshold()
+        if self.templates:
+            self.logger.info(f"{len(self.templates)} template(s) de wake word carregados.")
+
+    def _update_threshold(self):
+        if self.threshold != "auto":
+            self._threshold_value = float(self.threshold)
+            return
+        if self._calibrated:
+            return
+        if len(self.templates) < 2:
+            self._threshold_value = None
+            return
+        # Limiar a partir da dispersão entre os primeiros templates; congelado
+        # ao atingir min_templates
+        calibration = self.templates[:max(2, self.min_templates)]
+        scores = [subsequence_dtw(a, b) for i, a in enumerate(calibration)
+                  for j, b in enumerate(calibration) if i != j]
+        self._threshold_value = max(scores) * self.auto_margin
+        if len(self.templates) >= self.min_templates:
+            self._calibrated = True
+            self._save_threshold(max(scores))
+            self.logger.info(f"Limiar da wake word calibrado: {self._threshold_value:.2f}.")
+
+    def _load_threshold(self):
+        """
+        Limiar "auto" calibrado numa sessão anterior (a margem vem do config atual).
+        """
+        if self.threshold != "auto" or not os.path.exists(self._threshold_path):
+            return
+        try:
+            with open(self._threshold_path, "r", encoding="utf-8") as f:
+                spread = float(json.load(f)["spread"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Limiar salvo da wake word ignorado ({self._threshold_path}): {e}")
+            return
+        self._threshold_value = spread * self.auto_margin
+        self._calibrated = True
+        self.logger.info(f"Limiar da wake word carregado: {self._threshold_value:.2f}.")
+
+    def _save_threshold(self, spread: float):
+        try:
+            os.makedirs(self.templates_dir, exist_ok=True)
+            with open(self._threshold_path, "w", encoding="utf-8") as f:
+                json.dump({"spread": spread, "auto_margin": self.auto_margin,
+                           "threshold": self._threshold_value, "calibrated_at": time.time()}, f)
+        except OSError as e:
+            self.logger.warning(f"Falha ao salvar o limiar da wake word: {e}")
+
+    def score(self, samples: np.ndarray) -> float:
+        """
+        Menor custo DTW entre os templates e o início da captura (menor = mais provável).
+        """
+        head = samples[:int(self.search_seconds * self.sample_rate)]
+        query = normalize_features(self.extractor(head))
+        return min(subsequence_dtw(t, query) for t in self.templates)
+
+    def check(self, samples: np.ndarray) -> Tuple[bool, float]:
+        """
+        Retorna (passou, score). Sem templates suficientes, sempre passa.
+        """
+        if not self.is_active:
+            return True, 0.0
+
+        start_time = time.perf_counter()
+        score = self.score(samples)
+        passed = score <= self._threshold_value
+        self.checked += 1
+        if not passed:
+            self.rejected += 1
+        self.logger.debug(f"Wake gate: score={score:.2f} limiar={self._threshold_value:.2f} "
+                          f"({(time.perf_counter() - start_time) * 1000:.1f}ms)")
+        return passed, score
+
+    def enroll(self, samples: np.ndarray):
+        """
+        Registra o início da frase (onde está a wake word) como novo template.
+        Chamar apenas para capturas confirmadas (hotkey), nunca para as que só
+        passaram pelo gate.
+        """
+        if not self.enabled:
+            return
+        head = samples[:int(self.template_seconds * self.sample_rate)]
+        template = normalize_features(self.extractor(head)).astype(np.float32)
+
+        try:
+            os.makedirs(self.templates_dir, exist_ok=True)
+            np.save(os.path.join(self.templates_dir, f"{time.time_ns()}.npy"), template)
+            existing = sorted(glob.glob(os.path.join(self.templates_dir, "*.npy")))
+            for old in existing[:-self.max_templates]:
+                os.remove(old)
+        except Exception as e:
+            self.logger.warning(f"Falha ao salvar template de wake word: {e}")
+
+        self.templates = (self.templates + [template])[-self.max_templates:]
+        self._update_threshold()
+        self.logger.info(f"Template de wake word registrado ({len(self.templates)}/{self.max_templates}).")
@@ -14,13 +14,44 @@ def load_config(path="config/config.yaml"):
     with open(path, 'r') as f:
         return yaml.safe_load(f)
 
+def run_headless(kernel):
+    """
+    Runs the voice loop on the main thread without UI until the audio source ends.
+    Prints capture-to-dispatch latency stats (useful with --replay).
+    """
+    from core.voice_loop import VoiceLoop
+
+    voice_loop = VoiceLoop(kernel)
+    voice_loop.start()
+
+    latencies = sorted(l["capture_to_dispatch"] for l in voice_loop.latencies)
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"Comandos: {len(latencies)} | captura->dispatch p50={p50 * 1000:.0f}ms p95={p95 * 1000:.0f}ms")
+    print(f"Tempos de carga: {kernel.get_load_timings()}")
+    if kernel.get_ai_cache_stats():
+        print(f"Cache de IA: {kernel.get_ai_cache_stats()}")
+    if hasattr(voice_loop.audio_manager, "stats"):
+        print(f"Captura: {voice_loop.audio_manager.stats()}")
+
 def main():
     parser = argparse.ArgumentParser(description="Jarvis - Local Voice Assistant")
     parser.add_argument("--text", type=str, help="Run a text command directly and exit")
+    parser.add_argument("--replay", type=str, help="Use a WAV file (or directory of WAVs) as audio input")
+    parser.add_argument("--fast", action="store_true", help="Replay audio as fast as possible instead of real time")
+    parser.add_argument("--headless", action="store_true", help="Run the voice loop without overlay/tray (implied by --replay)")
     args = parser.parse_args()
 
     # 1. Load Config
     config = load_config()
+    if args.replay:
+        audio_config = config.setdefault("audio", {})
+        audio_config["source"] = "wav"
+        replay_config = audio_config.setdefault("replay", {})
+        replay_config["path"] = args.replay
+        if args.fast:
+            replay_config["realtime"] = False
 
     # 2. Initialize Kernel
     kernel = Kernel(config)
@@ -39,14 +70,18 @@ def main():
         # Modo de Voz e UI
         print("--- Iniciando Jarvis (Modo Voz + UI) ---")
         
-        # Verificar se a pasta do modelo existe
-        if not os.path.exists("model"):
+        # Verificar se a pasta do modelo existe (apenas para o STT Vosk)
+        stt_config = config.get("stt", {})
+        if stt_config.get("provider") == "vosk" and not os.path.exists(stt_config.get("model_path", "model")):
             print("❌ ERRO CRÍTICO: Modelo Vosk não encontrado.")
             # ... (mensagem de erro mantida)
             sys.exit(1)
 
+        if args.headless or args.replay:
+            run_headless(kernel)
+            return
+
         try:
-            from core.voice_loop import VoiceLoop
             from core.voice_loop import VoiceLoop
             from ui.tray import SystemTray
             from ui.overlay import OverlayUI
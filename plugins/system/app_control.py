@@ -9,18 +9,20 @@ class OpenAppPlugin(PluginBase):
         return "OpenApp"
 
     def patterns(self) -> List[str]:
-        return ["open", "launch", "start"]
+        return [
+            "(open|launch|start) [the] {app}",
+            "(abre|abra|abrir|inicia|inicie|iniciar) [o|a] {app}",
+        ]
 
     def execute(self, ctx: CommandContext) -> CommandResult:
-        # Expected format: "open <app_name>"
-        # In a real NLP system, we'd extract the entity.
-        # Here we do simple string slicing.
-        
-        target = ""
-        for pattern in self.patterns():
-            if ctx.raw_text.startswith(pattern):
-                target = ctx.raw_text[len(pattern):].strip()
-                break
+        # Slot {app} preenchido pelo padrão (ou parâmetro vindo da IA)
+        target = ctx.params.get("app") or ctx.params.get("app_name") or ""
+        if not target:
+            # Fallback: "open <app_name>" no texto cru (comandos roteados pela IA)
+            for verb in ("open", "launch", "start", "abre", "abra", "abrir", "inicia", "inicie", "iniciar"):
+                if ctx.raw_text.lower().startswith(verb + " "):
+                    target = ctx.raw_text[len(verb):].strip()
+                    break
         
         if not target:
             return CommandResult(False, "Could not identify application name.")
@@ -28,6 +30,8 @@ class OpenAppPlugin(PluginBase):
         # Mapping common names to executables (Mock DB)
         app_map = {
             "notepad": "notepad.exe",
+            "bloco de notas": "notepad.exe",
+            "calculadora": "calc.exe",
             "calc": "calc.exe",
             "calculator": "calc.exe",
             "explorer": "explorer.exe",
@@ -35,11 +39,16 @@ class OpenAppPlugin(PluginBase):
         }
         
         executable = app_map.get(target.lower(), target)
-        
+
+        # SECURITY CHECK (executável vai para o shell)
+        security = ctx.kernel.get_service("security")
+        if not security:
+            return CommandResult(False, "Security service unavailable.")
+
+        if not security.can_launch_app(target, executable):
+            return CommandResult(False, f"Application '{target}' is BLOCKED by security policy.")
+
         try:
-            # Security: In a real Scenario, we should verify specific paths.
-            # For MVP system built-ins, we use subprocess.Popen
-            
             subprocess.Popen(executable, shell=True) # shell=True needed for some system commands
             return CommandResult(True, f"Opened {executable}")
             
@@ -8,8 +8,8 @@ class FileOpsPlugin(PluginBase):
 
     def patterns(self) -> List[str]:
         return [
-            "criar arquivo", "create file", 
-            "escrever em", "write to"
+            "(criar|crie|cria) [o|um] arquivo {path:path}", "create [a|the] file {path:path}",
+            "(escrever|escreva|escreve) (em|no|na) {path:path}: {content}", "write to {path:path}: {content}",
         ]
 
     def execute(self, ctx: CommandContext) -> CommandResult:
@@ -18,10 +18,13 @@ class FileOpsPlugin(PluginBase):
         # "escrever em <caminho>: <texto>"
         
         text = ctx.raw_text
-        command = ""
         
-        # Identificar qual comando foi acionado
-        if "criar arquivo" in text or "create file" in text:
+        # Identificar qual comando foi acionado (slots do padrão ou intenção da IA)
+        if "content" in ctx.params or ctx.command_name == "write_text":
+            return self._write_to_file(ctx)
+        elif "path" in ctx.params or ctx.command_name == "create_file":
+            return self._create_file(ctx)
+        elif "criar arquivo" in text or "create file" in text:
             return self._create_file(ctx)
         elif "escrever em" in text or "write to" in text:
             return self._write_to_file(ctx)
@@ -29,13 +32,14 @@ class FileOpsPlugin(PluginBase):
         return CommandResult(False, "Comando de arquivo não reconhecido.")
 
     def _create_file(self, ctx: CommandContext) -> CommandResult:
-        # Extrair caminho (lógica ingênua de string para MVP)
-        # Ex: "criar arquivo dados.txt"
-        parts = ctx.raw_text.split(" ", 2)
-        if len(parts) < 3:
-            return CommandResult(False, "Caminho do arquivo não especificado.")
-            
-        filepath = parts[-1].strip()
+        # Ex: "criar arquivo dados.txt" -> slot {path}
+        filepath = ctx.params.get("path")
+        if not filepath:
+            # Fallback: lógica ingênua de string
+            parts = ctx.raw_text.split(" ", 2)
+            if len(parts) < 3:
+                return CommandResult(False, "Caminho do arquivo não especificado.")
+            filepath = parts[-1].strip()
         
         # VERIFICAÇÃO DE SEGURANÇA
         security = ctx.kernel.get_service("security")
@@ -56,18 +60,18 @@ class FileOpsPlugin(PluginBase):
             return CommandResult(False, f"Erro ao criar arquivo: {str(e)}")
 
     def _write_to_file(self, ctx: CommandContext) -> CommandResult:
-        # Ex: "escrever em notas.txt: Olá Mundo"
-        if ":" not in ctx.raw_text:
-            return CommandResult(False, "Formato inválido. Use: 'escrever em <arquivo>: <texto>'")
-            
-        # Separar caminho e conteúdo
-        pre_content, content = ctx.raw_text.split(":", 1)
-        
-        # Tentar extrair o nome do arquivo da primeira parte
-        # Isso é frágil e deve ser melhorado com NLP/Regex depois
-        parts = pre_content.split(" ")
-        filepath = parts[-1].strip()
-        content = content.strip()
+        # Ex: "escrever em notas.txt: Olá Mundo" -> slots {path} e {content}
+        filepath = ctx.params.get("path", "")
+        content = ctx.params.get("content", "")
+        if not (filepath and content):
+            if ":" not in ctx.raw_text:
+                return CommandResult(False, "Formato inválido. Use: 'escrever em <arquivo>: <texto>'")
+                
+            # Fallback: separar caminho e conteúdo pelo ':'
+            pre_content, content = ctx.raw_text.split(":", 1)
+            parts = pre_content.split(" ")
+            filepath = parts[-1].strip()
+            content = content.strip()
         
         if not filepath or not content:
             return CommandResult(False, "Arquivo ou conteúdo faltando.")
@@ -7,15 +7,20 @@ class RunShellPlugin(PluginBase):
         return "RunShell"
 
     def patterns(self) -> List[str]:
-        return ["run", "execute"]
+        return [
+            "(run|execute) {command:raw}",
+            "(executa|executar|rode|roda|rodar) [o|a] [comando] {command:raw}",
+        ]
 
     def execute(self, ctx: CommandContext) -> CommandResult:
-        # Format: "run <cmd>"
-        target = ""
-        for pattern in self.patterns():
-            if ctx.raw_text.startswith(pattern):
-                target = ctx.raw_text[len(pattern):].strip()
-                break
+        # Slot {command} preenchido pelo padrão (ou parâmetro vindo da IA)
+        target = ctx.params.get("command") or ""
+        if not target:
+            # Fallback: "run <cmd>" no texto cru (comandos roteados pela IA)
+            for verb in ("run", "execute", "executa", "executar", "rode", "roda", "rodar"):
+                if ctx.raw_text.lower().startswith(verb + " "):
+                    target = ctx.raw_text[len(verb):].strip()
+                    break
 
         if not target:
             return CommandResult(False, "No command provided.")
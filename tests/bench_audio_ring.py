@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import queue
+import threading
+import time
+import numpy as np
+from core.audio_buffer import PcmRing
+
+# Simula o callback do sounddevice (produtor) contra um consumidor que trava
+# periodicamente (ex.: GIL ocupado pelo Whisper). Compara a fila ilimitada antiga
+# com o PcmRing: memória retida, latência acumulada e contadores de descarte.
+SAMPLE_RATE = 16000
+BLOCKSIZE = 4096
+SPEEDUP = 8.0          # Produz 8x mais rápido que tempo real
+BLOCKS = 400
+STALL_EVERY = 50       # A cada N blocos o consumidor trava...
+STALL_SECONDS = 0.5    # ...por este tempo
+
+block = np.random.default_rng(0).integers(-3000, 3000, BLOCKSIZE, dtype=np.int16)
+period = BLOCKSIZE / SAMPLE_RATE / SPEEDUP
+
+
+def produce(write):
+    next_t = time.perf_counter()
+    for _ in range(BLOCKS):
+        next_t += period
+        write(block)
+        delay = next_t - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def consume(read, done):
+    n = 0
+    while not done.is_set() or n == 0:
+        data = read()
+        if data is None:
+            continue
+        np.frombuffer(data, dtype=np.int16)
+        n += 1
+        if n % STALL_EVERY == 0:
+            time.sleep(STALL_SECONDS)
+
+
+def per_block_cost(write, read, rounds=2000):
+    """
+    Custo de escrita + leitura de um bloco sem contenção.
+    """
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        write(block)
+        np.frombuffer(read(), dtype=np.int16)
+    return (time.perf_counter() - t0) / rounds
+
+
+def run_queue():
+    q = queue.Queue()
+    done = threading.Event()
+    peak = [0]
+
+    def write(b):
+        q.put(bytes(b))
+        peak[0] = max(peak[0], q.qsize())
+
+    def read():
+        try:
+            return q.get(timeout=0.2)
+        except queue.Empty:
+            return None
+
+    producer = threading.Thread(target=lambda: (produce(write), done.set()))
+    producer.start()
+    consume(read, done)
+    producer.join()
+    # Latência de áudio (tempo real) retida no pior momento
+    peak_latency = peak[0] * BLOCKSIZE / SAMPLE_RATE
+    cost = per_block_cost(write, read)
+    return cost, peak[0] * BLOCKSIZE * 2, peak_latency, {}
+
+
+def run_ring():
+    ring = PcmRing(16 * BLOCKSIZE, max_latency_frames=SAMPLE_RATE)  # 4s de anel, 1s de latência
+    done = threading.Event()
+    producer = threading.Thread(target=lambda: (produce(ring.write), done.set()))
+    producer.start()
+    read = lambda: ring.read(BLOCKSIZE, timeout=0.2)
+    consume(read, done)
+    producer.join()
+    stats = ring.stats()
+    cost = per_block_cost(ring.write, read)
+    return cost, ring.capacity * 2, ring.max_latency_frames / SAMPLE_RATE, stats
+
+
+if __name__ == "__main__":
+    print(f"--- {BLOCKS} blocos a {SPEEDUP:.0f}x, consumidor trava {STALL_SECONDS}s a cada {STALL_EVERY} ---")
+    for name, fn in (("queue", run_queue), ("ring", run_ring)):
+        cost, mem, latency, stats = fn()
+        print(f"{name:6s} escrita+leitura {cost * 1e6:5.1f}us/bloco | memória pico {mem / 1024:7.0f}KB "
+              f"| latência máx {latency:.2f}s {stats}")
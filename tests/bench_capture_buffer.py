@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import numpy as np
+from core.audio_buffer import UtteranceRing, chunk_rms
+
+# Micro-benchmark do custo por chunk na thread de captura (VoiceLoop.start).
+# Simula uma frase de 15s em chunks de 4096 frames int16 @ 16kHz.
+SAMPLE_RATE = 16000
+BLOCKSIZE = 4096
+SECONDS = 15.0
+ROUNDS = 20
+
+rng = np.random.default_rng(0)
+n_chunks = int(SAMPLE_RATE * SECONDS) // BLOCKSIZE
+chunks = [rng.integers(-3000, 3000, BLOCKSIZE, dtype=np.int16).tobytes() for _ in range(n_chunks)]
+
+
+def legacy_capture():
+    """
+    Caminho antigo: lista de bytes, duas conversões float64 e soma O(n) por chunk.
+    """
+    costs = []
+    audio_buffer = []
+    for audio_chunk in chunks:
+        t0 = time.perf_counter()
+        chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
+        energy = np.sqrt(np.mean(chunk_np.astype(float)**2))
+        audio_buffer.append(audio_chunk)
+        chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
+        energy = np.sqrt(np.mean(chunk_np.astype(float)**2))
+        total_bytes = sum(len(c) for c in audio_buffer)
+        full = total_bytes > (SAMPLE_RATE * 2 * 15)
+        costs.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    payload = b''.join(audio_buffer)
+    handoff = time.perf_counter() - t0
+    return costs, handoff
+
+
+ring = UtteranceRing(int(SAMPLE_RATE * SECONDS))
+scratch = np.empty(BLOCKSIZE, dtype=np.float32)
+
+
+def ring_capture():
+    """
+    Caminho novo: buffer pré-alocado, energia única por chunk, comprimento O(1).
+    """
+    costs = []
+    capture = ring.acquire()
+    for audio_chunk in chunks:
+        t0 = time.perf_counter()
+        chunk_np = np.frombuffer(audio_chunk, dtype=np.int16)
+        energy = chunk_rms(chunk_np, scratch)
+        capture.append(chunk_np)
+        full = capture.is_full
+        costs.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    payload = capture.view()
+    handoff = time.perf_counter() - t0
+    ring.release(capture)
+    return costs, handoff
+
+
+def report(name, fn):
+    all_costs = []
+    handoffs = []
+    for _ in range(ROUNDS):
+        costs, handoff = fn()
+        all_costs.extend(costs)
+        handoffs.append(handoff)
+    us = np.array(all_costs) * 1e6
+    print(f"{name:8s} mean={us.mean():7.1f}us p99={np.percentile(us, 99):7.1f}us "
+          f"max={us.max():7.1f}us handoff={np.mean(handoffs) * 1e6:7.1f}us")
+
+
+budget_us = BLOCKSIZE / SAMPLE_RATE * 1e6
+print(f"--- Custo por chunk ({n_chunks} chunks/frase, orçamento {budget_us:.0f}us/chunk) ---")
+report("legacy", legacy_capture)
+report("ring", ring_capture)
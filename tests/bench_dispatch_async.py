@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import concurrent.futures
+import time
+from typing import List
+from core.interfaces import PluginBase, CommandContext, CommandResult
+from core.kernel import Kernel
+from tests.mock_gemini_server import MockGeminiServer
+
+# Vazão do Kernel.dispatch com o fallback de IA no caminho, contra o servidor
+# mock local (tests/mock_gemini_server.py): despachos sequenciais (dispatch
+# síncrono, como antes) vs concorrentes (submit -> dispatch_async), e o tempo
+# para cancelar um comando lento (novo acionamento da hotkey).
+# Metade dos comandos cai na IA (perguntas) e metade num plugin lento local.
+# Uso: python tests/bench_dispatch_async.py [--commands 40] [--latency 0.3] [--plugin-seconds 0.2]
+
+
+class SlowTaskPlugin(PluginBase):
+    """
+    Plugin de teste que bloqueia como um comando real demorado.
+    """
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def name(self) -> str:
+        return "SlowTask"
+
+    def patterns(self) -> List[str]:
+        return ["tarefa lenta {n:int}"]
+
+    def execute(self, ctx: CommandContext) -> CommandResult:
+        time.sleep(self.seconds)
+        return CommandResult(True, f"Tarefa {ctx.params.get('n')} concluída")
+
+
+class SilentTTS:
+    def __init__(self):
+        self.spoken = 0
+
+    def speak(self, text):
+        self.spoken += 1
+
+    def stop(self):
+        pass
+
+    def is_busy(self):
+        return False
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def report(name, total, latencies, results):
+    ok = sum(1 for r in results if r.success)
+    print(f"{name:<12} {total:>7.2f}s {len(results) / total:>8.1f}/s "
+          f"p50={percentile(latencies, 0.5) * 1000:>5.0f}ms p95={percentile(latencies, 0.95) * 1000:>5.0f}ms  ok={ok}/{len(results)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.3, help="Latência do mock até o primeiro byte (s)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--plugin-seconds", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with MockGeminiServer(latency=args.latency, jitter=args.jitter, seed=0) as server:
+        config = {
+            "logging": {"level": "WARNING", "console": False},
+            "dispatch": {"workers": args.workers},
+            "intent_classifier": {"learn": False},
+            "ai": {"base_url": server.url, "timeout": 10, "cache": {"enabled": False},
+                   "streaming": {"enabled": False}},
+        }
+        kernel = Kernel(config)
+        for name in ("plugins", "ai", "tts"):
+            kernel.wait_for_service(name)
+        if not kernel.get_service("ai"):
+            print("Resolvedor de IA não carregou (google-genai instalado?).")
+            return
+        tts = SilentTTS()
+        kernel.register_service("tts", tts)
+        kernel.register_plugin(SlowTaskPlugin(args.plugin_seconds))
+
+        commands = [f"quanto é {i} mais {i}?" if i % 2 == 0 else f"tarefa lenta {i}"
+                    for i in range(args.commands)]
+        print(f"{args.commands} comandos (metade IA a ~{args.latency * 1000:.0f}ms, metade plugin de "
+              f"{args.plugin_seconds * 1000:.0f}ms), {args.workers} workers\n")
+
+        # Sequencial: dispatch síncrono, um atrás do outro
+        latencies, results = [], []
+        start = time.perf_counter()
+        for text in commands:
+            t0 = time.perf_counter()
+            results.append(kernel.dispatch(text))
+            latencies.append(time.perf_counter() - t0)
+        report("sequencial", time.perf_counter() - start, latencies, results)
+
+        # Concorrente: todos submetidos de uma vez ao loop do Kernel
+        start = time.perf_counter()
+        finished_at = {}
+        futures = []
+        for text in commands:
+            future = kernel.submit(text)
+            future.add_done_callback(lambda f: finished_at.__setitem__(f, time.perf_counter()))
+            futures.append(future)
+        concurrent.futures.wait(futures)
+        total = time.perf_counter() - start
+        report("concorrente", total, [finished_at[f] - start for f in futures], [f.result() for f in futures])
+
+        # Cancelamento: comando lento (regra "devagar" do mock) abandonado no meio
+        future = kernel.submit("responda devagar por favor")
+        time.sleep(0.2)
+        t0 = time.perf_counter()
+        cancelled = kernel.cancel_dispatches()
+        concurrent.futures.wait([future])
+        print(f"\ncancelamento: {cancelled} em andamento, liberado em {(time.perf_counter() - t0) * 1000:.1f}ms "
+              f"(cancelled={future.cancelled()}, estado={kernel.state.value})")
+        print(f"mock: {server.stats()['requests']} pedidos, pico de {server.stats()['max_in_flight']} simultâneos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from core.event_bus import EventBus
+
+# Custo de Kernel.emit para quem emite (ex.: set_state na thread consumidora):
+# handlers síncronos (comportamento antigo) vs entrega assíncrona com filas
+# por assinante, em função do número de assinantes e com um assinante lento.
+# Mostra também a coalescência de state_changed e as métricas por handler.
+# Uso: python tests/bench_event_bus.py [--emits 20000] [--slow-ms 20]
+
+QUIET = {"logging": {"level": "WARNING", "console": False}}
+
+
+def emit_cost_us(bus, emits, event="state_changed"):
+    start = time.perf_counter()
+    for i in range(emits):
+        bus.emit(event, {"old": "IDLE", "new": i})
+    return (time.perf_counter() - start) / emits * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emits", type=int, default=20000)
+    parser.add_argument("--slow-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    noop = lambda payload: None
+    print(f"{'assinantes':>10} {'sync (us/emit)':>15} {'async (us/emit)':>16}")
+    for count in (0, 1, 10, 100):
+        sync_bus, async_bus = EventBus(QUIET), EventBus(QUIET)
+        for i in range(count):
+            sync_bus.subscribe("state_changed", noop)
+            async_bus.subscribe("state_changed", noop, async_delivery=True, coalesce=True, name=f"noop{i}")
+        print(f"{count:>10} {emit_cost_us(sync_bus, args.emits):>15.2f} {emit_cost_us(async_bus, args.emits):>16.2f}")
+
+    # Assinante lento (ex.: UI travada): quanto o emissor espera
+    slow = lambda payload: time.sleep(args.slow_ms / 1000)
+    emits = 50
+    sync_bus = EventBus(QUIET)
+    sync_bus.subscribe("state_changed", slow)
+    async_bus = EventBus(QUIET)
+    sub = async_bus.subscribe("state_changed", slow, async_delivery=True, coalesce=True, name="slow_ui")
+    print(f"\nhandler lento de {args.slow_ms:.0f}ms, {emits} emits: "
+          f"sync {emit_cost_us(sync_bus, emits):.0f}us/emit | async {emit_cost_us(async_bus, emits):.1f}us/emit")
+
+    # Coalescência: só o último estado pendente é entregue
+    received = []
+    bus = EventBus(QUIET)
+    bus.subscribe("state_changed", lambda p: (received.append(p["new"]), time.sleep(0.005)),
+                  async_delivery=True, coalesce=True, name="ui")
+    bounded = bus.subscribe("partial_*", lambda p: time.sleep(0.005), async_delivery=True, max_queue=8, name="bounded")
+    for i in range(1000):
+        bus.emit("state_changed", {"new": i})
+        bus.emit("partial_transcript", {"text": str(i)})
+    time.sleep(0.2)
+    print(f"coalescência: 1000 emits -> {len(received)} entregas, último={received[-1]}")
+    bus.unsubscribe(bounded)
+    for stats in bus.stats() + [bounded.stats(), sub.stats()]:
+        print(f"  {stats['handler']:<8} {stats['mode']:<15} entregues={stats['delivered']:<4} "
+              f"coalescidos={stats['coalesced']:<4} descartados={stats['dropped']:<4} "
+              f"atraso médio={stats['avg_delay_ms']:.2f}ms handler médio={stats['avg_handler_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
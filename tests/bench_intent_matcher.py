@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import random
+from core.intent_matcher import IntentMatcher
+
+# Custo de Kernel.dispatch (etapa de regras) em função do número de plugins:
+# laço ingênuo antigo (substring, patterns() a cada comando) vs trie compilado.
+PATTERNS_PER_PLUGIN = 8
+ROUNDS = 200
+
+random.seed(0)
+VOCAB = [f"w{i}" for i in range(5000)]
+COMMANDS = [
+    "por favor abre o navegador agora",
+    "restart the service and rerun the job",
+    "escrever em notas.txt: comprar pão",
+    "what is the weather like today",
+]
+
+
+class FakePlugin:
+    def __init__(self, name, patterns):
+        self._name = name
+        self._patterns = patterns
+
+    def name(self):
+        return self._name
+
+    def patterns(self):
+        return list(self._patterns)
+
+
+def make_plugins(n):
+    plugins = []
+    for p in range(n):
+        patterns = [" ".join(random.sample(VOCAB, random.randint(1, 3))) for _ in range(PATTERNS_PER_PLUGIN)]
+        plugins.append(FakePlugin(f"Plugin{p}", patterns))
+    return plugins
+
+
+def naive_match(plugins, text):
+    for plugin in plugins:
+        for pattern in plugin.patterns():
+            if pattern in text:
+                return plugin.name()
+    return None
+
+
+def bench(fn):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in COMMANDS:
+            fn(text)
+    return (time.perf_counter() - t0) / (ROUNDS * len(COMMANDS))
+
+
+if __name__ == "__main__":
+    print(f"{'plugins':>8s} {'padrões':>8s} {'ingênuo':>12s} {'compilado':>12s} {'compilação':>12s}")
+    for n in (10, 100, 1000, 5000):
+        plugins = make_plugins(n)
+        matcher = IntentMatcher()
+        for plugin in plugins:
+            matcher.add(plugin.name(), plugin.patterns())
+        t0 = time.perf_counter()
+        matcher.match("")  # Força a compilação
+        compile_cost = time.perf_counter() - t0
+
+        naive = bench(lambda text: naive_match(plugins, text))
+        compiled = bench(matcher.match)
+        print(f"{n:8d} {len(matcher):8d} {naive * 1e6:10.1f}us {compiled * 1e6:10.1f}us {compile_cost * 1e3:10.1f}ms")
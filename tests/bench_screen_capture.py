@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import io
+import random
+import time
+from PIL import Image, ImageDraw
+from core.vision.screen_capture import ScreenCapture
+
+# Custo de um pedido com visão: captura + codificação + tamanho do upload.
+# Compara o caminho antigo (PIL em resolução nativa, que o SDK converte em PNG)
+# com as configurações de vision.* e mede o reaproveitamento do quadro quando os pixels não mudaram.
+# A "tela" é sintética (janelas, texto e gradiente) para rodar sem monitor.
+# Uso: python tests/bench_screen_capture.py [--width 3840] [--height 2160] [--runs 5]
+
+
+def synthetic_desktop(width, height, seed=0):
+    rng = random.Random(seed)
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(width - 400), rng.randrange(height - 300)
+        w, h = rng.randrange(400, width // 2), rng.randrange(300, height // 2)
+        draw.rectangle([x, y, x + w, y + h], fill=(245, 245, 245), outline=(60, 60, 60), width=3)
+        draw.rectangle([x, y, x + w, y + 32], fill=(rng.randrange(256), 90, 160))
+        for line in range(y + 48, y + h - 16, 22):
+            words = " ".join("".join(rng.choice("abcdefghij klmnop") for _ in range(8)) for _ in range(w // 80))
+            draw.text((x + 12, line), words, fill=(20, 20, 20))
+    return image
+
+
+class SyntheticCapture(ScreenCapture):
+    def __init__(self, config, screen):
+        super().__init__(config)
+        self.screen = screen
+
+    def _grab(self, region):
+        if region:
+            x, y, w, h = region
+            return self.screen.crop((x, y, x + w, y + h))
+        return self.screen.copy()
+
+
+def baseline(screen, runs):
+    times, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        buffer = io.BytesIO()
+        screen.copy().save(buffer, "PNG")  # o que o SDK faz com um PIL.Image
+        times.append((time.perf_counter() - start) * 1000)
+        size = buffer.tell()
+    return sorted(times)[len(times) // 2], size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    screen = synthetic_desktop(args.width, args.height)
+    logging = {"logging": {"level": "WARNING", "console": False}}
+
+    ms, size = baseline(screen, args.runs)
+    print(f"{'config':<34} {'capture':>9} {'encode':>9} {'payload':>10}")
+    print(f"{'nativo -> PNG (antigo)':<34} {'':>9} {ms:>7.0f}ms {size / 1024:>8.0f}KB")
+
+    variants = [
+        ("png 1280", {"format": "png", "max_dimension": 1280}),
+        ("jpeg q70 1280", {"format": "jpeg", "quality": 70, "max_dimension": 1280}),
+        ("jpeg q70 1920 max 300KB", {"format": "jpeg", "quality": 70, "max_dimension": 1920, "max_kb": 300}),
+        ("webp q60 1280", {"format": "webp", "quality": 60, "max_dimension": 1280}),
+        ("jpeg q70 janela 1600x1000", {"format": "jpeg", "quality": 70, "region": [200, 200, 1600, 1000]}),
+    ]
+    for name, vision in variants:
+        vision = dict(vision, cache={"enabled": False})
+        capture = SyntheticCapture(dict(logging, vision=vision), screen)
+        frames = [capture.capture() for _ in range(args.runs)]
+        cap = sorted(f.capture_ms for f in frames)[len(frames) // 2]
+        enc = sorted(f.encode_ms for f in frames)[len(frames) // 2]
+        print(f"{name:<34} {cap:>7.0f}ms {enc:>7.0f}ms {frames[-1].size_bytes / 1024:>8.0f}KB"
+              f"  ({frames[-1].width}x{frames[-1].height} q{frames[-1].quality})")
+
+    # Cache: tela parada reaproveita o quadro; qualquer mudança (aqui, um cursor de texto) invalida
+    capture = SyntheticCapture(dict(logging, vision={"format": "jpeg", "quality": 70}), screen)
+    first = capture.capture()
+    again = capture.capture()
+    ImageDraw.Draw(screen).rectangle([600, 400, 603, 430], fill=(0, 0, 0))
+    changed = capture.capture()
+    print(f"\ncache: 1º encode {first.encode_ms:.0f}ms | tela igual -> cached={again.cached} "
+          f"(encode {again.encode_ms:.0f}ms) | tela mudou -> cached={changed.cached}")
+    print(f"totais: {capture.stats()['captures']} capturas, {capture.stats()['cache_hits']} reaproveitadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import time
+import types
+from core.ai.ai_intent_resolver import AIIntentResolver
+
+# Tempo até o primeiro áudio para respostas da IA: resposta inteira + TTS da
+# resposta inteira (caminho antigo) vs streaming frase a frase para a TTS.
+# O modelo é substituído por um stand-in local que transmite uma resposta
+# enlatada em pedaços com atraso configurável; a TTS é simulada por um custo
+# de síntese proporcional ao tamanho do texto.
+# Uso: python tests/bench_streaming_answer.py [--chunk-chars 8] [--chunk-delay 0.03]
+
+ANSWER = {
+    "intent": "question",
+    "response": ("A capital da França é Paris. Ela fica às margens do rio Sena, no norte do país. "
+                 "Paris é conhecida pela Torre Eiffel, pelo Museu do Louvre e pela culinária. "
+                 "Com mais de dois milhões de habitantes, é também o centro político e econômico da França."),
+}
+
+
+class StandInModels:
+    """
+    Imita `client.models` do google-genai com atrasos configuráveis.
+    """
+    def __init__(self, payload, chunk_chars, chunk_delay, first_delay):
+        self.text = json.dumps(payload, ensure_ascii=False)
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.first_delay = first_delay
+
+    def generate_content_stream(self, **kwargs):
+        time.sleep(self.first_delay)
+        for i in range(0, len(self.text), self.chunk_chars):
+            time.sleep(self.chunk_delay)
+            yield types.SimpleNamespace(text=self.text[i:i + self.chunk_chars])
+
+    def generate_content(self, **kwargs):
+        chunks = len(range(0, len(self.text), self.chunk_chars))
+        time.sleep(self.first_delay + chunks * self.chunk_delay)
+        return types.SimpleNamespace(text=self.text)
+
+
+def synth_seconds(text, base, per_char):
+    return base + per_char * len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-chars", type=int, default=8)
+    parser.add_argument("--chunk-delay", type=float, default=0.03)
+    parser.add_argument("--first-delay", type=float, default=0.3, help="Latência até o primeiro token")
+    parser.add_argument("--tts-base", type=float, default=0.15, help="Custo fixo de síntese por frase (s)")
+    parser.add_argument("--tts-per-char", type=float, default=0.004, help="Custo de síntese por caractere (s)")
+    args = parser.parse_args()
+
+    config = {"ai": {"timeout": 30, "cache": {"enabled": False}}, "logging": {"level": "WARNING"}}
+    resolver = AIIntentResolver(types.SimpleNamespace(config=config))
+    resolver.client.client = types.SimpleNamespace(
+        models=StandInModels(ANSWER, args.chunk_chars, args.chunk_delay, args.first_delay))
+
+    # Caminho antigo: espera o JSON inteiro e sintetiza a resposta inteira
+    t0 = time.perf_counter()
+    result = resolver.resolve("qual a capital da frança")
+    full_ready = time.perf_counter() - t0
+    ttfa_full = full_ready + synth_seconds(result["response"], args.tts_base, args.tts_per_char)
+
+    # Streaming: cada frase vai para a TTS assim que termina
+    spoken = []
+    t0 = time.perf_counter()
+
+    def on_sentence(sentence):
+        spoken.append((time.perf_counter() - t0, sentence))
+
+    result = resolver.resolve("qual a capital da frança", on_sentence=on_sentence)
+    total = time.perf_counter() - t0
+    first_at, first_sentence = spoken[0]
+    ttfa_stream = first_at + synth_seconds(first_sentence, args.tts_base, args.tts_per_char)
+
+    print(f"--- {len(ANSWER['response'])} caracteres, pedaços de {args.chunk_chars} a cada {args.chunk_delay * 1000:.0f}ms ---")
+    for at, sentence in spoken:
+        print(f"  {at * 1000:6.0f}ms  {sentence}")
+    print(f"Geração completa: {total * 1000:.0f}ms (streamed={result.get('streamed', False)})")
+    print(f"Primeiro áudio (resposta inteira): {ttfa_full * 1000:6.0f}ms")
+    print(f"Primeiro áudio (streaming):        {ttfa_stream * 1000:6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import tempfile
+import time
+from tests.bench_tts_queue import SimulatedTTS
+
+# Tempo da fila até o áudio começar para frases repetidas com o cache de
+# síntese: 1ª vez (síntese), repetida (memória), após reiniciar (disco) e
+# pré-aquecida. Síntese/reprodução simuladas como em bench_tts_queue.py.
+# Uso: python tests/bench_tts_cache.py [--synth-ms 400]
+
+PHRASE = "Ocorreu um erro ao executar o comando."
+
+
+def first_audio_ms(tts, text):
+    before = len(tts.spoken)
+    start = time.perf_counter()
+    tts.speak(text)
+    tts.wait_until_idle()
+    return (tts.spoken[before] - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synth-ms", type=float, default=400)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def make(prewarm=None, disk_mb=100):
+            config = {"logging": {"level": "WARNING", "console": False},
+                      "tts": {"cache": {"path": cache_dir, "disk_mb": disk_mb, "prewarm": prewarm or []}}}
+            return SimulatedTTS(config, args.synth_ms, ms_per_char=1)
+
+        tts = make()
+        print(f"1ª vez (síntese):        {first_audio_ms(tts, PHRASE):7.1f}ms")
+        print(f"repetida (memória):      {first_audio_ms(tts, PHRASE):7.1f}ms")
+        restarted = make()
+        print(f"após reiniciar (disco):  {first_audio_ms(restarted, PHRASE):7.1f}ms")
+
+        warm = make(prewarm=["Desculpe, não entendi. Pode repetir?"])
+        time.sleep(args.synth_ms / 1000 + 0.2)
+        print(f"pré-aquecida:            {first_audio_ms(warm, 'Desculpe, não entendi. Pode repetir?'):7.1f}ms")
+        print(f"stats: {warm.stats()['cache']}")
+
+        # Limite de disco minúsculo: frases antigas são despejadas
+        small = make(disk_mb=0.00002)  # ~20 bytes: cabem duas frases simuladas
+        for i in range(5):
+            small.speak(f"Frase número {i} para encher o cache.")
+        small.wait_until_idle()
+        time.sleep(0.1)
+        stats = small.stats()["cache"]
+        print(f"disco limitado: {stats['disk_entries']} em disco, {stats['disk_evictions']} despejadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from core.tts.queued_tts import QueuedTTSService
+from core.tts.fallback_tts import FallbackTTSService
+
+# Escolha do prazo do fallback de TTS (tts.fallback.deadline_ms): a voz da
+# nuvem é simulada com a latência de um link instável (maioria rápida, cauda
+# lenta e algumas falhas) e a voz local com latência fixa. Cada frase "toca"
+# por --play-ms, e a próxima é pré-sintetizada nesse meio tempo (tts.lookahead),
+# como na reprodução real. Para cada prazo, mostra quantas frases saíram na voz
+# da nuvem e quanto a reprodução esperou por cada frase até o áudio tocar
+# (médio, p95 e pior). "sem prazo" = só a nuvem, como antes.
+# Uso: python tests/bench_tts_fallback.py [--sentences 20] [--slow 0.1] [--fail 0.05] [--lookahead 1]
+
+
+class SimulatedCloud(QueuedTTSService):
+    def __init__(self, config, latencies):
+        self.latencies = latencies
+        super().__init__(config, logger_name="Jarvis.TTS.Cloud", engine_only=True)
+
+    async def _synthesize_stream(self, text):
+        latency = self.latencies[text]
+        if latency is None:
+            await asyncio.sleep(0.1)
+            raise ConnectionError("sem rede")
+        await asyncio.sleep(latency)
+        for _ in range(3):
+            yield b"\xff\xf3" + bytes(62)
+            await asyncio.sleep(0.02)
+
+
+class SimulatedLocal(QueuedTTSService):
+    def __init__(self, config, latency_ms):
+        self.latency = latency_ms / 1000
+        super().__init__(config, logger_name="Jarvis.TTS.LocalSim", engine_only=True)
+
+    async def _synthesize_stream(self, text):
+        await asyncio.sleep(self.latency)
+        yield b"RIFF" + bytes(60)
+
+
+class SimulatedFallback(FallbackTTSService):
+    play_seconds = 1.5
+
+    def _init_playback(self):
+        pass
+
+    async def _play_stream(self, chunks, on_start):
+        first = True
+        async for _ in chunks:
+            if first:
+                on_start()
+                first = False
+        await asyncio.sleep(self.play_seconds)
+
+    def _stop_playback(self):
+        pass
+
+
+def cloud_latencies(sentences, args):
+    rng = random.Random(args.seed)
+    latencies = {}
+    for sentence in sentences:
+        roll = rng.random()
+        if roll < args.fail:
+            latencies[sentence] = None
+        elif roll < args.fail + args.slow:
+            latencies[sentence] = rng.uniform(1.5, 4.0)
+        else:
+            latencies[sentence] = rng.lognormvariate(-1.05, 0.4)  # mediana ~350ms
+    return latencies
+
+
+def run(deadline_ms, sentences, latencies, args):
+    config = {"logging": {"level": "ERROR", "console": False},
+              "tts": {"lookahead": args.lookahead, "cache": {"enabled": False},
+                      "fallback": {"deadline_ms": deadline_ms or 0}}}
+    engine_config = {"logging": config["logging"]}
+    cloud = SimulatedCloud(engine_config, latencies)
+    local = SimulatedLocal(engine_config, args.local_ms) if deadline_ms else None
+    tts = SimulatedFallback(config, primary=cloud, fallback=local)
+    tts.play_seconds = args.play_ms / 1000
+    for sentence in sentences:
+        tts.speak(sentence)
+    tts.wait_until_idle()
+    return tts
+
+
+def report(deadline_ms, tts, sentences):
+    served = sorted(entry["first_audio_ms"] for entry in tts.served)
+    cloud_count = sum(1 for entry in tts.served if entry["engine"] == "edge")
+    stats = tts.stats()
+    label = f"{deadline_ms}ms" if deadline_ms else "sem prazo"
+    print(f"{label:>10} | nuvem {cloud_count:>3}/{len(sentences)} | silenciosas {stats['errors']:>2} | "
+          f"espera média {sum(served) / max(1, len(served)):>5.0f}ms "
+          f"p95 {served[int(len(served) * 0.95)] if served else 0:>5.0f}ms pior {served[-1] if served else 0:>5.0f}ms "
+          f"| {stats['fallback_reasons']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=20)
+    parser.add_argument("--slow", type=float, default=0.1, help="Fração de respostas lentas da nuvem (1,5-4s)")
+    parser.add_argument("--fail", type=float, default=0.05, help="Fração de falhas da nuvem")
+    parser.add_argument("--local-ms", type=float, default=150, help="Latência da voz local")
+    parser.add_argument("--play-ms", type=float, default=1500, help="Duração de cada frase tocada")
+    parser.add_argument("--lookahead", type=int, default=1, help="tts.lookahead (padrão do config.yaml)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sentences = [f"Frase número {i} da resposta." for i in range(args.sentences)]
+    latencies = cloud_latencies(sentences, args)
+    start = time.perf_counter()
+    deadlines = (None, 1200, 800, 500, 300)
+    # Cada prazo tem seu próprio loop de TTS: rodam em paralelo
+    results = {}
+    threads = [threading.Thread(target=lambda d=d: results.__setitem__(d, run(d, sentences, latencies, args)))
+               for d in deadlines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for deadline_ms in deadlines:
+        report(deadline_ms, results[deadline_ms], sentences)
+    print(f"\n({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
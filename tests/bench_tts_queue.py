@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import struct
+import time
+from core.tts.queued_tts import QueuedTTSService, PRIORITY_HIGH
+
+# Silêncio entre frases seguidas (resposta da IA em streaming) no worker de TTS:
+# lookahead 0 (sintetiza só quando a frase anterior termina, como antes) vs
+# lookahead 1 (sintetiza a próxima durante a reprodução). Síntese e reprodução
+# são simuladas (sem rede e sem placa de som) com custos proporcionais ao texto.
+# Também mede preempção e o tempo do barge-in (stop) até o worker ficar ocioso.
+# Uso: python tests/bench_tts_queue.py [--synth-ms 250] [--ms-per-char 45]
+
+SENTENCES = [
+    "A capital da França é Paris.",
+    "Ela fica às margens do rio Sena, no norte do país.",
+    "Paris é conhecida pela Torre Eiffel e pelo Museu do Louvre.",
+    "É também o centro político e econômico da França.",
+]
+
+
+class SimulatedTTS(QueuedTTSService):
+    """
+    Síntese = latência fixa + custo por caractere; o "áudio" carrega a duração.
+    """
+    def __init__(self, config, synth_ms, ms_per_char):
+        self.synth_ms = synth_ms
+        self.ms_per_char = ms_per_char
+        self.spoken = []
+        super().__init__(config)
+
+    async def _synthesize_stream(self, text):
+        await asyncio.sleep((self.synth_ms + len(text) * 2) / 1000)
+        yield struct.pack("<d", len(text) * self.ms_per_char / 1000)
+
+    async def _play_stream(self, chunks, on_start):
+        audio = b"".join([chunk async for chunk in chunks])
+        self.spoken.append(time.perf_counter())
+        on_start()
+        await asyncio.sleep(struct.unpack("<d", audio)[0])
+
+    def _init_playback(self):
+        pass
+
+    def _stop_playback(self):
+        pass
+
+
+def run(lookahead, args):
+    config = {"logging": {"level": "WARNING", "console": False}, "tts": {"lookahead": lookahead, "cache": {"enabled": False}}}
+    tts = SimulatedTTS(config, args.synth_ms, args.ms_per_char)
+    start = time.perf_counter()
+    for sentence in SENTENCES:
+        tts.speak(sentence)
+    tts.wait_until_idle()
+    total = time.perf_counter() - start
+    stats = tts.stats()
+    print(f"lookahead={lookahead}: total {total:.2f}s | silêncio entre frases médio {stats['avg_gap_ms']:.0f}ms "
+          f"| 1º áudio {(tts.spoken[0] - start) * 1000:.0f}ms")
+    return tts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synth-ms", type=float, default=250)
+    parser.add_argument("--ms-per-char", type=float, default=45)
+    args = parser.parse_args()
+
+    run(0, args)
+    tts = run(1, args)
+
+    # Preempção: mensagem urgente corta a frase menos urgente em andamento
+    tts.speak(SENTENCES[1])
+    time.sleep(args.synth_ms / 1000 + 0.3)
+    tts.speak("Ocorreu um erro ao executar o comando.", priority=PRIORITY_HIGH, preempt=True)
+    tts.wait_until_idle()
+    print(f"preempção: {tts.stats()['preempted']} frase(s) cortada(s)")
+
+    # Barge-in: fila cheia interrompida pela hotkey
+    for sentence in SENTENCES:
+        tts.speak(sentence)
+    time.sleep(0.3)
+    t0 = time.perf_counter()
+    tts.stop()
+    tts.wait_until_idle()
+    print(f"barge-in: ocioso em {(time.perf_counter() - t0) * 1000:.1f}ms, {tts.stats()['cancelled']} frases descartadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # Sem placa de som: o mixer roda no relógio do SDL
+
+import argparse
+import asyncio
+import time
+from core.tts.queued_tts import QueuedTTSService
+
+# Tempo até o primeiro áudio de uma resposta longa: reprodução em streaming
+# (decodifica e toca a partir dos primeiros blocos de MP3) vs esperar a síntese
+# inteira, como antes. O sintetizador é falso e local: entrega frames MP3 reais
+# (silêncio, MPEG-2 layer III 24 kHz, como o edge-tts) em blocos, com atraso
+# até o primeiro bloco e intervalo entre blocos, imitando o Communicate.stream().
+# A reprodução é a real (pygame), com o driver de áudio "dummy".
+# Uso: python tests/bench_tts_streaming.py [--seconds 6] [--first-chunk-ms 200] [--chunk-ms 100]
+
+# Frame de silêncio: 144 bytes = 576 amostras a 24 kHz = 24 ms
+SILENT_FRAME = bytes([0xFF, 0xF3, 0x64, 0xC0]) + bytes(140)
+FRAME_SECONDS = 576 / 24000
+
+
+class FakeStreamingTTS(QueuedTTSService):
+    def __init__(self, config, audio_seconds, first_chunk_ms, chunk_ms, frames_per_chunk):
+        self.frames = int(audio_seconds / FRAME_SECONDS)
+        self.first_chunk = first_chunk_ms / 1000
+        self.chunk_interval = chunk_ms / 1000
+        self.frames_per_chunk = frames_per_chunk
+        self.synthesis_done_at = None
+        super().__init__(config, logger_name="Jarvis.TTS.Fake")
+
+    async def _synthesize_stream(self, text):
+        await asyncio.sleep(self.first_chunk)
+        audio = SILENT_FRAME * self.frames
+        # Blocos não alinhados aos frames, como chegam da rede
+        chunk_bytes = self.frames_per_chunk * len(SILENT_FRAME) + 37
+        for offset in range(0, len(audio), chunk_bytes):
+            if offset:
+                await asyncio.sleep(self.chunk_interval)
+            yield audio[offset:offset + chunk_bytes]
+        self.synthesis_done_at = time.perf_counter()
+
+
+def run(streaming, args):
+    config = {
+        "logging": {"level": "WARNING", "console": False},
+        "tts": {"cache": {"enabled": False}, "streaming": {"enabled": streaming}},
+    }
+    tts = FakeStreamingTTS(config, args.seconds, args.first_chunk_ms, args.chunk_ms, args.frames_per_chunk)
+    if tts._stream_player is None:
+        print("pygame indisponível.")
+        sys.exit(1)
+    start = time.perf_counter()
+    tts.speak("Uma resposta longa da IA.")
+    tts.wait_until_idle()
+    end = time.perf_counter()
+    stats = tts.stats()
+    first_audio = stats["avg_queue_to_audio_ms"]
+    played = end - start - first_audio / 1000
+    print(f"{'streaming' if streaming else 'síntese inteira':<16} 1º áudio {first_audio:>6.0f}ms | "
+          f"1º bloco {stats['avg_first_chunk_ms']:>4.0f}ms | síntese completa "
+          f"{(tts.synthesis_done_at - start) * 1000:>5.0f}ms | tocou {played:.2f}s de {tts.frames * FRAME_SECONDS:.2f}s "
+          f"| underruns {tts._stream_player.underruns}")
+    return first_audio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=6.0, help="Duração do áudio da resposta")
+    parser.add_argument("--first-chunk-ms", type=float, default=200)
+    parser.add_argument("--chunk-ms", type=float, default=100, help="Intervalo entre blocos")
+    parser.add_argument("--frames-per-chunk", type=int, default=12, help="~12 frames = 288ms de áudio por bloco")
+    args = parser.parse_args()
+
+    full = run(False, args)
+    streamed = run(True, args)
+    print(f"\n1º áudio: {full:.0f}ms -> {streamed:.0f}ms ({full / streamed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
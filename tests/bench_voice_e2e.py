@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+import yaml
+from core.kernel import Kernel
+from core.voice_loop import VoiceLoop
+
+# Benchmark de ponta a ponta do caminho de voz usando replay de WAVs
+# (sem microfone): VAD -> trim -> STT -> wake word -> Kernel.dispatch.
+# Uso: python tests/bench_voice_e2e.py caminho/wavs [--fast]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=str, help="WAV ou diretório de WAVs")
+    parser.add_argument("--fast", action="store_true", help="Replay o mais rápido possível")
+    parser.add_argument("--config", type=str, default="config/config.yaml")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f) or {}
+    config.setdefault("audio", {})["source"] = "wav"
+    config["audio"]["replay"] = dict(config["audio"].get("replay", {}), path=args.path, realtime=not args.fast)
+    # Sem confirmações interativas durante o benchmark
+    config.setdefault("security", {})["require_confirmation"] = False
+
+    kernel = Kernel(config)
+    voice_loop = VoiceLoop(kernel)
+
+    t0 = time.perf_counter()
+    voice_loop.start()
+    wall = time.perf_counter() - t0
+
+    print(f"\n--- {len(voice_loop.latencies)} comandos em {wall:.1f}s ---")
+    for l in voice_loop.latencies:
+        print(f"{l['capture_to_dispatch'] * 1000:7.0f}ms {l['capture_to_done'] * 1000:7.0f}ms  {l['text']}")
+    if voice_loop.latencies:
+        dispatch = np.array([l["capture_to_dispatch"] for l in voice_loop.latencies]) * 1000
+        done = np.array([l["capture_to_done"] for l in voice_loop.latencies]) * 1000
+        print(f"captura->dispatch p50={np.percentile(dispatch, 50):.0f}ms p95={np.percentile(dispatch, 95):.0f}ms")
+        print(f"captura->concluído p50={np.percentile(done, 50):.0f}ms p95={np.percentile(done, 95):.0f}ms")
+    print(f"Áudio economizado pelo trim: {voice_loop.trimmer.total_saved_seconds:.1f}s")
+    print(f"Tempos de carga: {kernel.get_load_timings()}")
+
+
+if __name__ == "__main__":
+    main()
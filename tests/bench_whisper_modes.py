@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import subprocess
+import time
+import wave
+import numpy as np
+
+# Benchmark dos modos de performance do WhisperSTT (stt.performance).
+# Cada modo roda em um subprocesso isolado (threads do torch e RSS são por processo).
+# Uso: python tests/bench_whisper_modes.py [--wav frase.wav] [--runs 5]
+
+MODES = {
+    "fp32": {"quantize": "none", "inference_mode": False},
+    "fp32+inference_mode": {"quantize": "none", "inference_mode": True},
+    "int8": {"quantize": "int8", "inference_mode": True},
+    "int8+2threads": {"quantize": "int8", "inference_mode": True, "num_threads": 2, "interop_threads": 1},
+}
+
+
+def load_audio(path):
+    if not path:
+        # 5s de tom modulado (sem dependência de arquivo); prefira um WAV real de comando
+        t = np.arange(16000 * 5) / 16000
+        return (np.sin(2 * np.pi * 220 * t) * np.sin(2 * np.pi * 3 * t) * 8000).astype(np.int16)
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise SystemExit("WAV precisa ser 16kHz, mono, int16.")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3  # Linux: KB (pico)
+
+
+def run_mode(mode, wav, runs):
+    from core.stt.whisper_stt import WhisperSTT
+
+    perf = dict(MODES[mode])
+    perf["warmup"] = False  # mede a primeira decodificação "fria"
+    config = {"stt": {"performance": perf}, "logging": {"level": "WARNING", "file": "logs/bench_whisper.json"}}
+    audio = load_audio(wav)
+    duration = len(audio) / 16000
+
+    t0 = time.perf_counter()
+    stt = WhisperSTT(config=config)
+    load_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    stt.transcribe(audio)
+    first_s = time.perf_counter() - t0
+
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        stt.transcribe(audio)
+        times.append(time.perf_counter() - t0)
+
+    return {
+        "mode": mode,
+        "load_s": load_s,
+        "first_decode_s": first_s,
+        "rtf": float(np.median(times)) / duration,
+        "rss_mb": rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", type=str, default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.wav, args.runs)))
+        return
+
+    print(f"{'modo':22s} {'load':>8s} {'1a dec':>8s} {'RTF':>7s} {'RSS':>9s}")
+    for mode in MODES:
+        cmd = [sys.executable, __file__, "--mode", mode, "--runs", str(args.runs)]
+        if args.wav:
+            cmd += ["--wav", args.wav]
+        out = subprocess.run(cmd, capture_output=True, text=True)
+        lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if not lines:
+            print(f"{mode:22s} FALHOU: {out.stderr.strip().splitlines()[-1:]}")
+            continue
+        r = json.loads(lines[-1])
+        print(f"{mode:22s} {r['load_s']:7.2f}s {r['first_decode_s']:7.2f}s {r['rtf']:7.3f} {r['rss_mb']:7.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
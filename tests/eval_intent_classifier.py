@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import time
+import numpy as np
+from core.intent_matcher import IntentMatcher
+from core.intent_classifier import IntentClassifier
+from core.plugin_loader import PluginLoader
+
+# Relatório offline do classificador local (camada entre regras e IA).
+# Para cada limiar: acerto do plugin, falsos aceites (frases que deviam ir à IA),
+# escaladas para a IA e latência por consulta.
+#
+# Corpus: JSONL {"text": ..., "label": "NomeDoPlugin" | null}; null = deve escalar para a IA.
+# Uso: python tests/eval_intent_classifier.py [--corpus tests/data/intent_corpus.jsonl]
+
+THRESHOLDS = [0.5, 0.6, 0.65, 0.7, 0.8, 0.9]
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=str, default=os.path.join(os.path.dirname(__file__), "data", "intent_corpus.jsonl"))
+    parser.add_argument("--verbose", action="store_true", help="Lista os erros no limiar configurado")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    # Como no Kernel: padrões ancorados após a wake word / palavras de abertura
+    lead_in = ["sábado feira", "ok", "ei", "hey", "oi", "por favor", "please"]
+    matcher = IntentMatcher(lead_in=lead_in)
+    # Sem histórico: avalia só o que vem dos padrões dos plugins
+    classifier = IntentClassifier({"intent_classifier": {"learn": False, "threshold": 0.0}}, lead_in=lead_in)
+    for plugin in PluginLoader(config={"logging": {"level": "WARNING"}}).discover_and_load():
+        matcher.add(plugin.name(), plugin.patterns())
+        classifier.set_plugin_patterns(plugin.name(), matcher.variants(plugin.name()))
+
+    rule_hits = [matcher.match(item["text"]) for item in corpus]
+    rule_correct = sum(1 for item, m in zip(corpus, rule_hits) if m and m.plugin_name == item["label"])
+    commands = [item for item in corpus if item["label"]]
+    negatives = [item for item in corpus if not item["label"]]
+    print(f"--- {len(corpus)} frases ({len(commands)} comandos, {len(negatives)} não-comandos) ---")
+    print(f"Só regras: {rule_correct}/{len(commands)} comandos resolvidos localmente")
+
+    # Latência do classificador (consulta completa, inclui extração de slots)
+    classifier.classify(corpus[0]["text"])  # Monta o índice
+    costs = []
+    results = []
+    for item in corpus:
+        t0 = time.perf_counter()
+        results.append(classifier.classify(item["text"]))
+        costs.append(time.perf_counter() - t0)
+    costs = np.array(costs) * 1e6
+    print(f"Latência: p50={np.percentile(costs, 50):.0f}us p95={np.percentile(costs, 95):.0f}us")
+
+    print(f"\n{'limiar':>7s} {'acerto':>8s} {'errados':>8s} {'falsos':>7s} {'escaladas':>10s}")
+    for threshold in THRESHOLDS:
+        correct = wrong = false_accept = escalated = 0
+        for item, rule, local in zip(corpus, rule_hits, results):
+            # Regras exatas têm prioridade, como no Kernel.dispatch
+            predicted = rule.plugin_name if rule else (
+                local.plugin_name if local and local.score >= threshold else None)
+            if predicted is None:
+                escalated += 1
+            elif not item["label"]:
+                false_accept += 1
+            elif predicted == item["label"]:
+                correct += 1
+            else:
+                wrong += 1
+        print(f"{threshold:7.2f} {correct / len(commands):8.0%} {wrong:8d} {false_accept:7d} {escalated:10d}")
+
+    if args.verbose:
+        threshold = IntentClassifier().threshold
+        print(f"\nErros no limiar {threshold}:")
+        for item, rule, local in zip(corpus, rule_hits, results):
+            predicted = rule.plugin_name if rule else (
+                local.plugin_name if local and local.score >= threshold else None)
+            if predicted != item["label"]:
+                score = f"{local.score:.2f} ({local.example})" if local else "-"
+                print(f"  {item['text']!r}: esperado {item['label']}, obtido {predicted}, score {score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import glob
+import json
+import time
+import numpy as np
+from core.vad import VAD_ENGINES, Endpointer
+from core.audio_replay import load_wav
+
+# Harness offline de VAD: roda cada engine sobre um diretório de WAVs e reporta
+# acurácia de endpoint, disparos falsos e custo de CPU por chunk.
+#
+# Rótulos opcionais em <arquivo>.json: {"speech": [[inicio_s, fim_s], ...]}
+# WAVs sem rótulo (ou com lista vazia) são tratados como só-ruído.
+# Uso: python tests/eval_vad.py caminho/para/wavs [--engines energy,adaptive,spectral]
+
+SAMPLE_RATE = 16000
+BLOCKSIZE = 4096
+TOLERANCE = 0.3  # segundos de folga (início e fim) para considerar um endpoint correto
+
+
+def load_labels(path):
+    label_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(label_path):
+        return []
+    with open(label_path, "r") as f:
+        return json.load(f).get("speech", [])
+
+
+def run_engine(engine_cls, config, audio):
+    """
+    Simula o laço de captura passiva do VoiceLoop. Retorna capturas [(inicio, fim)]
+    e os tempos de CPU por chunk.
+    """
+    vad = engine_cls(config, blocksize=BLOCKSIZE)
+    endpointer = Endpointer(config)
+    captures = []
+    costs = []
+    capture_start = None
+
+    for i in range(0, len(audio) - BLOCKSIZE + 1, BLOCKSIZE):
+        chunk = audio[i:i + BLOCKSIZE]
+        t0 = time.perf_counter()
+        is_speech = vad.is_speech(chunk)
+        costs.append(time.perf_counter() - t0)
+
+        now = (i + BLOCKSIZE) / SAMPLE_RATE
+        if capture_start is None:
+            if is_speech:
+                capture_start = i / SAMPLE_RATE
+                endpointer.reset(speech_started=True)
+            else:
+                continue
+        if endpointer.update(is_speech, BLOCKSIZE / SAMPLE_RATE):
+            captures.append((capture_start, now))
+            capture_start = None
+
+    if capture_start is not None:
+        captures.append((capture_start, len(audio) / SAMPLE_RATE))
+    return captures, costs
+
+
+def evaluate(engine_name, config, files):
+    engine_cls = VAD_ENGINES[engine_name]
+    # O fim da captura chega, no mínimo, após o silêncio de fim de fala
+    hangover = Endpointer(config).silence_timeout_speech + BLOCKSIZE / SAMPLE_RATE
+    stats = {"utterances": 0, "correct": 0, "cut_off": 0, "missed": 0,
+             "false_triggers": 0, "start_err": [], "end_latency": [], "costs": []}
+
+    for path, audio, labels in files:
+        captures, costs = run_engine(engine_cls, config, audio)
+        stats["costs"].extend(costs)
+        matched = set()
+
+        for start, end in labels:
+            stats["utterances"] += 1
+            overlapping = [c for c in captures if c[0] < end and c[1] > start]
+            if not overlapping:
+                stats["missed"] += 1
+                continue
+            matched.update(overlapping)
+            cap_start, cap_end = overlapping[0][0], overlapping[-1][1]
+            stats["start_err"].append(cap_start - start)
+            stats["end_latency"].append(cap_end - end)
+            # Uma frase dividida em várias capturas corta o falante no meio
+            if len(overlapping) > 1 or cap_end < end:
+                stats["cut_off"] += 1
+            elif abs(cap_start - start) <= TOLERANCE and cap_end - end <= hangover + TOLERANCE:
+                stats["correct"] += 1
+
+        stats["false_triggers"] += len([c for c in captures if c not in matched])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("wav_dir", type=str)
+    parser.add_argument("--engines", type=str, default=",".join(VAD_ENGINES))
+    parser.add_argument("--config", type=str, default="config/config.yaml")
+    args = parser.parse_args()
+
+    config = {}
+    if os.path.exists(args.config):
+        import yaml
+        with open(args.config, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+    paths = sorted(glob.glob(os.path.join(args.wav_dir, "*.wav")))
+    if not paths:
+        raise SystemExit(f"Nenhum WAV em {args.wav_dir}")
+    files = [(p, load_wav(p, SAMPLE_RATE), load_labels(p)) for p in paths]
+    total_seconds = sum(len(a) for _, a, _ in files) / SAMPLE_RATE
+    print(f"--- {len(files)} arquivos, {total_seconds:.0f}s de áudio ---")
+    print(f"{'engine':10s} {'acerto':>8s} {'cortes':>7s} {'perdidas':>8s} {'falsos':>7s} "
+          f"{'erro início':>11s} {'lat. fim':>9s} {'CPU/chunk':>10s}")
+
+    for name in args.engines.split(","):
+        s = evaluate(name, config, files)
+        n = max(s["utterances"], 1)
+        start_err = np.mean(np.abs(s["start_err"])) if s["start_err"] else float("nan")
+        end_lat = np.mean(s["end_latency"]) if s["end_latency"] else float("nan")
+        cost_us = np.mean(s["costs"]) * 1e6 if s["costs"] else 0.0
+        print(f"{name:10s} {s['correct'] / n:8.0%} {s['cut_off']:7d} {s['missed']:8d} {s['false_triggers']:7d} "
+              f"{start_err:10.2f}s {end_lat:8.2f}s {cost_us:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
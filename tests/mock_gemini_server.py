@@ -0,0 +1,339 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+# Servidor local que imita a API generate-content do Gemini (v1beta), para
+# testar carga e latência do fallback de IA sem rede e sem chave.
+#   POST /v1beta/models/{model}:generateContent
+#   POST /v1beta/models/{model}:streamGenerateContent?alt=sse
+#   GET  /mock/stats   |   POST /mock/config (altera as injeções em execução)
+# As respostas vêm de um script de regras (regex -> intenção JSON); latência,
+# erros e o fatiamento do streaming são configuráveis por servidor ou por regra.
+# Uso: python tests/mock_gemini_server.py [--port 8765] [--script tests/data/mock_gemini_script.json]
+#      [--latency 0.2] [--jitter 0.05] [--error-rate 0.1] [--chunk-chars 16] [--chunk-delay 0.02]
+# e no config.yaml: ai.base_url: "http://127.0.0.1:8765"
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(__file__), "data", "mock_gemini_script.json")
+
+_STATUS_NAMES = {
+    400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 404: "NOT_FOUND", 408: "DEADLINE_EXCEEDED",
+    429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 502: "UNAVAILABLE", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED",
+}
+_PATH = re.compile(r"^/(?P<version>[^/]+)/models/(?P<model>[^:]+):(?P<method>generateContent|streamGenerateContent)$")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# Opções de injeção que podem ser trocadas em execução (POST /mock/config)
+INJECTION_KEYS = ("latency", "jitter", "error_rate", "error_code", "chunk_chars", "chunk_delay")
+
+
+class MockGeminiServer:
+    """
+    Servidor HTTP (thread própria) com o mesmo protocolo generate-content do
+    Gemini. Pode ser usado pela linha de comando ou embutido em benchmarks:
+
+        with MockGeminiServer(latency=0.1) as server:
+            config["ai"]["base_url"] = server.url
+    """
+    def __init__(self, script: Optional[Dict[str, Any]] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_code: int = 503,
+                 chunk_chars: int = 16, chunk_delay: float = 0.0, seed: Optional[int] = None):
+        self.script = script if script is not None else load_script(DEFAULT_SCRIPT)
+        self._rules = [(re.compile(rule["match"], re.IGNORECASE), rule) for rule in self.script.get("rules", [])]
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "streams": 0, "errors_injected": 0, "bad_requests": 0, "in_flight": 0, "max_in_flight": 0}
+        self._rule_hits: Dict[str, int] = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGeminiServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def __enter__(self) -> "MockGeminiServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def configure(self, **options):
+        """
+        Altera latência/erros/streaming sem reiniciar o servidor.
+        """
+        for key, value in options.items():
+            if key not in INJECTION_KEYS:
+                raise ValueError(f"Opção desconhecida: {key}")
+            setattr(self, key, type(getattr(self, key))(value))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["rules"] = dict(self._rule_hits)
+        stats.update({key: getattr(self, key) for key in INJECTION_KEYS})
+        return stats
+
+    def reply_for(self, text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Retorna (regra, resposta JSON) da primeira regra que casa com o texto.
+        Grupos nomeados da regex e {text} são substituídos nas strings da resposta.
+        """
+        for pattern, rule in self._rules:
+            m = pattern.search(text)
+            if m:
+                values = {k: (v or "").strip() for k, v in m.groupdict().items()}
+                values["text"] = text
+                return rule, _fill(rule["reply"], values)
+        default = self.script.get("default", {"intent": "question", "response": "Resposta simulada para: {text}"})
+        return {"name": "default"}, _fill(default, {"text": text})
+
+    # --- usados pelo handler ---
+
+    def _enter(self, stream: bool):
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["streams"] += int(stream)
+            self._counters["in_flight"] += 1
+            self._counters["max_in_flight"] = max(self._counters["max_in_flight"], self._counters["in_flight"])
+
+    def _leave(self):
+        with self._lock:
+            self._counters["in_flight"] -= 1
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _hit(self, rule: Dict[str, Any]):
+        name = rule.get("name", rule.get("match"))
+        with self._lock:
+            self._rule_hits[name] = self._rule_hits.get(name, 0) + 1
+
+    def _delay(self, rule: Dict[str, Any]) -> float:
+        latency = rule.get("latency", self.latency)
+        return max(0.0, latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _injected_error(self, rule: Dict[str, Any]) -> Optional[int]:
+        if "error" in rule:
+            return rule["error"]
+        if self._random.random() < rule.get("error_rate", self.error_rate):
+            return self.error_code
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockGemini/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Silencioso: o benchmark mede, não loga
+
+    def do_GET(self):
+        mock = self.server.mock
+        if self.path.split("?")[0] == "/mock/stats":
+            self._send_json(200, mock.stats())
+        else:
+            self._send_error(404, f"Caminho desconhecido: {self.path}")
+
+    def do_POST(self):
+        mock = self.server.mock
+        path = self.path.split("?")[0]
+        try:
+            body = self._read_json()
+        except ValueError as e:
+            mock._count("bad_requests")
+            self._send_error(400, f"JSON inválido: {e}")
+            return
+
+        if path == "/mock/config":
+            try:
+                mock.configure(**body)
+            except (TypeError, ValueError) as e:
+                self._send_error(400, str(e))
+                return
+            self._send_json(200, mock.stats())
+            return
+
+        m = _PATH.match(path)
+        if not m:
+            self._send_error(404, f"Caminho desconhecido: {self.path}")
+            return
+        text = _user_text(body)
+        if text is None:
+            mock._count("bad_requests")
+            self._send_error(400, "contents sem texto do usuário")
+            return
+
+        stream = m.group("method") == "streamGenerateContent"
+        mock._enter(stream)
+        try:
+            rule, reply = mock.reply_for(text)
+            mock._hit(rule)
+            time.sleep(mock._delay(rule))
+            code = mock._injected_error(rule)
+            if code:
+                mock._count("errors_injected")
+                self._send_error(code, "Erro injetado pelo servidor mock")
+                return
+            reply_text = json.dumps(reply, ensure_ascii=False)
+            model = m.group("model")
+            if stream:
+                self._send_stream(reply_text, model, text, rule)
+            else:
+                self._send_json(200, _response(reply_text, model, text, "STOP"))
+        finally:
+            mock._leave()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        data = json.loads(raw or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("esperado um objeto")
+        return data
+
+    def _send_json(self, code: int, payload: Dict[str, Any]):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, code: int, message: str):
+        status = _STATUS_NAMES.get(code, "UNKNOWN")
+        self._send_json(code, {"error": {"code": code, "message": message, "status": status}})
+
+    def _send_stream(self, reply_text: str, model: str, prompt: str, rule: Dict[str, Any]):
+        mock = self.server.mock
+        chunk_chars = max(1, rule.get("chunk_chars", mock.chunk_chars))
+        chunk_delay = rule.get("chunk_delay", mock.chunk_delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = [reply_text[i:i + chunk_chars] for i in range(0, len(reply_text), chunk_chars)] or [""]
+        try:
+            for i, piece in enumerate(chunks):
+                if i and chunk_delay:
+                    time.sleep(chunk_delay)
+                finish = "STOP" if i == len(chunks) - 1 else None
+                event = json.dumps(_response(piece, model, prompt, finish), ensure_ascii=False)
+                self._write_chunk(f"data: {event}\r\n\r\n".encode("utf-8"))
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Cliente desistiu (timeout)
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _user_text(body: Dict[str, Any]) -> Optional[str]:
+    """
+    Texto do último conteúdo do usuário (o SDK manda `contents=[prompt]`).
+    """
+    for content in reversed(body.get("contents") or []):
+        if content.get("role", "user") != "user":
+            continue
+        texts = [part["text"] for part in content.get("parts", []) if "text" in part]
+        if texts:
+            return "\n".join(texts)
+    return None
+
+
+def _response(text: str, model: str, prompt: str, finish_reason: Optional[str]) -> Dict[str, Any]:
+    candidate: Dict[str, Any] = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    prompt_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+                          "totalTokenCount": prompt_tokens + output_tokens},
+        "modelVersion": model,
+    }
+
+
+def _fill(value: Any, values: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return _PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), value)
+    if isinstance(value, dict):
+        return {k: _fill(v, values) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, values) for v in value]
+    return value
+
+
+def load_script(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        script = json.load(f)
+    for rule in script.get("rules", []):
+        re.compile(rule["match"])  # Falha cedo em regex inválida
+        if "reply" not in rule and "error" not in rule:
+            raise ValueError(f"Regra sem 'reply' nem 'error': {rule}")
+        rule.setdefault("reply", {})
+    return script
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor mock da API Gemini (generate-content)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help="JSON com regras regex -> intenção")
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso até o primeiro byte (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação uniforme ± na latência (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de pedidos que falham")
+    parser.add_argument("--error-code", type=int, default=503)
+    parser.add_argument("--chunk-chars", type=int, default=16, help="Tamanho dos pedaços no streaming")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Atraso entre pedaços (s)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockGeminiServer(load_script(args.script), host=args.host, port=args.port,
+                              latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              error_code=args.error_code, chunk_chars=args.chunk_chars,
+                              chunk_delay=args.chunk_delay, seed=args.seed)
+    print(f"Mock Gemini ouvindo em {server.url} (script: {args.script})")
+    print(f"Configure ai.base_url: \"{server.url}\"  —  Ctrl+C para sair")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
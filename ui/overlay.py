@@ -22,7 +22,8 @@ class OverlayUI:
         self.thread.start()
         
         # Inscrever-se em eventos do Kernel para atualizar a UI
-        self.kernel.subscribe("state_changed", self.on_state_changed)
+        # (fila própria: a UI nunca trava o pipeline de voz; só o último estado importa)
+        self.kernel.subscribe("state_changed", self.on_state_changed, async_delivery=True, coalesce=True)
 
     def _start_gui(self):
         self.root = tk.Tk()
@@ -70,6 +71,7 @@ class OverlayUI:
                 pass
 
     def stop(self):
+        self.kernel.unsubscribe(self.on_state_changed)
         if self.root:
             self.root.quit()
         self.is_running = False
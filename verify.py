@@ -8,6 +8,7 @@ def verify_pipeline():
     # 1. Inicializar Kernel
     print("[1] Inicializando Kernel...")
     kernel = Kernel({"logging": {"level": "DEBUG"}, "security": {"require_confirmation": False}})
+    kernel.wait_for_service("plugins")
     if kernel.state == SystemState.IDLE:
         print("✅ Kernel IDLE")
     else: